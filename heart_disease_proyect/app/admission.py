@@ -0,0 +1,120 @@
+# app/admission.py
+import math
+import threading
+import time
+
+
+class Overloaded(Exception):
+    """La petición se descarta porque superaría el presupuesto de cola"""
+
+    def __init__(self, lane, retry_after):
+        super().__init__(f"Servicio saturado (carril '{lane}')")
+        self.lane = lane
+        self.retry_after = retry_after
+
+
+class Lane:
+    """Carril de admisión con prioridad, límite de concurrencia y presupuesto de cola"""
+
+    def __init__(self, name, priority, max_concurrent, max_queue, queue_timeout):
+        self.name = name
+        self.priority = priority  # menor valor = mayor prioridad
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout  # segundos
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.shed = 0
+
+    def stats(self):
+        return {
+            "priority": self.priority,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "queue_timeout_ms": int(self.queue_timeout * 1000),
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "shed": self.shed
+        }
+
+
+class AdmissionController:
+    """
+    Control de admisión con carriles de prioridad
+
+    Las peticiones comparten `capacity` huecos de ejecución. Un carril de menor
+    prioridad solo toma un hueco si ningún carril más prioritario está esperando.
+    Si una petición no consigue hueco dentro del presupuesto de su carril, o la
+    cola del carril ya está llena, se rechaza de inmediato con Overloaded.
+    """
+
+    def __init__(self, capacity, lanes):
+        self.capacity = capacity
+        self.lanes = {lane.name: lane for lane in lanes}
+        self._active = 0
+        self._cond = threading.Condition()
+
+    def _can_run(self, lane):
+        if self._active >= self.capacity or lane.active >= lane.max_concurrent:
+            return False
+        # Los carriles prioritarios con peticiones esperando (y margen propio) van primero
+        for other in self.lanes.values():
+            if (other.priority < lane.priority and other.waiting
+                    and other.active < other.max_concurrent):
+                return False
+        return True
+
+    def _reject(self, lane):
+        lane.shed += 1
+        return Overloaded(lane.name, max(1, math.ceil(lane.queue_timeout)))
+
+    def acquire(self, lane_name, record=True):
+        """Espera un hueco de ejecución. Devuelve el tiempo en cola (segundos)
+
+        Con record=False el hueco se ocupa igual pero no cuenta en `admitted`.
+        """
+        lane = self.lanes[lane_name]
+        start = time.monotonic()
+        deadline = start + lane.queue_timeout
+
+        with self._cond:
+            if not self._can_run(lane) and lane.waiting >= lane.max_queue:
+                raise self._reject(lane)
+
+            lane.waiting += 1
+            try:
+                while not self._can_run(lane):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise self._reject(lane)
+                    self._cond.wait(remaining)
+            finally:
+                lane.waiting -= 1
+                # Un carril prioritario que deja de esperar puede desbloquear a otros
+                self._cond.notify_all()
+
+            lane.active += 1
+            if record:
+                lane.admitted += 1
+            self._active += 1
+
+        return time.monotonic() - start
+
+    def release(self, lane_name):
+        """Libera el hueco de ejecución"""
+        lane = self.lanes[lane_name]
+        with self._cond:
+            lane.active -= 1
+            self._active -= 1
+            self._cond.notify_all()
+
+    def stats(self):
+        """Métricas de admisión por carril"""
+        with self._cond:
+            return {
+                "capacity": self.capacity,
+                "active": self._active,
+                "lanes": {name: lane.stats() for name, lane in self.lanes.items()}
+            }
@@ -1,265 +1,676 @@
-# app/api_flask.py
-from flask import Flask, request, jsonify
-import pandas as pd
-import numpy as np
-import joblib
-import os
-
-# Crear aplicación Flask
-app = Flask(__name__)
-
-# Cargar el modelo entrenado
-try:
-    model = joblib.load("app/model_cv.joblib")
-    print("Modelo cargado correctamente")
-except Exception as e:
-    print(f"Error cargando el modelo: {e}")
-    raise
-
-# Función para validar datos de entrada
-def validate_patient_data(data):
-    """Valida los datos del paciente"""
-    required_fields = [
-        'Age', 'Sex', 'ChestPainType', 'RestingBP', 'Cholesterol', 
-        'FastingBS', 'RestingECG', 'MaxHR', 'ExerciseAngina', 'Oldpeak', 'ST_Slope'
-    ]
-    
-    # Verificar campos requeridos
-    for field in required_fields:
-        if field not in data:
-            return False, f"Campo requerido faltante: {field}"
-    
-    # Validaciones básicas de tipos y rangos
-    try:
-        age = int(data['Age'])
-        if not (20 <= age <= 100):
-            return False, "Age debe estar entre 20 y 100"
-        
-        resting_bp = int(data['RestingBP'])
-        if not (80 <= resting_bp <= 200):
-            return False, "RestingBP debe estar entre 80 y 200"
-            
-        cholesterol = int(data['Cholesterol'])
-        if not (100 <= cholesterol <= 600):
-            return False, "Cholesterol debe estar entre 100 y 600"
-            
-        max_hr = int(data['MaxHR'])
-        if not (60 <= max_hr <= 220):
-            return False, "MaxHR debe estar entre 60 y 220"
-            
-        oldpeak = float(data['Oldpeak'])
-        if oldpeak < 0 or oldpeak > 10:
-            return False, "Oldpeak debe estar entre 0 y 10"
-            
-    except (ValueError, TypeError) as e:
-        return False, f"Error en tipos de datos: {str(e)}"
-    
-    return True, "Datos válidos"
-
-# Función para preprocesar datos
-def preprocess_input(data):
-    """Preprocesa los datos de entrada igual que durante el entrenamiento"""
-    
-    # Crear DataFrame
-    input_dict = {
-        'Age': [data['Age']],
-        'Sex': [data['Sex']],
-        'ChestPainType': [data['ChestPainType']],
-        'RestingBP': [data['RestingBP']],
-        'Cholesterol': [data['Cholesterol']],
-        'FastingBS': [data['FastingBS']],
-        'RestingECG': [data['RestingECG']],
-        'MaxHR': [data['MaxHR']],
-        'ExerciseAngina': [data['ExerciseAngina']],
-        'Oldpeak': [data['Oldpeak']],
-        'ST_Slope': [data['ST_Slope']]
-    }
-    
-    df = pd.DataFrame(input_dict)
-    
-    # Aplicar one-hot encoding igual que en entrenamiento
-    categorical_cols = ['Sex', 'ChestPainType', 'RestingECG', 'ExerciseAngina', 'ST_Slope']
-    df_encoded = pd.get_dummies(df, columns=categorical_cols, drop_first=True)
-    
-    # Asegurar que tengamos todas las columnas esperadas por el modelo
-    expected_columns = [
-        'Age', 'RestingBP', 'Cholesterol', 'FastingBS', 'MaxHR', 'Oldpeak',
-        'Sex_M', 'ChestPainType_ATA', 'ChestPainType_NAP', 'ChestPainType_TA',
-        'RestingECG_Normal', 'RestingECG_ST', 'ExerciseAngina_Y', 'ST_Slope_Flat', 'ST_Slope_Up'
-    ]
-    
-    # Agregar columnas faltantes con valor 0
-    for col in expected_columns:
-        if col not in df_encoded.columns:
-            df_encoded[col] = 0
-    
-    # Reordenar columnas
-    df_encoded = df_encoded[expected_columns]
-    
-    return df_encoded
-
-@app.route('/')
-def root():
-    """Endpoint de bienvenida"""
-    return jsonify({
-        "message": "Heart Disease Prediction API (Flask)",
-        "version": "1.0.0",
-        "endpoints": {
-            "health": "/health",
-            "predict": "/predict (POST)",
-            "model_info": "/model-info"
-        }
-    })
-
-@app.route('/health', methods=['GET'])
-def health_check():
-    """Endpoint para verificar el estado de la API"""
-    return jsonify({
-        "status": "healthy",
-        "model_loaded": True,
-        "message": "API funcionando correctamente"
-    })
-
-@app.route('/model-info', methods=['GET'])
-def model_info():
-    """Endpoint para obtener información del modelo"""
-    return jsonify({
-        "model_type": str(type(model.named_steps['clf']).__name__),
-        "api_version": "1.0.0",
-        "framework": "Flask"
-    })
-
-@app.route('/predict', methods=['POST'])
-def predict():
-    """
-    Realiza predicción de enfermedad cardíaca
-    
-    Espera JSON con:
-    - Age: Edad del paciente [años]
-    - Sex: Sexo del paciente [M, F]
-    - ChestPainType: Tipo de dolor pectoral [ATA, NAP, ASY, TA]
-    - RestingBP: Presión arterial en reposo [mm Hg]
-    - Cholesterol: Colesterol [mg/dl]
-    - FastingBS: Azúcar en ayunas [0, 1]
-    - RestingECG: ECG en reposo [Normal, ST, LVH]
-    - MaxHR: Frecuencia cardíaca máxima [latidos/minuto]
-    - ExerciseAngina: Angina inducida por ejercicio [N, Y]
-    - Oldpeak: Depresión del ST [valor numérico]
-    - ST_Slope: Pendiente del ST [Up, Flat, Down]
-    """
-    try:
-        # Obtener datos JSON
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({"error": "Se esperaba JSON en el cuerpo"}), 400
-        
-        # Validar datos
-        is_valid, validation_message = validate_patient_data(data)
-        if not is_valid:
-            return jsonify({"error": validation_message}), 400
-        
-        # Preprocesar datos
-        input_data = preprocess_input(data)
-        
-        # Realizar predicción
-        probability = model.predict_proba(input_data)[0][1]
-        prediction = int(probability > 0.5)
-        
-        # Determinar nivel de riesgo
-        if probability < 0.3:
-            risk_level = "Bajo"
-        elif probability < 0.7:
-            risk_level = "Moderado"
-        else:
-            risk_level = "Alto"
-        
-        return jsonify({
-            "heart_disease_probability": round(probability, 4),
-            "prediction": prediction,
-            "risk_level": risk_level,
-            "interpretation": "Enfermo" if prediction == 1 else "Sano"
-        })
-        
-    except Exception as e:
-        return jsonify({"error": f"Error en la predicción: {str(e)}"}), 500
-
-# Cliente de prueba integrado
-class HeartDiseaseClient:
-    """Cliente para probar la API sin dependencias externas"""
-    
-    def __init__(self, base_url="http://localhost:5000"):
-        self.base_url = base_url
-        self.test_patients = [
-            {
-                "Age": 52,
-                "Sex": "M",
-                "ChestPainType": "ASY",
-                "RestingBP": 125,
-                "Cholesterol": 212,
-                "FastingBS": 0,
-                "RestingECG": "Normal",
-                "MaxHR": 168,
-                "ExerciseAngina": "N",
-                "Oldpeak": 1.0,
-                "ST_Slope": "Flat"
-            },
-            {
-                "Age": 45,
-                "Sex": "F", 
-                "ChestPainType": "ATA",
-                "RestingBP": 130,
-                "Cholesterol": 240,
-                "FastingBS": 0,
-                "RestingECG": "Normal",
-                "MaxHR": 150,
-                "ExerciseAngina": "N",
-                "Oldpeak": 0.5,
-                "ST_Slope": "Up"
-            }
-        ]
-    
-    def test_health(self):
-        """Prueba el endpoint de health"""
-        try:
-            import requests
-            response = requests.get(f"{self.base_url}/health")
-            print("Health Check:", response.json())
-            return True
-        except Exception as e:
-            print(f"Error en health check: {e}")
-            return False
-    
-    def test_prediction(self, patient_index=0):
-        """Prueba una predicción"""
-        try:
-            import requests
-            patient_data = self.test_patients[patient_index]
-            response = requests.post(f"{self.base_url}/predict", json=patient_data)
-            
-            if response.status_code == 200:
-                result = response.json()
-                print("Predicción exitosa:")
-                print(f"   Probabilidad: {result['heart_disease_probability']:.2%}")
-                print(f"   Predicción: {result['interpretation']}")
-                print(f"   Nivel de riesgo: {result['risk_level']}")
-                return True
-            else:
-                print("Error en predicción:", response.json())
-                return False
-        except Exception as e:
-            print(f"Error en predicción: {e}")
-            return False
-
-if __name__ == "__main__":
-    print("Iniciando Heart Disease Prediction API (Flask)")
-    print("Endpoints disponibles:")
-    print("   • http://localhost:5000/")
-    print("   • http://localhost:5000/health") 
-    print("   • http://localhost:5000/predict (POST)")
-    print("   • http://localhost:5000/model-info")
-    print("\n Para ejecutar: python app/api.py")
-    print(" Para probar: python tests/test_api.py")
-    
-    # Ejecutar servidor
+# app/api.py
+from flask import Flask, Response, g, has_request_context, request, jsonify
+import functools
+import hmac
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from werkzeug.serving import WSGIRequestHandler
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.coalescing import SingleFlight
+from app.admission import AdmissionController, Lane, Overloaded
+from app.lifecycle import ServingLifecycle
+from app.features import FEATURE_COLUMNS, encode_patients
+from app.numpy_model import NumpyPipeline, load_model, model_type_name
+from app.profiling import ProfilerBusy, RequestTrace, SamplingProfiler, SlowRequestLog
+from app.routing import ModelRouter, ShadowScorer, UnknownModel, parse_models_config
+from app.serving_stats import ServingStats
+from app.what_if import MAX_FEATURES, WhatIfError, parse_axis, score_grid
+
+# Crear aplicación Flask
+app = Flask(__name__)
+
+# Ciclo de vida: el pod solo está listo después de cargar y calentar el modelo
+lifecycle = ServingLifecycle()
+
+# Peticiones /predict idénticas y concurrentes comparten un solo cómputo
+prediction_flight = SingleFlight()
+
+# Control de admisión: las predicciones interactivas tienen prioridad sobre los lotes
+admission = AdmissionController(
+    capacity=int(os.environ.get("ADMISSION_CAPACITY", 4)),
+    lanes=[
+        Lane(
+            "interactive", priority=0,
+            max_concurrent=int(os.environ.get("ADMISSION_INTERACTIVE_CONCURRENCY", 4)),
+            max_queue=int(os.environ.get("ADMISSION_INTERACTIVE_QUEUE", 32)),
+            queue_timeout=float(os.environ.get("ADMISSION_INTERACTIVE_QUEUE_MS", 500)) / 1000
+        ),
+        Lane(
+            "batch", priority=1,
+            max_concurrent=int(os.environ.get("ADMISSION_BATCH_CONCURRENCY", 1)),
+            max_queue=int(os.environ.get("ADMISSION_BATCH_QUEUE", 4)),
+            queue_timeout=float(os.environ.get("ADMISSION_BATCH_QUEUE_MS", 2000)) / 1000
+        )
+    ]
+)
+
+# Diagnóstico en producción: profiler por muestreo bajo demanda y traza de peticiones lentas.
+# Los endpoints /admin/* solo existen si se define ADMIN_TOKEN (cabecera X-Admin-Token)
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN", "")
+profiler = SamplingProfiler(max_seconds=float(os.environ.get("PROFILER_MAX_SECONDS", 60)))
+slow_requests = SlowRequestLog(
+    threshold_ms=float(os.environ.get("SLOW_REQUEST_MS", 250)),
+    capacity=int(os.environ.get("SLOW_REQUEST_BUFFER", 100))
+)
+
+# Tamaño máximo de un lote en /predict-batch
+MAX_BATCH_SIZE = int(os.environ.get("MAX_BATCH_SIZE", 1000))
+
+# Valores máximos por variable en /what-if (una superficie de 2 variables tiene hasta el cuadrado)
+WHAT_IF_MAX_POINTS = int(os.environ.get("WHAT_IF_MAX_POINTS", 200))
+
+# Calentamiento: peticiones /predict y un lote /predict-batch por el flujo completo
+WARMUP_REQUESTS = int(os.environ.get("WARMUP_REQUESTS", 10))
+# Clave del entorno WSGI que marca el calentamiento; solo la pone el test client
+# interno, un cliente HTTP no puede fijarla (a diferencia de una cabecera)
+WARMUP_ENVIRON_KEY = "heart.warmup"
+WARMUP_BATCH_SIZE = int(os.environ.get("WARMUP_BATCH_SIZE", 32))
+
+# Pacientes de ejemplo (calentamiento y cliente de prueba)
+SAMPLE_PATIENTS = [
+    {
+        "Age": 52,
+        "Sex": "M",
+        "ChestPainType": "ASY",
+        "RestingBP": 125,
+        "Cholesterol": 212,
+        "FastingBS": 0,
+        "RestingECG": "Normal",
+        "MaxHR": 168,
+        "ExerciseAngina": "N",
+        "Oldpeak": 1.0,
+        "ST_Slope": "Flat"
+    },
+    {
+        "Age": 45,
+        "Sex": "F", 
+        "ChestPainType": "ATA",
+        "RestingBP": 130,
+        "Cholesterol": 240,
+        "FastingBS": 0,
+        "RestingECG": "Normal",
+        "MaxHR": 150,
+        "ExerciseAngina": "N",
+        "Oldpeak": 0.5,
+        "ST_Slope": "Up"
+    }
+]
+
+# Modelos servidos a la vez: "nombre=ruta:peso,...". Peso 0 = solo por cabecera X-Model o como sombra.
+# Si existe el .npz junto al .joblib se usa el camino NumPy puro (sin sklearn ni pandas)
+MODELS_CONFIG = os.environ.get("MODELS", "cv=app/model_cv.joblib:100,simple=app/model.joblib:0")
+PRIMARY_MODEL = os.environ.get("PRIMARY_MODEL") or None
+SHADOW_MODEL = os.environ.get("SHADOW_MODEL", "")
+SHADOW_LOG = os.environ.get("SHADOW_LOG") or None
+PREFER_NUMPY_MODEL = os.environ.get("PREFER_NUMPY_MODEL", "1") == "1"
+
+# Cargar los modelos entrenados
+try:
+    loaded_models = {}
+    model_paths = {}
+    for name, path, weight in parse_models_config(MODELS_CONFIG):
+        load_start = time.perf_counter()
+        loaded_models[name] = (load_model(path, prefer_numpy=PREFER_NUMPY_MODEL), weight)
+        model_paths[name] = path
+        lifecycle.record(f"model_load_{name}", time.perf_counter() - load_start)
+    
+    router = ModelRouter(loaded_models, primary=PRIMARY_MODEL)
+    # Modelo principal (compatibilidad con el código que usa un único modelo)
+    model = router.models[router.primary]
+    print(f"Modelos cargados correctamente: {list(router.models)} (principal: {router.primary})")
+except Exception as e:
+    print(f"Error cargando el modelo: {e}")
+    raise
+
+# Modelo sombra: puntúa en segundo plano, fuera del camino crítico
+shadow = None
+if SHADOW_MODEL:
+    if SHADOW_MODEL not in router.models:
+        raise ValueError(f"SHADOW_MODEL '{SHADOW_MODEL}' no está en MODELS")
+    shadow = ShadowScorer(
+        SHADOW_MODEL, router.models[SHADOW_MODEL],
+        workers=int(os.environ.get("SHADOW_WORKERS", 1)),
+        max_pending=int(os.environ.get("SHADOW_MAX_PENDING", 256)),
+        log_path=SHADOW_LOG
+    )
+
+def reference_stats(loaded):
+    """Media y desviación de las features en el entrenamiento (las del StandardScaler)"""
+    if isinstance(loaded, NumpyPipeline):
+        return loaded.mean, loaded.scale
+    scaler = loaded.named_steps["scaler"]
+    return scaler.mean_, scaler.scale_
+
+# Contadores de tráfico, latencia, riesgo y deriva que consume el dashboard en vivo
+serving_stats = ServingStats(
+    FEATURE_COLUMNS, *reference_stats(model),
+    window=int(os.environ.get("DRIFT_WINDOW", 1000))
+)
+
+# Endpoints cuyo tráfico se contabiliza en serving_stats
+PREDICTION_PATHS = ("/predict", "/predict-batch")
+
+# Campos requeridos de un paciente
+REQUIRED_FIELDS = [
+    'Age', 'Sex', 'ChestPainType', 'RestingBP', 'Cholesterol', 
+    'FastingBS', 'RestingECG', 'MaxHR', 'ExerciseAngina', 'Oldpeak', 'ST_Slope'
+]
+
+# Tipo y rango válido de los campos numéricos
+FIELD_RANGES = {
+    'Age': (int, 20, 100),
+    'RestingBP': (int, 80, 200),
+    'Cholesterol': (int, 100, 600),
+    'MaxHR': (int, 60, 220),
+    'Oldpeak': (float, 0, 10)
+}
+
+# Función para validar datos de entrada
+def validate_patient_data(data):
+    """Valida los datos del paciente"""
+    # Verificar campos requeridos
+    for field in REQUIRED_FIELDS:
+        if field not in data:
+            return False, f"Campo requerido faltante: {field}"
+    
+    # Validaciones básicas de tipos y rangos
+    try:
+        for field, (cast, low, high) in FIELD_RANGES.items():
+            if not (low <= cast(data[field]) <= high):
+                return False, f"{field} debe estar entre {low} y {high}"
+            
+    except (ValueError, TypeError) as e:
+        return False, f"Error en tipos de datos: {str(e)}"
+    
+    return True, "Datos válidos"
+
+# Función para preprocesar datos
+def preprocess_input(data):
+    """Preprocesa los datos de entrada igual que durante el entrenamiento"""
+    # One-hot encoding con las categorías del entrenamiento, sin pasar por pandas
+    return encode_patients([data])
+
+def preprocess_batch(patients):
+    """Preprocesa varios pacientes en una sola matriz"""
+    return encode_patients(patients)
+
+def build_prediction_result(probability):
+    """Construye la respuesta a partir de la probabilidad de enfermedad"""
+    prediction = int(probability > 0.5)
+    
+    # Determinar nivel de riesgo
+    if probability < 0.3:
+        risk_level = "Bajo"
+    elif probability < 0.7:
+        risk_level = "Moderado"
+    else:
+        risk_level = "Alto"
+    
+    return {
+        "heart_disease_probability": round(probability, 4),
+        "prediction": prediction,
+        "risk_level": risk_level,
+        "interpretation": "Enfermo" if prediction == 1 else "Sano"
+    }
+
+def canonical_patient_key(data):
+    """
+    Clave canónica de un paciente: solo campos requeridos, en orden fijo
+
+    Los valores van tal cual los recibe el codificador (sin normalizar espacios
+    ni tipos): dos peticiones solo comparten clave si se puntúan igual.
+    """
+    return json.dumps({field: data[field] for field in REQUIRED_FIELDS if field in data}, sort_keys=True)
+
+def submit_shadow(model_name, input_data, probabilities):
+    """Envía la entrada al modelo sombra sin esperar su resultado"""
+    if shadow is not None and model_name != shadow.name:
+        shadow.submit(model_name, input_data, probabilities)
+
+def compute_prediction(data, model_name=None):
+    """Valida, preprocesa y predice un paciente. Devuelve (respuesta, código HTTP)"""
+    model_name = model_name or router.primary
+
+    # Validar datos
+    with trace_stage("validate"):
+        is_valid, validation_message = validate_patient_data(data)
+    if not is_valid:
+        return {"error": validation_message}, 400
+    
+    # Preprocesar datos
+    with trace_stage("preprocess"):
+        input_data = preprocess_input(data)
+    
+    # Realizar predicción
+    with trace_stage("predict"):
+        probabilities = router.models[model_name].predict_proba(input_data)[:, 1]
+    if not is_warmup():
+        with trace_stage("shadow_submit"):
+            submit_shadow(model_name, input_data, probabilities)
+        serving_stats.record_predictions(input_data, probabilities)
+    
+    result = build_prediction_result(probabilities[0])
+    result["model"] = model_name
+    return result, 200
+
+def compute_batch_prediction(patients, model_name=None):
+    """Valida todos los pacientes y predice los válidos en una sola llamada"""
+    model_name = model_name or router.primary
+    results = [None] * len(patients)
+    valid_indices = []
+    
+    with trace_stage("validate"):
+        for i, patient in enumerate(patients):
+            is_valid, validation_message = validate_patient_data(patient) if isinstance(patient, dict) \
+                else (False, "Cada paciente debe ser un objeto JSON")
+            if is_valid:
+                valid_indices.append(i)
+            else:
+                results[i] = {"error": validation_message}
+    
+    if valid_indices:
+        with trace_stage("preprocess"):
+            input_data = preprocess_batch([patients[i] for i in valid_indices])
+        with trace_stage("predict"):
+            probabilities = router.models[model_name].predict_proba(input_data)[:, 1]
+        if not is_warmup():
+            with trace_stage("shadow_submit"):
+                submit_shadow(model_name, input_data, probabilities)
+            serving_stats.record_predictions(input_data, probabilities)
+        for i, probability in zip(valid_indices, probabilities):
+            results[i] = build_prediction_result(probability)
+    
+    for i, result in enumerate(results):
+        result["patient_id"] = i + 1
+    
+    return results
+
+def is_warmup():
+    """True en las peticiones de calentamiento, que no cuentan en métricas, drift ni reparto"""
+    return has_request_context() and bool(request.environ.get(WARMUP_ENVIRON_KEY))
+
+def trace_stage(name):
+    """Etapa de la traza de la petición en curso (no hace nada fuera de una petición)"""
+    trace = g.get("trace") if has_request_context() else None
+    return trace.stage(name) if trace is not None else nullcontext()
+
+@contextmanager
+def admitted(lane):
+    """Hueco del carril de admisión, separando en la traza la espera en cola"""
+    with trace_stage("admission_wait"):
+        admission.acquire(lane, record=not is_warmup())
+    try:
+        yield
+    finally:
+        admission.release(lane)
+
+def route_request(key):
+    """Elige el modelo: cabecera X-Model o reparto por pesos. Lanza UnknownModel si no existe"""
+    return router.choose(key, requested=request.headers.get("X-Model"), record=not is_warmup())
+
+def unknown_model_response(error):
+    """Respuesta 400 cuando se pide un modelo que no está cargado"""
+    return jsonify({
+        "error": f"Modelo desconocido: {error.args[0]}",
+        "available_models": list(router.models)
+    }), 400
+
+def overloaded_response(error):
+    """Respuesta 503 rápida cuando se descarta una petición por saturación"""
+    response = jsonify({"error": str(error), "lane": error.lane})
+    response.headers["Retry-After"] = str(error.retry_after)
+    return response, 503
+
+def admin_only(view):
+    """Protege un endpoint con ADMIN_TOKEN; sin token configurado el endpoint no existe"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not ADMIN_TOKEN:
+            return jsonify({"error": "No encontrado"}), 404
+        if not hmac.compare_digest(request.headers.get("X-Admin-Token", ""), ADMIN_TOKEN):
+            return jsonify({"error": "No autorizado"}), 403
+        return view(*args, **kwargs)
+    return wrapper
+
+@app.before_request
+def start_trace():
+    """Cada petición lleva una traza por etapas; solo se guardan las lentas"""
+    if not request.path.startswith("/admin/"):
+        g.trace = RequestTrace(request.method, request.path)
+
+@app.after_request
+def finish_trace(response):
+    trace = g.pop("trace", None)
+    if trace is not None and not is_warmup():
+        total_ms = slow_requests.finish(trace, response.status_code)
+        if request.path in PREDICTION_PATHS:
+            serving_stats.record_request(response.status_code, total_ms)
+    return response
+
+@app.route('/')
+def root():
+    """Endpoint de bienvenida"""
+    return jsonify({
+        "message": "Heart Disease Prediction API (Flask)",
+        "version": "1.0.0",
+        "endpoints": {
+            "health": "/health",
+            "ready": "/ready",
+            "predict": "/predict (POST)",
+            "predict_batch": "/predict-batch (POST)",
+            "what_if": "/what-if (POST)",
+            "model_info": "/model-info",
+            "metrics": "/metrics"
+        }
+    })
+
+@app.route('/health', methods=['GET'])
+def health_check():
+    """
+    Liveness: el proceso responde y el modelo está cargado
+
+    No depende del calentamiento: un calentamiento fallido deja el pod fuera
+    del tráfico (/ready en 503) pero no provoca reinicios.
+    """
+    return jsonify({
+        "status": "healthy",
+        "model_loaded": model is not None,
+        "lifecycle_state": lifecycle.state,
+        "message": "API funcionando correctamente"
+    })
+
+@app.route('/ready', methods=['GET'])
+def readiness_check():
+    """Readiness: el modelo está cargado y calentado, el pod puede recibir tráfico"""
+    status = lifecycle.status()
+    return jsonify({"ready": lifecycle.ready, **status}), 200 if lifecycle.ready else 503
+
+@app.route('/model-info', methods=['GET'])
+def model_info():
+    """Endpoint para obtener información del modelo"""
+    return jsonify({
+        "model_type": model_type_name(model),
+        "model_format": "numpy" if isinstance(model, NumpyPipeline) else "joblib",
+        "primary_model": router.primary,
+        "models": {
+            name: {
+                "model_type": model_type_name(loaded),
+                "model_format": "numpy" if isinstance(loaded, NumpyPipeline) else "joblib",
+                "memory_bytes": loaded.nbytes if isinstance(loaded, NumpyPipeline) else None,
+                "path": model_paths[name],
+                "weight": router.weights[name]
+            }
+            for name, loaded in router.models.items()
+        },
+        "shadow_model": shadow.name if shadow else None,
+        "features": FEATURE_COLUMNS,
+        "api_version": "1.0.0",
+        "framework": "Flask"
+    })
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Endpoint con métricas de servicio"""
+    return jsonify({
+        "coalescing": prediction_flight.stats(),
+        "admission": admission.stats(),
+        "routing": router.stats(),
+        "shadow": shadow.stats() if shadow else None,
+        "slow_requests": slow_requests.stats(),
+        "serving": serving_stats.snapshot()
+    })
+
+@app.route('/admin/profile/start', methods=['POST'])
+@admin_only
+def profile_start():
+    """
+    Inicia el profiler por muestreo
+    
+    Parámetros (query): seconds (defecto 10, máximo PROFILER_MAX_SECONDS)
+    e interval_ms (defecto 10). Se detiene solo al cumplirse la duración.
+    """
+    try:
+        status = profiler.start(
+            seconds=float(request.args.get("seconds", 10)),
+            interval=float(request.args.get("interval_ms", 10)) / 1000
+        )
+    except ValueError:
+        return jsonify({"error": "seconds e interval_ms deben ser numéricos finitos"}), 400
+    except ProfilerBusy as e:
+        return jsonify({"error": str(e), **profiler.status()}), 409
+    return jsonify(status), 202
+
+@app.route('/admin/profile/stop', methods=['POST'])
+@admin_only
+def profile_stop():
+    """Detiene el perfilado en curso antes de tiempo"""
+    return jsonify(profiler.stop())
+
+@app.route('/admin/profile', methods=['GET'])
+@admin_only
+def profile_download():
+    """Pilas de la última sesión en formato collapsed (flamegraph.pl, speedscope)"""
+    if request.args.get("format") == "json":
+        return jsonify(profiler.status())
+    return Response(
+        profiler.collapsed(), mimetype="text/plain",
+        headers={"Content-Disposition": "attachment; filename=profile.collapsed.txt"}
+    )
+
+@app.route('/admin/slow-requests', methods=['GET'])
+@admin_only
+def slow_requests_list():
+    """Trazas por etapa de las peticiones que superaron SLOW_REQUEST_MS (más recientes primero)"""
+    limit = request.args.get("limit", type=int)
+    return jsonify({**slow_requests.stats(), "requests": slow_requests.recent(limit)})
+
+@app.route('/predict', methods=['POST'])
+def predict():
+    """
+    Realiza predicción de enfermedad cardíaca
+    
+    Espera JSON con:
+    - Age: Edad del paciente [años]
+    - Sex: Sexo del paciente [M, F]
+    - ChestPainType: Tipo de dolor pectoral [ATA, NAP, ASY, TA]
+    - RestingBP: Presión arterial en reposo [mm Hg]
+    - Cholesterol: Colesterol [mg/dl]
+    - FastingBS: Azúcar en ayunas [0, 1]
+    - RestingECG: ECG en reposo [Normal, ST, LVH]
+    - MaxHR: Frecuencia cardíaca máxima [latidos/minuto]
+    - ExerciseAngina: Angina inducida por ejercicio [N, Y]
+    - Oldpeak: Depresión del ST [valor numérico]
+    - ST_Slope: Pendiente del ST [Up, Flat, Down]
+    
+    La cabecera opcional X-Model elige el modelo; si no, se reparte por pesos.
+    """
+    try:
+        # Obtener datos JSON
+        with trace_stage("parse"):
+            data = request.get_json()
+        
+        if not data:
+            return jsonify({"error": "Se esperaba JSON en el cuerpo"}), 400
+        if not isinstance(data, dict):
+            return jsonify({"error": "Se esperaba un objeto JSON con los datos del paciente"}), 400
+        
+        with trace_stage("route"):
+            key = canonical_patient_key(data)
+            model_name = route_request(key)
+        
+        # Peticiones idénticas en curso (mismo paciente y modelo) comparten validación,
+        # preprocesamiento y predicción. Solo el cómputo líder ocupa un hueco del carril interactivo
+        def compute_admitted():
+            with admitted("interactive"):
+                return compute_prediction(data, model_name)
+        
+        with trace_stage("coalesced_compute"):
+            (result, status), coalesced = prediction_flight.do(f"{model_name}|{key}", compute_admitted,
+                                                                 record=not is_warmup())
+        g.trace.tags.update(model=model_name, coalesced=coalesced)
+        
+        with trace_stage("serialize"):
+            response = jsonify(result)
+        response.headers["X-Coalesced"] = "1" if coalesced else "0"
+        response.headers["X-Model"] = model_name
+        return response, status
+        
+    except UnknownModel as e:
+        return unknown_model_response(e)
+    except Overloaded as e:
+        return overloaded_response(e)
+    except Exception as e:
+        return jsonify({"error": f"Error en la predicción: {str(e)}"}), 500
+
+@app.route('/predict-batch', methods=['POST'])
+def predict_batch():
+    """
+    Realiza predicciones para un lote de pacientes
+    
+    Espera JSON con:
+    - patients: lista de pacientes con los mismos campos que /predict
+    
+    Los lotes van por un carril de menor prioridad que /predict.
+    """
+    try:
+        with trace_stage("parse"):
+            data = request.get_json()
+        patients = data.get("patients") if isinstance(data, dict) else None
+        
+        if not isinstance(patients, list) or not patients:
+            return jsonify({"error": "Se esperaba JSON con una lista 'patients' no vacía"}), 400
+        if len(patients) > MAX_BATCH_SIZE:
+            return jsonify({"error": f"El lote supera el máximo de {MAX_BATCH_SIZE} pacientes"}), 413
+        
+        # El lote se enruta por la clave de su primer paciente
+        first = patients[0] if isinstance(patients[0], dict) else {}
+        with trace_stage("route"):
+            model_name = route_request(canonical_patient_key(first))
+        g.trace.tags.update(model=model_name, batch_size=len(patients))
+        
+        with admitted("batch"):
+            results = compute_batch_prediction(patients, model_name)
+        
+        with trace_stage("serialize"):
+            response = jsonify({"results": results, "count": len(results), "model": model_name})
+        response.headers["X-Model"] = model_name
+        return response
+        
+    except UnknownModel as e:
+        return unknown_model_response(e)
+    except Overloaded as e:
+        return overloaded_response(e)
+    except Exception as e:
+        return jsonify({"error": f"Error en la predicción por lotes: {str(e)}"}), 500
+
+@app.route('/what-if', methods=['POST'])
+def what_if():
+    """
+    Sensibilidad del riesgo de un paciente a una o dos variables numéricas
+    
+    Espera JSON con:
+    - patient: paciente con los mismos campos que /predict
+    - vary: {variable: [valores] o {"min", "max", "steps"}}, con 1 o 2 variables
+      de FIELD_RANGES y valores dentro de su rango
+    
+    Todas las variantes se codifican como una sola matriz (broadcasting sobre
+    la fila del paciente) y se puntúan con una sola llamada a predict_proba;
+    con modelos de árboles solo una por intervalo entre umbrales (score_grid).
+    Devuelve la curva (1 variable) o la superficie (2 variables) de probabilidades.
+    Las variantes son hipotéticas: no cuentan en las estadísticas de deriva ni van al modelo sombra.
+    """
+    try:
+        with trace_stage("parse"):
+            data = request.get_json()
+        patient = data.get("patient") if isinstance(data, dict) else None
+        vary = data.get("vary") if isinstance(data, dict) else None
+        
+        if not isinstance(patient, dict) or not isinstance(vary, dict) or not vary:
+            return jsonify({"error": "Se esperaba JSON con 'patient' y 'vary' ({variable: valores})"}), 400
+        if len(vary) > MAX_FEATURES:
+            return jsonify({"error": f"Como máximo {MAX_FEATURES} variables en 'vary'"}), 400
+        
+        with trace_stage("validate"):
+            is_valid, validation_message = validate_patient_data(patient)
+            if not is_valid:
+                return jsonify({"error": validation_message}), 400
+            features = list(vary)
+            axes = [parse_axis(feature, vary[feature], FIELD_RANGES, WHAT_IF_MAX_POINTS) for feature in features]
+        
+        with trace_stage("route"):
+            model_name = route_request(canonical_patient_key(patient))
+        
+        with admitted("interactive"):
+            with trace_stage("preprocess"):
+                base_row = preprocess_input(patient)
+            with trace_stage("predict"):
+                baseline, surface = score_grid(router.models[model_name], base_row, features, axes)
+        g.trace.tags.update(model=model_name, variants=surface.size)
+        
+        with trace_stage("serialize"):
+            response = jsonify({
+                "model": model_name,
+                "baseline": build_prediction_result(baseline),
+                "features": features,
+                "values": {feature: values.tolist() for feature, values in zip(features, axes)},
+                "shape": list(surface.shape),
+                "probabilities": np.round(surface, 4).tolist()
+            })
+        response.headers["X-Model"] = model_name
+        return response
+        
+    except WhatIfError as e:
+        return jsonify({"error": str(e)}), 400
+    except UnknownModel as e:
+        return unknown_model_response(e)
+    except Overloaded as e:
+        return overloaded_response(e)
+    except Exception as e:
+        return jsonify({"error": f"Error en el análisis what-if: {str(e)}"}), 500
+
+def warmup_request(i):
+    """Una petición de calentamiento por el flujo HTTP completo"""
+    client = app.test_client()
+    client.environ_base[WARMUP_ENVIRON_KEY] = True
+    base = SAMPLE_PATIENTS[i % len(SAMPLE_PATIENTS)]
+    # Se calientan todos los modelos cargados, no solo el principal
+    model_names = list(router.models)
+    headers = {"X-Model": model_names[i % len(model_names)]}
+    
+    # La última iteración calienta el camino por lotes
+    if i == WARMUP_REQUESTS:
+        patients = [dict(base, Age=30 + j % 60) for j in range(WARMUP_BATCH_SIZE)]
+        response = client.post('/predict-batch', json={"patients": patients}, headers=headers)
+    else:
+        # Edades distintas para que el calentamiento no se agrupe por coalescing
+        response = client.post('/predict', json=dict(base, Age=30 + i % 60), headers=headers)
+    
+    if response.status_code != 200:
+        raise RuntimeError(f"Calentamiento falló con {response.status_code}: {response.get_json()}")
+
+lifecycle.start_warmup(warmup_request, WARMUP_REQUESTS + 1)
+
+if __name__ == "__main__":
+    print("Iniciando Heart Disease Prediction API (Flask)")
+    print("Endpoints disponibles:")
+    print("   • http://localhost:5000/")
+    print("   • http://localhost:5000/health") 
+    print("   • http://localhost:5000/ready")
+    print("   • http://localhost:5000/predict (POST)")
+    print("   • http://localhost:5000/predict-batch (POST)")
+    print("   • http://localhost:5000/what-if (POST)")
+    print("   • http://localhost:5000/model-info")
+    print("   • http://localhost:5000/metrics")
+    print("\n Para ejecutar: python app/api.py")
+    print(" Para probar: python tests/test_api.py")
+    
+    # HTTP/1.1 para que los clientes reutilicen la conexión (keep-alive) entre peticiones
+    WSGIRequestHandler.protocol_version = "HTTP/1.1"
+    
+    # Ejecutar servidor
     app.run(host="0.0.0.0", port=5000, debug=True)
\ No newline at end of file
@@ -0,0 +1,305 @@
+# app/bulk_scoring.py
+import csv
+import io
+import os
+import queue
+import socket
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+
+# Columnas que se añaden a cada fila del CSV de salida
+OUTPUT_COLUMNS = ["heart_disease_probability", "prediction", "risk_level", "error"]
+
+
+class BulkScoringError(RuntimeError):
+    """Un shard agotó sus reintentos o no quedan workers para terminar el trabajo"""
+
+
+def parse_address(address):
+    """'host:puerto' -> (host, puerto)"""
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def result_values(result):
+    """Valores de OUTPUT_COLUMNS para un resultado de HeartDiseasePredictor"""
+    if "error" in result:
+        return ["", "", "", result["error"]]
+    return [result["heart_disease_probability"], result["prediction"], result["risk_level"], ""]
+
+
+def read_records(lines):
+    """
+    Agrupa líneas físicas en registros CSV: genera (texto original, campos)
+
+    Un campo entre comillas puede contener saltos de línea, así que un registro
+    puede ocupar varias líneas; su texto las incluye todas. Se omiten las líneas en blanco.
+    """
+    lines = iter(lines)
+    buffer = []
+
+    def consumed():
+        for line in lines:
+            buffer.append(line)
+            yield line
+
+    # csv.reader pide líneas solo hasta completar el registro: buffer tiene exactamente las suyas
+    for row in csv.reader(consumed()):
+        text = "".join(buffer).rstrip("\r\n")
+        buffer.clear()
+        if text.strip():
+            yield text, row
+
+
+def score_shard(predictor, header, text):
+    """
+    Puntúa un shard (registros CSV sin cabecera) y devuelve los registros de salida
+
+    Cada registro de salida es el de entrada más OUTPUT_COLUMNS, en el mismo orden.
+    """
+    records = list(read_records(io.StringIO(text, newline="")))
+    patients = [dict(zip(header, row)) for _, row in records]
+    results = predictor.batch_predict(patients)
+
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator="\n")
+    for (line, _), result in zip(records, results):
+        out.write(line)
+        out.write(",")
+        writer.writerow(result_values(result))
+    return out.getvalue()
+
+
+def run_worker(address, authkey, predictor, name=None):
+    """
+    Worker: se conecta al coordinador y puntúa shards hasta recibir 'stop'
+
+    El modelo se carga una sola vez (predictor) y se reutiliza para todos los shards.
+    Devuelve el número de shards puntuados.
+    """
+    name = name or f"{socket.gethostname()}:{os.getpid()}"
+    scored = 0
+    with Client(parse_address(address), authkey=authkey) as conn:
+        conn.send(("hello", {"name": name, "fingerprint": predictor.model_fingerprint}))
+        while True:
+            message = conn.recv()
+            if message[0] == "stop":
+                return scored
+            if message[0] == "reject":
+                raise BulkScoringError(f"Coordinador rechazó el worker: {message[1]}")
+
+            _, shard_id, header, text = message
+            start = time.perf_counter()
+            try:
+                output = score_shard(predictor, header, text)
+            except Exception as e:
+                conn.send(("error", shard_id, str(e)))
+                continue
+            conn.send(("result", shard_id, output, time.perf_counter() - start))
+            scored += 1
+
+
+class BulkScoringJob:
+    """
+    Coordinador de puntuación masiva
+
+    Divide los registros del CSV en shards y los reparte a los workers que se
+    conectan (pull: cada worker pide otro shard al terminar, así los más
+    rápidos hacen más trabajo). Un shard cuyo worker falla, se desconecta o
+    supera shard_timeout vuelve a la cola hasta max_attempts veces. La salida
+    se escribe en el orden de entrada a medida que llegan los shards.
+    """
+
+    def __init__(self, input_path, output_path, shard_size=5000, max_attempts=3,
+                 shard_timeout=300, fingerprint=None):
+        self.input_path = input_path
+        self.output_path = output_path
+        self.shard_size = shard_size
+        self.max_attempts = max_attempts
+        self.shard_timeout = shard_timeout
+        self.fingerprint = fingerprint
+
+        # Se corta por registros CSV, no por líneas: un campo entre comillas con
+        # saltos de línea no puede quedar repartido entre dos shards
+        with open(input_path, encoding="utf-8", newline="") as f:
+            records = read_records(f)
+            self.header_line, self.header = next(records)
+            lines = [line for line, _ in records]
+        self.shards = [
+            "\n".join(lines[i:i + shard_size]) for i in range(0, len(lines), shard_size)
+        ]
+        self.shard_rows = [min(shard_size, len(lines) - i) for i in range(0, len(lines), shard_size)]
+        self.total_rows = len(lines)
+
+        self._pending = queue.Queue()
+        for shard_id in range(len(self.shards)):
+            self._pending.put(shard_id)
+        self._attempts = [0] * len(self.shards)
+        self._completed = set()
+        # Salida de shards terminados que aún no se pudieron escribir en orden
+        self._results = {}
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._failure = None
+        self._workers = {}
+        self._stats = {"retries": 0, "rows_done": 0, "shards_done": 0, "worker_seconds": 0.0}
+
+    def _requeue(self, shard_id, reason):
+        with self._lock:
+            self._attempts[shard_id] += 1
+            self._stats["retries"] += 1
+            if self._attempts[shard_id] >= self.max_attempts:
+                self._failure = f"Shard {shard_id} falló {self._attempts[shard_id]} veces: {reason}"
+                self._done.set()
+                return
+        print(f"   Reintentando shard {shard_id} ({reason})")
+        self._pending.put(shard_id)
+
+    def _complete(self, shard_id, output, seconds, worker):
+        with self._lock:
+            if shard_id in self._completed:
+                return
+            self._completed.add(shard_id)
+            self._results[shard_id] = output
+            self._stats["shards_done"] += 1
+            self._stats["rows_done"] += self.shard_rows[shard_id]
+            self._stats["worker_seconds"] += seconds
+            self._workers[worker]["shards"] += 1
+            if len(self._completed) == len(self.shards):
+                self._done.set()
+
+    def _next_shard(self):
+        while not self._done.is_set():
+            try:
+                return self._pending.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return None
+
+    def _serve(self, conn):
+        """Atiende a un worker conectado hasta terminar el trabajo o perder la conexión"""
+        worker, shard_id = None, None
+        try:
+            _, info = conn.recv()
+            if self.fingerprint and info.get("fingerprint") != self.fingerprint:
+                conn.send(("reject", f"modelo {info.get('fingerprint')} distinto de {self.fingerprint}"))
+                print(f"   Worker {info['name']} rechazado: otra versión del modelo")
+                return
+            with self._lock:
+                worker = name = info["name"]
+                suffix = 1
+                while worker in self._workers:
+                    worker = f"{name}#{suffix}"
+                    suffix += 1
+                self._workers[worker] = {"shards": 0, "connected": True}
+
+            while True:
+                shard_id = self._next_shard()
+                if shard_id is None:
+                    conn.send(("stop",))
+                    return
+                conn.send(("shard", shard_id, self.header, self.shards[shard_id]))
+                if not conn.poll(self.shard_timeout):
+                    raise TimeoutError(f"sin respuesta en {self.shard_timeout}s")
+                message = conn.recv()
+                if message[0] == "result":
+                    self._complete(shard_id, message[2], message[3], worker)
+                else:
+                    self._requeue(shard_id, message[2])
+                shard_id = None
+        except Exception as e:
+            # Conexión perdida, timeout o mensaje inválido (no deserializable,
+            # tupla incompleta, hello sin nombre): el shard en curso vuelve a la cola
+            if shard_id is not None:
+                self._requeue(shard_id, f"worker {worker}: {e or type(e).__name__}")
+        finally:
+            with self._lock:
+                if worker in self._workers:
+                    self._workers[worker]["connected"] = False
+            conn.close()
+
+    def progress(self):
+        with self._lock:
+            return {
+                **self._stats,
+                "total_rows": self.total_rows,
+                "total_shards": len(self.shards),
+                "workers": sum(1 for w in self._workers.values() if w["connected"]),
+                "shards_by_worker": {name: w["shards"] for name, w in self._workers.items()}
+            }
+
+    def _write_ordered(self, out, next_shard):
+        """Escribe los shards consecutivos ya terminados; devuelve el siguiente pendiente"""
+        while True:
+            with self._lock:
+                output = self._results.pop(next_shard, None)
+            if output is None:
+                return next_shard
+            out.write(output)
+            next_shard += 1
+
+    def run(self, address, authkey, on_listening=None, progress_every=2.0, worker_timeout=60):
+        """
+        Escucha en address, reparte los shards y escribe la salida ordenada
+
+        on_listening(dirección_real) se llama cuando el listener está listo (p. ej.
+        para lanzar workers locales). Si pasan worker_timeout segundos sin ningún
+        worker conectado y queda trabajo, el job falla.
+        """
+        listener = Listener(parse_address(address), authkey=authkey)
+        host, port = listener.address
+        if on_listening:
+            on_listening(f"{host}:{port}")
+
+        def accept():
+            while not self._done.is_set():
+                try:
+                    conn = listener.accept()
+                except Exception:
+                    # Listener cerrado o handshake de autenticación fallido
+                    if self._done.is_set():
+                        return
+                    continue
+                threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+        threading.Thread(target=accept, daemon=True).start()
+
+        start = time.perf_counter()
+        last_report = start
+        idle_since = time.monotonic()
+        next_shard = 0
+        tmp_path = self.output_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8", newline="") as out:
+                out.write(self.header_line + "," + ",".join(OUTPUT_COLUMNS) + "\n")
+                while next_shard < len(self.shards):
+                    self._done.wait(0.1)
+                    if self._failure:
+                        raise BulkScoringError(self._failure)
+                    next_shard = self._write_ordered(out, next_shard)
+
+                    progress = self.progress()
+                    if progress["workers"]:
+                        idle_since = time.monotonic()
+                    elif time.monotonic() - idle_since > worker_timeout and next_shard < len(self.shards):
+                        raise BulkScoringError(f"Sin workers conectados durante {worker_timeout}s")
+
+                    now = time.perf_counter()
+                    if now - last_report >= progress_every:
+                        last_report = now
+                        rate = progress["rows_done"] / (now - start)
+                        print(f"   {progress['rows_done']}/{self.total_rows} filas "
+                              f"({progress['shards_done']}/{progress['total_shards']} shards) | "
+                              f"{rate:,.0f} filas/s | workers: {progress['workers']} | "
+                              f"reintentos: {progress['retries']}")
+            os.replace(tmp_path, self.output_path)
+        finally:
+            self._done.set()
+            listener.close()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        elapsed = time.perf_counter() - start
+        return {**self.progress(), "seconds": round(elapsed, 3),
+                "rows_per_second": round(self.total_rows / elapsed, 1) if elapsed else None}
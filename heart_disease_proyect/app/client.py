@@ -0,0 +1,354 @@
+# app/client.py
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+import queue
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Mismo máximo por defecto que MAX_BATCH_SIZE en la API; por encima responde 413
+DEFAULT_BATCH_SIZE = 500
+
+
+class HeartDiseaseAPIError(RuntimeError):
+    """La API respondió con error (o no respondió) después de agotar los reintentos"""
+
+    def __init__(self, message, status=None, payload=None):
+        super().__init__(message)
+        self.status = status
+        self.payload = payload
+
+
+class InvalidPatient(HeartDiseaseAPIError):
+    """Un paciente no pasó la validación de la API (el resto del lote sí se puntúa)"""
+
+
+class _Transport:
+    """
+    Sesión HTTP compartida: conexiones keep-alive reutilizadas, timeouts y reintentos
+
+    Se reintenta ante 503 (saturación: se respeta Retry-After) y errores de conexión
+    o timeout, con espera exponencial y jitter. Las predicciones no tienen efectos
+    secundarios, así que repetir un POST es seguro.
+    """
+
+    def __init__(self, base_url, timeout, max_retries, backoff, max_backoff, pool_size):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._lock = threading.Lock()
+        self.requests_sent = 0
+        self.retries = 0
+
+    def _count(self, retry=False):
+        with self._lock:
+            if retry:
+                self.retries += 1
+            else:
+                self.requests_sent += 1
+
+    def _delay(self, attempt, retry_after=None):
+        delay = min(self.backoff * 2 ** attempt, self.max_backoff) * random.uniform(0.5, 1.0)
+        try:
+            # El servidor indica cuándo volver a intentar; se respeta hasta max_backoff
+            return max(delay, min(float(retry_after), self.max_backoff))
+        except (TypeError, ValueError):
+            return delay
+
+    def request(self, method, path, payload=None, headers=None):
+        """Devuelve (json, cabeceras) o lanza HeartDiseaseAPIError"""
+        for attempt in range(self.max_retries + 1):
+            self._count()
+            try:
+                response = self.session.request(method, self.base_url + path, json=payload,
+                                                headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries:
+                    raise HeartDiseaseAPIError(f"Sin respuesta de {self.base_url}: {e}") from e
+                self._count(retry=True)
+                time.sleep(self._delay(attempt))
+                continue
+
+            if response.status_code == 503 and attempt < self.max_retries:
+                self._count(retry=True)
+                time.sleep(self._delay(attempt, response.headers.get("Retry-After")))
+                continue
+
+            try:
+                body = response.json()
+            except ValueError:
+                body = {"error": response.text}
+            if response.status_code >= 400:
+                error_class = InvalidPatient if response.status_code == 400 and path == "/predict" \
+                    else HeartDiseaseAPIError
+                raise error_class(body.get("error", f"HTTP {response.status_code}"),
+                                  status=response.status_code, payload=body)
+            return body, response.headers
+
+    def predict_batch(self, patients, model=None):
+        """Un POST /predict-batch; cada resultado lleva el modelo que lo puntuó"""
+        headers = {"X-Model": model} if model else None
+        body, _ = self.request("POST", "/predict-batch", {"patients": patients}, headers)
+        results = body["results"]
+        for result in results:
+            result.pop("patient_id", None)
+            if "error" not in result:
+                result["model"] = body.get("model")
+        return results
+
+    def close(self):
+        self.session.close()
+
+
+def _check(result):
+    if "error" in result:
+        raise InvalidPatient(result["error"], status=400, payload=result)
+    return result
+
+
+class HeartDiseaseClient:
+    """
+    Cliente de la API de predicción para servicios de integración
+
+    - predict(paciente): las llamadas concurrentes (desde varios hilos o con
+      submit()) se agrupan en peticiones /predict-batch de hasta batch_size
+      pacientes; un lote sale al llenarse o tras linger_ms desde su primer paciente.
+    - predict_many(pacientes): divide la lista en lotes y los envía en paralelo.
+    - Como mucho max_in_flight peticiones en vuelo, sobre un pool de conexiones
+      keep-alive; submit() bloquea si hay max_pending pacientes esperando lote.
+    - Reintentos con espera exponencial ante 503 y errores de conexión.
+
+    Se usa como context manager (o close()) para vaciar los lotes pendientes.
+    """
+
+    def __init__(self, base_url="http://localhost:5000", timeout=10.0, batch_size=DEFAULT_BATCH_SIZE,
+                 linger_ms=2.0, max_in_flight=4, max_pending=50000, max_retries=3,
+                 backoff=0.05, max_backoff=2.0):
+        self.batch_size = batch_size
+        self.linger = linger_ms / 1000
+        self.max_in_flight = max_in_flight
+        self.transport = _Transport(base_url, timeout, max_retries, backoff, max_backoff, max_in_flight)
+        self._executor = ThreadPoolExecutor(max_in_flight, thread_name_prefix="heart-client")
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+        self._pending = queue.Queue(maxsize=max_pending)
+        self._batcher = None
+        self._batcher_lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def base_url(self):
+        return self.transport.base_url
+
+    def health(self):
+        return self.transport.request("GET", "/health")[0]
+
+    def model_info(self):
+        return self.transport.request("GET", "/model-info")[0]
+
+    def predict_one(self, patient, model=None):
+        """Una petición /predict sin agrupar (latencia mínima para un único paciente)"""
+        headers = {"X-Model": model} if model else None
+        return self.transport.request("POST", "/predict", patient, headers)[0]
+
+    def submit(self, patient, model=None):
+        """Encola un paciente para el próximo lote; devuelve un Future con su resultado"""
+        if self._closed:
+            raise RuntimeError("Cliente cerrado")
+        self._ensure_batcher()
+        future = Future()
+        self._pending.put((model, patient, future))
+        return future
+
+    def predict(self, patient, model=None):
+        """Predicción de un paciente, agrupada con las demás llamadas concurrentes"""
+        return _check(self.submit(patient, model).result())
+
+    def predict_many(self, patients, model=None):
+        """
+        Puntúa una lista de pacientes en lotes paralelos y devuelve los resultados en orden
+
+        Como /predict-batch, un paciente inválido no falla el resto: su resultado
+        trae "error". patient_id es la posición en la lista (desde 1).
+        """
+        chunks = [patients[i:i + self.batch_size] for i in range(0, len(patients), self.batch_size)]
+        results = []
+        # El pool de max_in_flight hilos limita las peticiones en vuelo
+        for chunk_results in self._executor.map(lambda chunk: self.transport.predict_batch(chunk, model), chunks):
+            results.extend(chunk_results)
+        for i, result in enumerate(results):
+            result["patient_id"] = i + 1
+        return results
+
+    def _ensure_batcher(self):
+        with self._batcher_lock:
+            if self._batcher is None:
+                self._batcher = threading.Thread(target=self._run_batcher, name="heart-client-batcher",
+                                                 daemon=True)
+                self._batcher.start()
+
+    def _run_batcher(self):
+        while True:
+            item = self._pending.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.linger
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._pending.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            # Un lote por modelo pedido: /predict-batch usa un solo modelo por petición
+            by_model = {}
+            for model, patient, future in batch:
+                by_model.setdefault(model, []).append((patient, future))
+            for model, items in by_model.items():
+                # Se espera un hueco antes de despachar: así la cola de pendientes hace de contrapresión
+                self._in_flight.acquire()
+                self._executor.submit(self._dispatch, model, items)
+            if stop:
+                return
+
+    def _dispatch(self, model, items):
+        try:
+            results = self.transport.predict_batch([patient for patient, _ in items], model)
+        except Exception as e:
+            for _, future in items:
+                future.set_exception(e)
+        else:
+            for (_, future), result in zip(items, results):
+                future.set_result(result)
+        finally:
+            self._in_flight.release()
+
+    def stats(self):
+        return {"requests": self.transport.requests_sent, "retries": self.transport.retries,
+                "pending": self._pending.qsize()}
+
+    def close(self):
+        """Envía los lotes pendientes, espera las respuestas y cierra las conexiones"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._batcher is not None:
+            self._pending.put(None)
+            self._batcher.join()
+        self._executor.shutdown(wait=True)
+        self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncHeartDiseaseClient:
+    """
+    Interfaz asyncio del cliente, con el mismo agrupamiento y los mismos límites
+
+    `await client.predict(paciente)` desde muchas corrutinas se agrupa en lotes
+    igual que en HeartDiseaseClient. Las peticiones HTTP van por la misma sesión
+    keep-alive en un pool de max_in_flight hilos, así el bucle de eventos nunca
+    se bloquea y el número de peticiones en vuelo queda acotado.
+    """
+
+    def __init__(self, base_url="http://localhost:5000", timeout=10.0, batch_size=DEFAULT_BATCH_SIZE,
+                 linger_ms=2.0, max_in_flight=4, max_retries=3, backoff=0.05, max_backoff=2.0):
+        self.batch_size = batch_size
+        self.linger = linger_ms / 1000
+        self.transport = _Transport(base_url, timeout, max_retries, backoff, max_backoff, max_in_flight)
+        self._executor = ThreadPoolExecutor(max_in_flight, thread_name_prefix="heart-async-client")
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._pending = {}
+        self._timers = {}
+        self._tasks = set()
+
+    async def _call(self, function, *args):
+        loop = asyncio.get_running_loop()
+        async with self._in_flight:
+            return await loop.run_in_executor(self._executor, function, *args)
+
+    async def health(self):
+        return (await self._call(self.transport.request, "GET", "/health"))[0]
+
+    async def model_info(self):
+        return (await self._call(self.transport.request, "GET", "/model-info"))[0]
+
+    async def predict(self, patient, model=None):
+        """Predicción de un paciente, agrupada con las demás corrutinas que piden a la vez"""
+        future = asyncio.get_running_loop().create_future()
+        items = self._pending.setdefault(model, [])
+        items.append((patient, future))
+        if len(items) >= self.batch_size:
+            self._flush(model)
+        elif model not in self._timers:
+            self._timers[model] = asyncio.get_running_loop().call_later(self.linger, self._flush, model)
+        return _check(await future)
+
+    async def predict_many(self, patients, model=None):
+        """Como HeartDiseaseClient.predict_many: lotes en paralelo, resultados en orden"""
+        chunks = [patients[i:i + self.batch_size] for i in range(0, len(patients), self.batch_size)]
+        chunk_results = await asyncio.gather(
+            *(self._call(self.transport.predict_batch, chunk, model) for chunk in chunks)
+        )
+        results = [result for chunk in chunk_results for result in chunk]
+        for i, result in enumerate(results):
+            result["patient_id"] = i + 1
+        return results
+
+    def _flush(self, model):
+        timer = self._timers.pop(model, None)
+        if timer is not None:
+            timer.cancel()
+        items = self._pending.pop(model, [])
+        if items:
+            task = asyncio.ensure_future(self._dispatch(model, items))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, model, items):
+        try:
+            results = await self._call(self.transport.predict_batch, [patient for patient, _ in items], model)
+        except Exception as e:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (_, future), result in zip(items, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def stats(self):
+        return {"requests": self.transport.requests_sent, "retries": self.transport.retries,
+                "pending": sum(len(items) for items in self._pending.values())}
+
+    async def aclose(self):
+        """Envía los lotes pendientes, espera las respuestas y cierra las conexiones"""
+        for model in list(self._pending):
+            self._flush(model)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._executor.shutdown(wait=True)
+        self.transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
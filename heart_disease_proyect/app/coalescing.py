@@ -0,0 +1,75 @@
+# app/coalescing.py
+import threading
+
+
+class _Call:
+    """Cómputo en curso compartido por todas las peticiones con la misma clave"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Agrupa peticiones concurrentes idénticas en un solo cómputo (single-flight)
+
+    La primera petición con una clave ejecuta la función; las que llegan
+    mientras sigue en curso esperan y reciben el mismo resultado.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._stats = {"executed": 0, "coalesced": 0}
+
+    def do(self, key, fn, record=True):
+        """Ejecuta fn() una sola vez por clave en curso. Devuelve (resultado, compartido)
+
+        Con record=False la llamada no cuenta en las métricas.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+            if record:
+                self._stats["executed" if leader else "coalesced"] += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            # También KeyboardInterrupt/SystemExit: los seguidores no deben recibir un None como resultado
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+        return call.result, False
+
+    def stats(self):
+        """Métricas de agrupación de peticiones"""
+        with self._lock:
+            executed = self._stats["executed"]
+            coalesced = self._stats["coalesced"]
+            in_flight = len(self._calls)
+
+        total = executed + coalesced
+        return {
+            "executed": executed,
+            "coalesced": coalesced,
+            "in_flight": in_flight,
+            "coalesced_ratio": round(coalesced / total, 4) if total else 0.0
+        }
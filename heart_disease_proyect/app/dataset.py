@@ -0,0 +1,197 @@
+# app/dataset.py
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+FORMAT_VERSION = 1
+CACHE_DIR_NAME = ".dataset_cache"
+POSSIBLE_TARGETS = ['HeartDisease', 'target', 'disease', 'class', 'output']
+
+
+def detect_target_column(df):
+    for col in POSSIBLE_TARGETS:
+        if col in df.columns:
+            return col
+    return df.columns[-1]
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """Hash del contenido del CSV: identifica el artefacto, no la fecha del archivo"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _compact(values):
+    """Menor dtype que representa exactamente los valores (int8/16/32 o float32), si no float64"""
+    values = np.asarray(values)
+    if values.dtype == bool:
+        return values.astype(np.uint8)
+    if np.issubdtype(values.dtype, np.integer):
+        for dtype in (np.int8, np.int16, np.int32):
+            info = np.iinfo(dtype)
+            if values.size == 0 or (values.min() >= info.min and values.max() <= info.max):
+                return values.astype(dtype)
+        return values.astype(np.int64)
+    as32 = values.astype(np.float32)
+    if np.array_equal(as32.astype(values.dtype), values, equal_nan=True):
+        return as32
+    return values.astype(np.float64)
+
+
+def _default_cache_dir(csv_path):
+    return os.path.join(os.path.dirname(os.path.abspath(csv_path)), CACHE_DIR_NAME)
+
+
+def _artifact_dir(csv_path, source_hash, cache_dir):
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(cache_dir, f"{stem}-{source_hash[:16]}")
+
+
+def build_dataset(csv_path="heart.csv", cache_dir=None, force=False):
+    """
+    Parsea y codifica el CSV una sola vez en un artefacto binario
+
+    El directorio del artefacto lleva el hash del contenido del CSV, así un CSV
+    modificado produce otro artefacto y uno sin cambios se reutiliza. Contiene:
+    - X.npy: matriz codificada (igual que pd.get_dummies(..., drop_first=True)).
+    - y.npy: target.
+    - raw/<columna>.npy: columnas originales (numéricas compactas, categóricas como códigos).
+    - meta.json: columnas, dtypes originales, categorías y estadísticas del dataset.
+    Devuelve la ruta del artefacto.
+    """
+    cache_dir = cache_dir or _default_cache_dir(csv_path)
+    source_hash = file_sha256(csv_path)
+    artifact_dir = _artifact_dir(csv_path, source_hash, cache_dir)
+    if not force and os.path.exists(os.path.join(artifact_dir, "meta.json")):
+        return artifact_dir
+
+    import pandas as pd
+    start = time.perf_counter()
+    df = pd.read_csv(csv_path)
+    target_column = detect_target_column(df)
+    X = df.drop(target_column, axis=1)
+    categorical_cols = X.select_dtypes(include=['object']).columns.tolist()
+    X_encoded = pd.get_dummies(X, columns=categorical_cols, drop_first=True)
+
+    # Se construye en un directorio temporal y se publica con un rename atómico
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_dir = f"{artifact_dir}.tmp{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(os.path.join(tmp_dir, "raw"))
+
+    matrix = _compact(X_encoded.to_numpy(dtype=np.float64))
+    np.save(os.path.join(tmp_dir, "X.npy"), matrix)
+    np.save(os.path.join(tmp_dir, "y.npy"), _compact(df[target_column].to_numpy()))
+
+    raw_columns = []
+    for col in df.columns:
+        series = df[col]
+        if col in categorical_cols:
+            levels = sorted(series.dropna().unique().tolist())
+            codes = pd.Categorical(series, categories=levels).codes
+            np.save(os.path.join(tmp_dir, "raw", f"{col}.npy"), codes.astype(np.int8 if len(levels) < 128 else np.int32))
+            raw_columns.append({"name": col, "kind": "categorical", "levels": levels})
+        else:
+            np.save(os.path.join(tmp_dir, "raw", f"{col}.npy"), _compact(series.to_numpy()))
+            raw_columns.append({"name": col, "kind": "numeric", "dtype": str(series.dtype)})
+
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "source": os.path.basename(csv_path),
+        "source_sha256": source_hash,
+        "rows": len(df),
+        "target_column": target_column,
+        "feature_columns": X_encoded.columns.tolist(),
+        "feature_dtypes": {col: str(dtype) for col, dtype in X_encoded.dtypes.items()},
+        "matrix_dtype": str(matrix.dtype),
+        "categorical_columns": categorical_cols,
+        "raw_columns": raw_columns,
+        "raw_memory_bytes": int(df.memory_usage(deep=True).sum()),
+        "build_seconds": round(time.perf_counter() - start, 4)
+    }
+    with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2, ensure_ascii=False)
+
+    if force:
+        shutil.rmtree(artifact_dir, ignore_errors=True)
+    try:
+        os.replace(tmp_dir, artifact_dir)
+    except OSError:
+        # Otro proceso publicó el mismo artefacto mientras se construía
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    # Los artefactos de versiones anteriores del mismo CSV ya no se usan
+    stem = os.path.basename(artifact_dir).rsplit("-", 1)[0]
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if path != artifact_dir and name.rsplit("-", 1)[0] == stem and ".tmp" not in name:
+            shutil.rmtree(path, ignore_errors=True)
+    return artifact_dir
+
+
+class Dataset:
+    """
+    Artefacto de dataset cargado con memory-mapping
+
+    X e y son matrices NumPy (de solo lectura si se usa mmap). frame(), target()
+    y raw_frame() reconstruyen los objetos de pandas que usaban los notebooks
+    sin volver a parsear el CSV.
+    """
+
+    def __init__(self, artifact_dir, mmap=True):
+        self.path = artifact_dir
+        with open(os.path.join(artifact_dir, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        mmap_mode = "r" if mmap else None
+        self.X = np.load(os.path.join(artifact_dir, "X.npy"), mmap_mode=mmap_mode)
+        self.y = np.load(os.path.join(artifact_dir, "y.npy"), mmap_mode=mmap_mode)
+        self._mmap_mode = mmap_mode
+
+    @property
+    def feature_columns(self):
+        return self.meta["feature_columns"]
+
+    @property
+    def target_column(self):
+        return self.meta["target_column"]
+
+    @property
+    def target_distribution(self):
+        values, counts = np.unique(self.y, return_counts=True)
+        return {int(v): int(c) for v, c in zip(values, counts)}
+
+    def frame(self):
+        """X como DataFrame, con las columnas y dtypes de pd.get_dummies"""
+        import pandas as pd
+        X = pd.DataFrame(np.asarray(self.X), columns=self.feature_columns)
+        return X.astype(self.meta["feature_dtypes"])
+
+    def target(self):
+        import pandas as pd
+        dtype = next(c["dtype"] for c in self.meta["raw_columns"] if c["name"] == self.target_column)
+        return pd.Series(np.asarray(self.y), name=self.target_column).astype(dtype)
+
+    def raw_frame(self):
+        """DataFrame original (como pd.read_csv) reconstruido desde las columnas compactas"""
+        import pandas as pd
+        data = {}
+        for column in self.meta["raw_columns"]:
+            values = np.load(os.path.join(self.path, "raw", f"{column['name']}.npy"), mmap_mode=self._mmap_mode)
+            if column["kind"] == "categorical":
+                levels = np.array(column["levels"] + [None], dtype=object)
+                data[column["name"]] = levels[np.asarray(values)]
+            else:
+                data[column["name"]] = np.asarray(values).astype(column["dtype"])
+        return pd.DataFrame(data)
+
+
+def load_dataset(csv_path="heart.csv", cache_dir=None, mmap=True):
+    """Devuelve el Dataset del CSV, construyendo el artefacto solo si cambió el contenido"""
+    return Dataset(build_dataset(csv_path, cache_dir), mmap=mmap)
@@ -0,0 +1,48 @@
+# app/features.py
+import numpy as np
+
+# Columnas numéricas en el orden del entrenamiento
+NUMERIC_COLUMNS = ['Age', 'RestingBP', 'Cholesterol', 'FastingBS', 'MaxHR', 'Oldpeak']
+
+# Categorías de cada variable categórica; la primera es la que elimina drop_first=True
+CATEGORICAL_LEVELS = {
+    'Sex': ['F', 'M'],
+    'ChestPainType': ['ASY', 'ATA', 'NAP', 'TA'],
+    'RestingECG': ['LVH', 'Normal', 'ST'],
+    'ExerciseAngina': ['N', 'Y'],
+    'ST_Slope': ['Down', 'Flat', 'Up']
+}
+
+# Columnas esperadas por el modelo (igual que pd.get_dummies(..., drop_first=True) sobre heart.csv)
+FEATURE_COLUMNS = NUMERIC_COLUMNS + [
+    f"{col}_{level}"
+    for col, levels in CATEGORICAL_LEVELS.items()
+    for level in levels[1:]
+]
+
+# Posición de cada columna dummy: (variable, categoría) -> índice
+_DUMMY_INDEX = {
+    (col, level): FEATURE_COLUMNS.index(f"{col}_{level}")
+    for col, levels in CATEGORICAL_LEVELS.items()
+    for level in levels[1:]
+}
+
+
+def encode_patients(patients, dtype=np.float64):
+    """
+    Codifica una lista de pacientes (dicts) en la matriz de features del modelo
+
+    Solo usa NumPy: no necesita pandas en el camino de inferencia. Las categorías
+    desconocidas o la categoría de referencia dejan todas sus dummies en 0.
+    """
+    X = np.zeros((len(patients), len(FEATURE_COLUMNS)), dtype=dtype)
+
+    for i, patient in enumerate(patients):
+        for j, col in enumerate(NUMERIC_COLUMNS):
+            X[i, j] = float(patient[col])
+        for col in CATEGORICAL_LEVELS:
+            j = _DUMMY_INDEX.get((col, patient[col]))
+            if j is not None:
+                X[i, j] = 1.0
+
+    return X
@@ -0,0 +1,83 @@
+# app/lifecycle.py
+import threading
+import time
+
+
+class ServingLifecycle:
+    """
+    Ciclo de vida del servidor: starting -> warming_up -> ready (o failed)
+
+    La vida del proceso (liveness) y la disponibilidad para recibir tráfico
+    (readiness) se reportan por separado: el pod solo recibe tráfico cuando
+    el calentamiento terminó, y un calentamiento fallido solo afecta a la
+    readiness (el error queda en status()).
+    """
+
+    def __init__(self):
+        self.state = "starting"
+        self.started_at = time.time()
+        self.timings = {}
+        self.warmup = {}
+        self.error = None
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds):
+        """Registra la duración de una etapa de arranque"""
+        with self._lock:
+            self.timings[name] = round(seconds * 1000, 2)
+
+    def run_warmup(self, request_fn, iterations):
+        """Ejecuta request_fn(i) `iterations` veces y marca el servidor como listo"""
+        with self._lock:
+            self.state = "warming_up"
+
+        latencies = []
+        try:
+            start = time.perf_counter()
+            for i in range(iterations):
+                t0 = time.perf_counter()
+                request_fn(i)
+                latencies.append((time.perf_counter() - t0) * 1000)
+            self.record("warmup", time.perf_counter() - start)
+        except Exception as e:
+            with self._lock:
+                self.state = "failed"
+                self.error = str(e)
+            print(f"Error en el calentamiento: {e}")
+            return False
+
+        ordered = sorted(latencies)
+        with self._lock:
+            self.warmup = {
+                "requests": len(latencies),
+                "first_ms": round(latencies[0], 2) if latencies else None,
+                "p50_ms": round(ordered[len(ordered) // 2], 2) if ordered else None,
+                "max_ms": round(ordered[-1], 2) if ordered else None,
+                "last_ms": round(latencies[-1], 2) if latencies else None
+            }
+            self.state = "ready"
+        print(f"Calentamiento completado: {self.warmup}")
+        return True
+
+    def start_warmup(self, request_fn, iterations):
+        """Lanza el calentamiento en segundo plano para no bloquear la liveness"""
+        thread = threading.Thread(
+            target=self.run_warmup, args=(request_fn, iterations), daemon=True, name="warmup"
+        )
+        thread.start()
+        return thread
+
+    @property
+    def ready(self):
+        return self.state == "ready"
+
+    def status(self):
+        """Estado del ciclo de vida para los endpoints de salud"""
+        with self._lock:
+            return {
+                "state": self.state,
+                "uptime_s": round(time.time() - self.started_at, 1),
+                "timings_ms": dict(self.timings),
+                "warmup": dict(self.warmup),
+                "error": self.error
+            }
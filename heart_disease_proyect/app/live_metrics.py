@@ -0,0 +1,249 @@
+# app/live_metrics.py
+import json
+import queue
+import threading
+import time
+import urllib.request
+from collections import deque
+
+
+def histogram_percentile(bounds, counts, q):
+    """
+    Percentil q (0-1) de un histograma por buckets, interpolando dentro del bucket
+
+    bounds son los límites superiores; el último bucket (sin límite) se
+    reporta con el último límite conocido.
+    """
+    total = sum(counts)
+    if total <= 0:
+        return None
+    target = q * total
+    seen = 0
+    for i, count in enumerate(counts):
+        if count and seen + count >= target:
+            if i >= len(bounds):
+                return float(bounds[-1])
+            lower = bounds[i - 1] if i > 0 else 0.0
+            return lower + (bounds[i] - lower) * (target - seen) / count
+        seen += count
+    return float(bounds[-1])
+
+
+def metrics_point(previous, current, elapsed, ts):
+    """
+    Punto de la serie temporal a partir de dos lecturas de /metrics["serving"]
+
+    Los contadores son acumulados: las tasas y percentiles salen de la
+    diferencia. Si el contador bajó (la API se reinició) se toma la lectura
+    actual completa como diferencia.
+    """
+    def delta(key):
+        value = current[key] - previous[key]
+        return value if value >= 0 else current[key]
+
+    latency = [c - p for c, p in zip(current["latency_counts"], previous["latency_counts"])]
+    if any(value < 0 for value in latency):
+        latency = list(current["latency_counts"])
+    risk = {level: current["risk_levels"][level] - previous["risk_levels"].get(level, 0)
+            for level in current["risk_levels"]}
+    if any(value < 0 for value in risk.values()):
+        risk = dict(current["risk_levels"])
+
+    requests = delta("requests")
+    predictions = sum(risk.values())
+    bounds = current["latency_buckets_ms"]
+    point = {
+        "ts": ts,
+        "api_up": 1,
+        "throughput_rps": requests / elapsed,
+        "predictions_per_s": predictions / elapsed,
+        "error_rate": delta("errors") / requests if requests else 0.0,
+        "p50_ms": histogram_percentile(bounds, latency, 0.50),
+        "p95_ms": histogram_percentile(bounds, latency, 0.95),
+        "p99_ms": histogram_percentile(bounds, latency, 0.99),
+        "drift_max": max(current["drift"].values(), default=0.0)
+    }
+    for level, count in risk.items():
+        point[f"risk_{level}"] = count / predictions if predictions else 0.0
+    for feature, score in current["drift"].items():
+        point[f"drift_{feature}"] = score
+    return point
+
+
+class DownsampledSeries:
+    """
+    Serie temporal guardada en varias resoluciones de tamaño fijo
+
+    La primera resolución guarda cada punto tal cual; las siguientes promedian
+    los puntos de cada intervalo de `step` segundos. Cada resolución es un ring
+    buffer (deque con maxlen), así la memoria no crece con el tiempo.
+    """
+
+    def __init__(self, tiers=((0, 300), (10, 360), (60, 1440))):
+        self._lock = threading.Lock()
+        self.tiers = [
+            {"step": step, "points": deque(maxlen=capacity), "bucket": None, "sums": {}}
+            for step, capacity in tiers
+        ]
+
+    def add(self, point):
+        with self._lock:
+            for tier in self.tiers:
+                if not tier["step"]:
+                    tier["points"].append(point)
+                    continue
+                bucket = point["ts"] // tier["step"] * tier["step"]
+                if tier["bucket"] is not None and bucket != tier["bucket"]:
+                    self._flush(tier)
+                tier["bucket"] = bucket
+                for key, value in point.items():
+                    if key != "ts" and value is not None:
+                        total, count = tier["sums"].get(key, (0.0, 0))
+                        tier["sums"][key] = (total + value, count + 1)
+
+    def _flush(self, tier):
+        # Cada valor se promedia sobre los puntos que lo traían (p. ej. sin latencia si la API no respondió)
+        if tier["sums"]:
+            averaged = {key: total / count for key, (total, count) in tier["sums"].items()}
+            tier["points"].append({"ts": tier["bucket"], **averaged})
+        tier["sums"] = {}
+
+    def points(self, step=0):
+        with self._lock:
+            for tier in self.tiers:
+                if tier["step"] == step:
+                    return list(tier["points"])
+        raise ValueError(f"Resolución no disponible: {step}")
+
+    @property
+    def steps(self):
+        return [tier["step"] for tier in self.tiers]
+
+
+class Broadcaster:
+    """
+    Reparte cada mensaje a todos los suscriptores sin bloquear al productor
+
+    Cada suscriptor tiene una cola acotada; si no la consume a tiempo se
+    descarta su mensaje más antiguo. El mensaje se serializa una sola vez.
+    """
+
+    def __init__(self, max_queue=100):
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self.dropped = 0
+
+    def subscribe(self):
+        subscriber = queue.Queue(maxsize=self.max_queue)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    @property
+    def count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, message):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            while True:
+                try:
+                    subscriber.put_nowait(message)
+                    break
+                except queue.Full:
+                    try:
+                        subscriber.get_nowait()
+                        self.dropped += 1
+                    except queue.Empty:
+                        pass
+
+
+def sse_message(event, data):
+    """Mensaje en formato server-sent events"""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+class LiveMetrics:
+    """
+    Un único sondeo de /metrics de la API, compartido por todos los dashboards abiertos
+
+    Un hilo lee la API cada `interval` segundos, guarda el punto en la serie
+    submuestreada y lo publica a los suscriptores SSE. Abrir más dashboards no
+    añade consultas a la API.
+    """
+
+    def __init__(self, api_url, interval=2.0, timeout=2.0, series=None, broadcaster=None):
+        self.api_url = api_url.rstrip("/")
+        self.interval = interval
+        self.timeout = timeout
+        self.series = series or DownsampledSeries()
+        self.broadcaster = broadcaster or Broadcaster()
+        self.last_error = None
+        self._previous = None
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def start(self):
+        """Arranca el hilo de sondeo (idempotente)"""
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="live-metrics", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def fetch(self):
+        with urllib.request.urlopen(f"{self.api_url}/metrics", timeout=self.timeout) as response:
+            return json.loads(response.read())["serving"]
+
+    def poll_once(self):
+        """Lee la API, añade el punto a la serie y lo publica. Devuelve el punto"""
+        now = time.time()
+        try:
+            current = self.fetch()
+            self.last_error = None
+        except Exception as e:
+            self.last_error = str(e)
+            self._previous = None
+            point = {"ts": now, "api_up": 0}
+        else:
+            if self._previous is None:
+                # Primera lectura: aún no hay diferencia con la que calcular tasas
+                self._previous = (now, current)
+                return None
+            previous_ts, previous = self._previous
+            point = metrics_point(previous, current, max(now - previous_ts, 1e-6), now)
+            self._previous = (now, current)
+
+        self.series.add(point)
+        self.broadcaster.publish(sse_message("point", point))
+        return point
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            self.poll_once()
+            self._stop.wait(max(self.interval - (time.monotonic() - started), 0.05))
+
+    def history(self, step=0):
+        return {"step": step, "interval": self.interval, "points": self.series.points(step)}
+
+    def status(self):
+        return {
+            "api_url": self.api_url,
+            "interval": self.interval,
+            "running": self._thread is not None and self._thread.is_alive(),
+            "subscribers": self.broadcaster.count,
+            "dropped_messages": self.broadcaster.dropped,
+            "last_error": self.last_error,
+            "steps": self.series.steps
+        }
@@ -0,0 +1,299 @@
+# app/numpy_model.py
+import hashlib
+import os
+import warnings
+
+import numpy as np
+
+
+class NumpyPipeline:
+    """
+    Pipeline (scaler + clasificador) evaluado solo con NumPy
+
+    Se compila a partir del Pipeline de scikit-learn y se guarda en un .npz,
+    así el proceso de scoring arranca sin importar sklearn, scipy ni pandas.
+    Soporta GradientBoosting, RandomForest y LogisticRegression binarios.
+    """
+
+    def __init__(self, arrays):
+        self.arrays = arrays
+        self.kind = str(arrays["kind"])
+        self.model_type = str(arrays["model_type"])
+        self.mean = arrays["mean"]
+        self.scale = arrays["scale"]
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls({key: data[key] for key in data.files})
+
+    def save(self, path):
+        np.savez(path, **self.arrays)
+
+    def _trees_output(self, X):
+        """Valor de la hoja alcanzada en cada árbol: matriz (n_muestras, n_árboles)"""
+        a = self.arrays
+        feature, threshold = a["feature"], a["threshold"]
+        left, right, value = a["left"], a["right"], a["value"]
+
+        # Los árboles de sklearn comparan las features en float32
+        X32 = X.astype(np.float32)
+        n_samples, n_trees = X.shape[0], feature.shape[0]
+        trees = np.arange(n_trees)
+        rows = np.arange(n_samples)[:, None]
+        nodes = np.zeros((n_samples, n_trees), dtype=np.intp)
+
+        # Todos los árboles avanzan un nivel por iteración; las hojas apuntan a sí mismas
+        for _ in range(int(a["max_depth"])):
+            go_left = X32[rows, feature[trees, nodes]] <= threshold[trees, nodes]
+            nodes = np.where(go_left, left[trees, nodes], right[trees, nodes])
+
+        leaves = value[trees, nodes]
+        # Artefactos compactos: hojas cuantizadas a enteros con una escala común
+        if "value_scale" in a:
+            leaves = leaves * a["value_scale"]
+        return leaves
+
+    def decision_function(self, X):
+        Xs = (np.asarray(X, dtype=np.float64) - self.mean) / self.scale
+
+        if self.kind == "linear":
+            return Xs @ self.arrays["coef"].astype(np.float64) + self.arrays["intercept"]
+        if self.kind == "boosting":
+            leaves = self._trees_output(Xs)
+            return self.arrays["init_raw"] + self.arrays["learning_rate"] * leaves.sum(axis=1, dtype=np.float64)
+        raise ValueError(f"decision_function no disponible para '{self.kind}'")
+
+    def predict_proba(self, X):
+        if self.kind == "forest":
+            Xs = (np.asarray(X, dtype=np.float64) - self.mean) / self.scale
+            positive = self._trees_output(Xs).mean(axis=1)
+        else:
+            positive = 1.0 / (1.0 + np.exp(-self.decision_function(X)))
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X):
+        return (self.predict_proba(X)[:, 1] > 0.5).astype(int)
+
+    def feature_bins(self, j, values):
+        """
+        Intervalo entre los umbrales de la feature j en el que cae cada valor, o None
+
+        Dos valores en el mismo intervalo toman la misma rama en todos los nodos
+        que miran la feature j: con el resto de features fijas dan exactamente
+        la misma predicción. Los modelos lineales no tienen umbrales (None).
+        """
+        if self.kind == "linear":
+            return None
+        a = self.arrays
+        # Nodos internos (las hojas y el relleno apuntan a sí mismos) que dividen por j
+        internal = a["left"] != np.arange(a["left"].shape[1])
+        thresholds = np.unique(a["threshold"][internal & (a["feature"] == j)])
+        # Misma escala y misma comparación en float32 que _trees_output
+        scaled = ((np.asarray(values, dtype=np.float64) - self.mean[j]) / self.scale[j]).astype(np.float32)
+        return np.searchsorted(thresholds, scaled, side="left")
+
+    @property
+    def nbytes(self):
+        """Memoria ocupada por las matrices del modelo"""
+        return sum(array.nbytes for array in self.arrays.values())
+
+
+def _pack_trees(trees, leaf_value):
+    """Empaqueta árboles de sklearn en matrices (n_árboles, max_nodos) rellenadas"""
+    max_nodes = max(tree.node_count for tree in trees)
+    n_trees = len(trees)
+
+    feature = np.zeros((n_trees, max_nodes), dtype=np.intp)
+    threshold = np.zeros((n_trees, max_nodes), dtype=np.float64)
+    left = np.tile(np.arange(max_nodes, dtype=np.intp), (n_trees, 1))
+    right = left.copy()
+    value = np.zeros((n_trees, max_nodes), dtype=np.float64)
+
+    for t, tree in enumerate(trees):
+        n = tree.node_count
+        internal = tree.children_left[:n] != -1
+        idx = np.arange(n)
+        feature[t, :n] = np.where(internal, tree.feature[:n], 0)
+        threshold[t, :n] = tree.threshold[:n]
+        left[t, :n] = np.where(internal, tree.children_left[:n], idx)
+        right[t, :n] = np.where(internal, tree.children_right[:n], idx)
+        value[t, :n] = leaf_value(tree)
+
+    max_depth = max(tree.max_depth for tree in trees)
+    return {
+        "feature": feature, "threshold": threshold, "left": left, "right": right,
+        "value": value, "max_depth": np.array(max_depth)
+    }
+
+
+def compile_pipeline(pipeline):
+    """Convierte un Pipeline(scaler, clf) entrenado de sklearn en un NumpyPipeline"""
+    scaler = pipeline.named_steps["scaler"]
+    clf = pipeline.named_steps["clf"]
+    model_type = type(clf).__name__
+
+    if not hasattr(scaler, "mean_"):
+        raise ValueError("Solo se soporta StandardScaler como escalador")
+    if len(getattr(clf, "classes_", [])) != 2:
+        raise ValueError("Solo se soportan clasificadores binarios")
+
+    arrays = {
+        "model_type": np.array(model_type),
+        "mean": np.asarray(scaler.mean_, dtype=np.float64),
+        "scale": np.asarray(scaler.scale_, dtype=np.float64)
+    }
+
+    if model_type == "GradientBoostingClassifier":
+        if clf.init_ == "zero":
+            init_raw = 0.0
+        else:
+            prior = clf.init_.class_prior_[1]
+            init_raw = np.log(prior / (1 - prior))
+        trees = [est.tree_ for est in clf.estimators_[:, 0]]
+        arrays.update(_pack_trees(trees, lambda tree: tree.value[:, 0, 0]))
+        arrays.update(kind=np.array("boosting"), init_raw=np.array(init_raw),
+                      learning_rate=np.array(clf.learning_rate))
+    elif model_type == "RandomForestClassifier":
+        trees = [est.tree_ for est in clf.estimators_]
+
+        def positive_fraction(tree):
+            counts = tree.value[:, 0, :]
+            return counts[:, 1] / counts.sum(axis=1)
+
+        arrays.update(_pack_trees(trees, positive_fraction))
+        arrays.update(kind=np.array("forest"))
+    elif model_type == "LogisticRegression":
+        arrays.update(kind=np.array("linear"), coef=np.asarray(clf.coef_[0], dtype=np.float64),
+                      intercept=np.array(clf.intercept_[0], dtype=np.float64))
+    else:
+        raise ValueError(f"Modelo no soportado para inferencia NumPy: {model_type}")
+
+    return NumpyPipeline(arrays)
+
+
+def compact_pipeline(pipeline, leaf_bits=None):
+    """
+    Versión compacta de un NumpyPipeline: float32 y enteros pequeños
+
+    - Umbrales en float32 redondeados hacia abajo: como los árboles comparan
+      features float32, x <= umbral32 equivale exactamente a x <= umbral64.
+    - Índices de nodos/features en los enteros más pequeños que alcanzan.
+    - Hojas y coeficientes en float32, o hojas cuantizadas a int8/int16
+      (leaf_bits) con una escala común.
+    El escalado (media/desviación, 15 valores) se mantiene en float64.
+    """
+    arrays = dict(pipeline.arrays)
+
+    if "threshold" in arrays:
+        threshold = arrays["threshold"]
+        threshold32 = threshold.astype(np.float32)
+        rounded_up = threshold32.astype(np.float64) > threshold
+        threshold32[rounded_up] = np.nextafter(threshold32[rounded_up], np.float32(-np.inf))
+        arrays["threshold"] = threshold32
+
+        node_dtype = np.int16 if arrays["left"].shape[1] <= np.iinfo(np.int16).max else np.int32
+        for key in ("left", "right"):
+            arrays[key] = arrays[key].astype(node_dtype)
+        arrays["feature"] = arrays["feature"].astype(np.uint8 if pipeline.mean.size <= 255 else np.int16)
+
+        value = arrays["value"]
+        if leaf_bits:
+            int_dtype = {8: np.int8, 16: np.int16}[leaf_bits]
+            max_abs = float(np.abs(value).max()) or 1.0
+            scale = max_abs / np.iinfo(int_dtype).max
+            arrays["value"] = np.round(value / scale).astype(int_dtype)
+            arrays["value_scale"] = np.array(scale)
+        else:
+            arrays["value"] = value.astype(np.float32)
+
+    if "coef" in arrays:
+        arrays["coef"] = arrays["coef"].astype(np.float32)
+
+    return NumpyPipeline(arrays)
+
+
+def compact_error_bound(pipeline, leaf_bits=None):
+    """
+    Desviación máxima de probabilidad de compact_pipeline(pipeline, leaf_bits), o None
+
+    Solo cambian las hojas (los umbrales conservan todas las decisiones). Cada
+    hoja se desvía como mucho media unidad de cuantización, max|hoja| / (2 (2^(bits-1) - 1)),
+    o su error de redondeo a float32 sin leaf_bits. En un bosque la
+    probabilidad es la media de las hojas y se desvía lo mismo; en boosting
+    la suma de árboles por learning_rate se desvía n_árboles veces más y la
+    sigmoide lo reduce a la cuarta parte. Los modelos lineales no tienen cota (None).
+    """
+    if "value" not in pipeline.arrays:
+        return None
+    value = pipeline.arrays["value"].astype(np.float64)
+    max_abs = float(np.abs(value).max())
+    if leaf_bits:
+        leaf_error = max_abs / (2 * (2 ** (leaf_bits - 1) - 1))
+    else:
+        leaf_error = max_abs * 2.0 ** -24
+    if pipeline.kind == "boosting":
+        return float(pipeline.arrays["learning_rate"]) * value.shape[0] * leaf_error / 4
+    return leaf_error
+
+
+def numpy_path_for(model_path):
+    """Ruta del artefacto NumPy asociado a un modelo joblib"""
+    return os.path.splitext(model_path)[0] + ".npz"
+
+
+def compact_path_for(model_path):
+    """Ruta del artefacto compacto asociado a un modelo joblib"""
+    return os.path.splitext(model_path)[0] + ".compact.npz"
+
+
+def compact_leaf_bits(pipeline):
+    """leaf_bits con el que se generó un artefacto compacto (None: hojas float32 o sin árboles)"""
+    value = pipeline.arrays.get("value")
+    if value is None or "value_scale" not in pipeline.arrays:
+        return None
+    return np.iinfo(value.dtype).bits
+
+
+def resolve_model_path(model_path, prefer_numpy=True):
+    """Archivo que load_model carga realmente: el .npz junto al .joblib si existe y se prefiere"""
+    if model_path.endswith(".npz"):
+        return model_path
+    npz_path = numpy_path_for(model_path)
+    if prefer_numpy and os.path.exists(npz_path):
+        return npz_path
+    return model_path
+
+
+def model_fingerprint(path):
+    """Hash del contenido de un artefacto de modelo: identifica la versión servida"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def load_model(model_path, prefer_numpy=True):
+    """
+    Carga el modelo para inferencia
+
+    Una ruta .npz se carga directamente (p. ej. un artefacto compacto). Para un
+    .joblib, si existe el .npz a su lado se usa el camino NumPy puro; si no, se
+    importa joblib (y con él sklearn) solo en ese momento.
+    """
+    model_path = resolve_model_path(model_path, prefer_numpy)
+    if model_path.endswith(".npz"):
+        return NumpyPipeline.load(model_path)
+
+    import joblib
+    # Los modelos se entrenaron con DataFrames; en inferencia reciben matrices NumPy
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+    return joblib.load(model_path)
+
+
+def model_type_name(model):
+    """Nombre del clasificador, sea un NumpyPipeline o un Pipeline de sklearn"""
+    if isinstance(model, NumpyPipeline):
+        return model.model_type
+    return type(model.named_steps['clf']).__name__
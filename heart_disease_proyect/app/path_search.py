@@ -0,0 +1,206 @@
+# app/path_search.py
+import time
+
+import numpy as np
+from joblib import Parallel, delayed
+from scipy.stats import rankdata
+from sklearn.base import clone
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier, ExtraTreesClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import ParameterGrid, check_cv
+from sklearn.pipeline import Pipeline
+
+# Solvers de LogisticRegression que parten de los coeficientes anteriores con warm_start
+# (liblinear lo ignora: se reentrena, pero sigue en el mismo recorrido)
+WARM_START_SOLVERS = {"lbfgs", "newton-cg", "newton-cholesky", "sag", "saga"}
+
+
+def path_param(estimator):
+    """
+    Hiperparámetro que se puede recorrer con un solo ajuste, o None
+
+    - GradientBoosting: n_estimators (predicciones por etapas).
+    - RandomForest / ExtraTrees: n_estimators (se añaden árboles con warm_start).
+    - LogisticRegression: C (camino de regularización con warm_start).
+    """
+    if isinstance(estimator, Pipeline):
+        step, clf = estimator.steps[-1]
+        name = path_param(clf)
+        return f"{step}__{name}" if name else None
+    if isinstance(estimator, (GradientBoostingClassifier, RandomForestClassifier, ExtraTreesClassifier)):
+        return "n_estimators"
+    if isinstance(estimator, LogisticRegression):
+        return "C"
+    return None
+
+
+def supports_path(estimator, param_grid):
+    """True si el grid tiene al menos dos valores del hiperparámetro recorrible"""
+    name = path_param(estimator)
+    return bool(name) and len(set(param_grid.get(name, []))) > 1
+
+
+def _split_head(estimator):
+    """(pasos de preprocesado o None, clasificador final)"""
+    if isinstance(estimator, Pipeline):
+        return (estimator[:-1] if len(estimator.steps) > 1 else None), estimator.steps[-1][1]
+    return None, estimator
+
+
+def _auc(clf, X, y, scores=None):
+    # Igual que el scorer 'roc_auc': decision_function si existe, si no predict_proba
+    if scores is None:
+        if hasattr(clf, "decision_function"):
+            scores = clf.decision_function(X)
+        else:
+            scores = clf.predict_proba(X)[:, 1]
+    return roc_auc_score(y, scores)
+
+
+def _fit_path(estimator, params, path_name, path_values, X, y, train, test, return_train_score):
+    """
+    Ajusta una combinación de hiperparámetros en un fold y puntúa todos los valores del recorrido
+
+    Devuelve (scores de test, scores de train, segundos), alineados con path_values.
+    """
+    start = time.perf_counter()
+    estimator = clone(estimator).set_params(**params)
+    head, clf = _split_head(estimator)
+    param = path_name.rsplit("__", 1)[-1]
+
+    X_train, y_train = _take(X, train), _take(y, train)
+    X_test, y_test = _take(X, test), _take(y, test)
+    if head is not None:
+        X_train = head.fit_transform(X_train, y_train)
+        X_test = head.transform(X_test)
+
+    test_scores, train_scores = [], []
+
+    def score():
+        test_scores.append(_auc(clf, X_test, y_test))
+        if return_train_score:
+            train_scores.append(_auc(clf, X_train, y_train))
+
+    if isinstance(clf, GradientBoostingClassifier):
+        # Las primeras k etapas de un modelo de N árboles son el modelo de k árboles
+        clf.set_params(n_estimators=max(path_values)).fit(X_train, y_train)
+        wanted = set(path_values)
+        staged_test = [s for k, s in enumerate(clf.staged_decision_function(X_test), 1) if k in wanted]
+        test_scores = [_auc(clf, X_test, y_test, s) for s in staged_test]
+        if return_train_score:
+            staged_train = [s for k, s in enumerate(clf.staged_decision_function(X_train), 1) if k in wanted]
+            train_scores = [_auc(clf, X_train, y_train, s) for s in staged_train]
+    elif param == "n_estimators":
+        # Bosques: la semilla de cada árbol no depende de n_estimators, así que
+        # crecer de 100 a 200 con warm_start da el mismo bosque que entrenar 200
+        clf.set_params(warm_start=True)
+        for value in path_values:
+            clf.set_params(n_estimators=value).fit(X_train, y_train)
+            score()
+    else:
+        # Camino de regularización: de más a menos regularizado, partiendo de la solución anterior
+        clf.set_params(warm_start=clf.solver in WARM_START_SOLVERS)
+        for value in path_values:
+            clf.set_params(C=value).fit(X_train, y_train)
+            score()
+
+    return test_scores, train_scores, time.perf_counter() - start
+
+
+def _take(data, indices):
+    return data.iloc[indices] if hasattr(data, "iloc") else data[indices]
+
+
+class PathGridSearchCV:
+    """
+    GridSearchCV (scoring='roc_auc') que evalúa un hiperparámetro a lo largo de su recorrido
+
+    En lugar de entrenar desde cero cada valor de n_estimators (o de C), por
+    cada combinación del resto del grid y cada fold se hace un único ajuste y
+    se puntúan todos los valores del recorrido. El resultado, los empates y el
+    reentrenamiento final con los mejores parámetros son los de GridSearchCV:
+    cv_results_ sigue el orden de ParameterGrid y best_estimator_ se ajusta
+    desde cero sobre todo el conjunto.
+    """
+
+    def __init__(self, estimator, param_grid, cv=5, n_jobs=None, return_train_score=False, verbose=0):
+        self.estimator = estimator
+        self.param_grid = param_grid
+        self.cv = cv
+        self.n_jobs = n_jobs
+        self.return_train_score = return_train_score
+        self.verbose = verbose
+
+    def fit(self, X, y):
+        path_name = path_param(self.estimator)
+        if not supports_path(self.estimator, self.param_grid):
+            raise ValueError(f"El grid no tiene un hiperparámetro recorrible para {type(self.estimator).__name__}")
+
+        path_values = sorted(set(self.param_grid[path_name]))
+        rest_grid = {k: v for k, v in self.param_grid.items() if k != path_name}
+        rest_candidates = list(ParameterGrid(rest_grid))
+        splits = list(check_cv(self.cv, y, classifier=True).split(X, y))
+        n_candidates = len(rest_candidates) * len(path_values)
+        if self.verbose:
+            print(f"Fitting {len(splits)} folds for each of {n_candidates} candidates, "
+                  f"{len(rest_candidates) * len(splits)} path fits over {path_name}={path_values}")
+
+        outputs = Parallel(n_jobs=self.n_jobs)(
+            delayed(_fit_path)(self.estimator, params, path_name, path_values, X, y, train, test,
+                               self.return_train_score)
+            for params in rest_candidates for train, test in splits
+        )
+
+        # Reordenar al orden de ParameterGrid(param_grid) para desempatar igual que GridSearchCV
+        n_splits = len(splits)
+        candidates = list(ParameterGrid(self.param_grid))
+        test = np.empty((len(candidates), n_splits))
+        train = np.empty((len(candidates), n_splits))
+        fit_time = np.empty((len(candidates), n_splits))
+        for c, params in enumerate(candidates):
+            rest = rest_candidates.index({k: v for k, v in params.items() if k != path_name})
+            p = path_values.index(params[path_name])
+            for s in range(n_splits):
+                test_scores, train_scores, seconds = outputs[rest * n_splits + s]
+                test[c, s] = test_scores[p]
+                train[c, s] = train_scores[p] if self.return_train_score else np.nan
+                fit_time[c, s] = seconds / len(path_values)
+
+        results = {"params": candidates}
+        for name in self.param_grid:
+            results[f"param_{name}"] = np.ma.masked_array([params[name] for params in candidates], dtype=object)
+        results["mean_fit_time"] = fit_time.mean(axis=1)
+        results["std_fit_time"] = fit_time.std(axis=1)
+        sets = [("test", test)] + ([("train", train)] if self.return_train_score else [])
+        for key, scores in sets:
+            for s in range(n_splits):
+                results[f"split{s}_{key}_score"] = scores[:, s]
+            results[f"mean_{key}_score"] = scores.mean(axis=1)
+            results[f"std_{key}_score"] = scores.std(axis=1)
+        results["rank_test_score"] = rankdata(-results["mean_test_score"], method="min").astype(np.int32)
+
+        self.cv_results_ = results
+        self.n_splits_ = n_splits
+        self.path_param_ = path_name
+        self.best_index_ = int(results["rank_test_score"].argmin())
+        self.best_params_ = candidates[self.best_index_]
+        self.best_score_ = results["mean_test_score"][self.best_index_]
+
+        start = time.perf_counter()
+        self.best_estimator_ = clone(self.estimator).set_params(**self.best_params_).fit(X, y)
+        self.refit_time_ = time.perf_counter() - start
+        self.classes_ = self.best_estimator_.classes_
+        return self
+
+    def predict(self, X):
+        return self.best_estimator_.predict(X)
+
+    def predict_proba(self, X):
+        return self.best_estimator_.predict_proba(X)
+
+    def decision_function(self, X):
+        return self.best_estimator_.decision_function(X)
+
+    def score(self, X, y):
+        return _auc(self.best_estimator_, X, y)
@@ -0,0 +1,207 @@
+# app/profiling.py
+import math
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class ProfilerBusy(RuntimeError):
+    """Ya hay una sesión de perfilado en curso"""
+
+
+class SamplingProfiler:
+    """
+    Profiler por muestreo de todos los hilos del proceso
+
+    Un hilo propio toma cada `interval` segundos la pila de cada hilo
+    (sys._current_frames) y cuenta las pilas en formato "collapsed"
+    (marco;marco;marco N), el que usan flamegraph.pl y speedscope. No instrumenta
+    el código: el coste es proporcional a la frecuencia de muestreo, y la
+    duración, la profundidad y el número de pilas distintas están acotados.
+    """
+
+    def __init__(self, max_seconds=60, min_interval=0.001, max_depth=64, max_stacks=10000):
+        self.max_seconds = max_seconds
+        self.min_interval = min_interval
+        self.max_depth = max_depth
+        self.max_stacks = max_stacks
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._stacks = {}
+        self._session = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, seconds=10, interval=0.01):
+        """
+        Inicia una sesión que se detiene sola tras `seconds` (acotado a max_seconds)
+
+        Lanza ValueError si seconds o interval no son números finitos: con
+        inf/nan el hilo de muestreo moriría o no terminaría nunca.
+        """
+        seconds, interval = float(seconds), float(interval)
+        if not (math.isfinite(seconds) and math.isfinite(interval)):
+            raise ValueError("seconds e interval deben ser números finitos")
+        seconds = min(max(seconds, 0.1), self.max_seconds)
+        interval = max(interval, self.min_interval)
+
+        with self._lock:
+            if self.running:
+                raise ProfilerBusy("Ya hay un perfilado en curso")
+            self._stacks = {}
+            self._stop.clear()
+            self._session = {
+                "started_at": time.time(), "seconds": seconds, "interval_ms": interval * 1000,
+                "samples": 0, "truncated": 0, "finished_at": None
+            }
+            self._thread = threading.Thread(
+                target=self._run, args=(seconds, interval), name="sampling-profiler", daemon=True
+            )
+            self._thread.start()
+        return self.status()
+
+    def stop(self):
+        """Detiene la sesión en curso (si la hay) y espera al hilo de muestreo"""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join()
+        return self.status()
+
+    def _run(self, seconds, interval):
+        deadline = time.monotonic() + seconds
+        own_id = threading.get_ident()
+        try:
+            while not self._stop.is_set() and time.monotonic() < deadline:
+                self._sample(own_id)
+                self._stop.wait(interval)
+        finally:
+            with self._lock:
+                self._session["finished_at"] = time.time()
+
+    def _sample(self, own_id):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        collapsed = []
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            frames = []
+            while frame is not None and len(frames) < self.max_depth:
+                code = frame.f_code
+                frames.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+                frame = frame.f_back
+            frames.append(names.get(thread_id, str(thread_id)))
+            collapsed.append(";".join(reversed(frames)))
+
+        with self._lock:
+            self._session["samples"] += 1
+            for stack in collapsed:
+                if stack in self._stacks:
+                    self._stacks[stack] += 1
+                elif len(self._stacks) < self.max_stacks:
+                    self._stacks[stack] = 1
+                else:
+                    self._session["truncated"] += 1
+
+    def collapsed(self):
+        """Pilas de la última sesión en formato collapsed, de más a menos muestras"""
+        with self._lock:
+            ordered = sorted(self._stacks.items(), key=lambda item: item[1], reverse=True)
+        return "".join(f"{stack} {count}\n" for stack, count in ordered)
+
+    def status(self):
+        with self._lock:
+            session = dict(self._session) if self._session else None
+            unique = len(self._stacks)
+        return {"running": self.running, "session": session, "unique_stacks": unique}
+
+
+class RequestTrace:
+    """
+    Duración de cada etapa de una petición (ms)
+
+    Las etapas se listan en el orden en que empiezan; las anidadas llevan
+    depth > 0 y su tiempo también cuenta en la etapa que las contiene.
+    """
+
+    def __init__(self, method, path):
+        self.method = method
+        self.path = path
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.stages = []
+        self.tags = {}
+        self._depth = 0
+
+    @contextmanager
+    def stage(self, name):
+        entry = {"stage": name, "depth": self._depth, "ms": None}
+        self.stages.append(entry)
+        self._depth += 1
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry["ms"] = round((time.perf_counter() - t0) * 1000, 3)
+            self._depth -= 1
+
+    def to_dict(self, status, total_ms):
+        return {
+            "timestamp": self.started_at,
+            "method": self.method,
+            "path": self.path,
+            "status": status,
+            "total_ms": round(total_ms, 3),
+            "stages": [dict(entry) for entry in self.stages],
+            **self.tags
+        }
+
+
+class SlowRequestLog:
+    """
+    Ring buffer con la traza por etapas de las peticiones más lentas que un umbral
+
+    Todas las peticiones se trazan (unos perf_counter por etapa), pero solo se
+    guardan las que superan threshold_ms, y como mucho las últimas `capacity`.
+    """
+
+    def __init__(self, threshold_ms=250, capacity=100):
+        self.threshold_ms = threshold_ms
+        self._buffer = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._traced = 0
+        self._captured = 0
+
+    def finish(self, trace, status):
+        """Cierra la traza; la guarda si fue lenta. Devuelve la duración total en ms"""
+        total_ms = (time.perf_counter() - trace.start) * 1000
+        slow = total_ms >= self.threshold_ms
+        with self._lock:
+            self._traced += 1
+            if slow:
+                self._captured += 1
+                self._buffer.append(trace.to_dict(status, total_ms))
+        return total_ms
+
+    def recent(self, limit=None):
+        """Peticiones lentas capturadas, la más reciente primero"""
+        with self._lock:
+            items = list(self._buffer)
+        items.reverse()
+        return items[:limit] if limit else items
+
+    def stats(self):
+        with self._lock:
+            return {
+                "threshold_ms": self.threshold_ms,
+                "capacity": self._buffer.maxlen,
+                "buffered": len(self._buffer),
+                "traced": self._traced,
+                "captured": self._captured
+            }
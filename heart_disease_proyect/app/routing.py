@@ -0,0 +1,188 @@
+# app/routing.py
+import json
+import re
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+
+class UnknownModel(KeyError):
+    """Se pidió un modelo que no está cargado"""
+
+
+class ModelsConfigError(ValueError):
+    """Configuración de MODELS mal formada (entrada, peso o reparto inválido)"""
+
+
+def parse_models_config(config):
+    """
+    Convierte 'cv=app/model_cv.joblib:90,simple=app/model.joblib:10' en [(nombre, ruta, peso)]
+
+    Sin ':peso' el peso es 1. Solo un sufijo ':<entero>' es un peso, así una
+    ruta de Windows como C:\\models\\m.joblib no se confunde con uno. Lanza
+    ModelsConfigError si una entrada no tiene nombre o ruta, si un peso no es
+    un entero >= 0, si un nombre se repite o si todos los pesos son 0.
+    """
+    models = []
+    for entry in config.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, sep, spec = entry.partition("=")
+        name, spec = name.strip(), spec.strip()
+        if not sep or not name or not spec:
+            raise ModelsConfigError(f"Entrada de MODELS inválida {entry!r}: se esperaba nombre=ruta[:peso]")
+        weighted = re.fullmatch(r"(.+):(-?\d+)", spec)
+        if weighted:
+            path, weight = weighted.group(1), int(weighted.group(2))
+        else:
+            # Un ':' que no es la unidad (C:) seguido de algo que no es una ruta es un peso mal escrito
+            prefix, colon, suffix = spec.rpartition(":")
+            if colon and len(prefix) > 1 and not re.search(r"[\\/]", suffix):
+                raise ModelsConfigError(f"Peso de '{name}' inválido en MODELS: {suffix!r} no es un entero")
+            path, weight = spec, 1
+        if any(name == other for other, _, _ in models):
+            raise ModelsConfigError(f"Modelo '{name}' repetido en MODELS")
+        models.append((name, path.strip(), weight))
+
+    if not models:
+        raise ModelsConfigError("MODELS no define ningún modelo")
+    check_weights({name: weight for name, _, weight in models})
+    return models
+
+
+def check_weights(weights):
+    """Pesos de reparto: enteros >= 0 con al menos uno positivo. Lanza ModelsConfigError"""
+    for name, weight in weights.items():
+        if weight < 0:
+            raise ModelsConfigError(f"Peso de '{name}' negativo en MODELS: {weight}")
+    if sum(weights.values()) <= 0:
+        raise ModelsConfigError("Todos los pesos de MODELS son 0: ningún modelo recibiría tráfico sin X-Model")
+
+
+class ModelRouter:
+    """
+    Varios modelos cargados a la vez con enrutamiento A/B
+
+    Una petición puede pedir un modelo con la cabecera X-Model; si no, se elige
+    por pesos. La elección usa un hash de la clave del paciente, así el mismo
+    paciente siempre va al mismo modelo (y el coalescing sigue funcionando).
+    """
+
+    def __init__(self, models, primary=None):
+        # models: {nombre: (modelo, peso)}
+        self.models = {name: model for name, (model, _) in models.items()}
+        self.weights = {name: weight for name, (_, weight) in models.items()}
+        self.primary = primary or next(iter(self.models))
+        self._lock = threading.Lock()
+        self._routed = {name: 0 for name in self.models}
+
+        if self.primary not in self.models:
+            raise ModelsConfigError(f"Modelo principal desconocido: {self.primary}")
+        check_weights(self.weights)
+
+    def choose(self, key, requested=None, record=True):
+        """Devuelve el nombre del modelo que atiende la petición (record=False no la cuenta)"""
+        if requested:
+            if requested not in self.models:
+                raise UnknownModel(requested)
+            name = requested
+        else:
+            total = sum(self.weights.values())
+            point = zlib.crc32(key.encode("utf-8")) % total
+            for name, weight in self.weights.items():
+                if point < weight:
+                    break
+                point -= weight
+
+        if record:
+            with self._lock:
+                self._routed[name] += 1
+        return name
+
+    def stats(self):
+        with self._lock:
+            return {
+                "primary": self.primary,
+                "weights": dict(self.weights),
+                "routed": dict(self._routed)
+            }
+
+
+class ShadowScorer:
+    """
+    Puntúa en segundo plano las mismas entradas con un modelo candidato
+
+    La respuesta principal nunca espera al modelo sombra: las tareas van a un
+    pool propio y, si hay demasiadas pendientes, se descartan en lugar de
+    acumular memoria. Las comparaciones se guardan en un log JSONL opcional.
+    """
+
+    def __init__(self, name, model, workers=1, max_pending=256, log_path=None):
+        self.name = name
+        self.model = model
+        self.max_pending = max_pending
+        self.log_path = log_path
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="shadow")
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+        self._pending = 0
+        self._stats = {"scored": 0, "dropped": 0, "errors": 0, "disagreements": 0,
+                       "sum_abs_diff": 0.0, "max_abs_diff": 0.0}
+
+    def submit(self, primary_name, X, primary_probabilities):
+        """Encola la comparación sin bloquear; devuelve False si se descartó"""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._stats["dropped"] += 1
+                return False
+            self._pending += 1
+
+        self._executor.submit(self._score, primary_name, X, primary_probabilities)
+        return True
+
+    def _score(self, primary_name, X, primary_probabilities):
+        try:
+            shadow_probabilities = self.model.predict_proba(X)[:, 1]
+            diffs = abs(shadow_probabilities - primary_probabilities)
+            disagreements = int(((shadow_probabilities > 0.5) != (primary_probabilities > 0.5)).sum())
+
+            with self._lock:
+                self._stats["scored"] += len(diffs)
+                self._stats["disagreements"] += disagreements
+                self._stats["sum_abs_diff"] += float(diffs.sum())
+                self._stats["max_abs_diff"] = max(self._stats["max_abs_diff"], float(diffs.max()))
+
+            if self.log_path:
+                now = time.time()
+                lines = [
+                    json.dumps({
+                        "ts": now, "primary": primary_name, "shadow": self.name,
+                        "primary_prob": round(float(p), 6), "shadow_prob": round(float(s), 6)
+                    })
+                    for p, s in zip(primary_probabilities, shadow_probabilities)
+                ]
+                with self._log_lock, open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write("\n".join(lines) + "\n")
+        except Exception as e:
+            with self._lock:
+                self._stats["errors"] += 1
+            print(f"Error en puntuación sombra: {e}")
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def stats(self):
+        with self._lock:
+            scored = self._stats["scored"]
+            return {
+                "model": self.name,
+                "pending": self._pending,
+                "scored": scored,
+                "dropped": self._stats["dropped"],
+                "errors": self._stats["errors"],
+                "disagreement_rate": round(self._stats["disagreements"] / scored, 4) if scored else 0.0,
+                "mean_abs_diff": round(self._stats["sum_abs_diff"] / scored, 6) if scored else 0.0,
+                "max_abs_diff": round(self._stats["max_abs_diff"], 6)
+            }
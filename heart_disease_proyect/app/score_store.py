@@ -0,0 +1,193 @@
+# app/score_store.py
+import csv
+import hashlib
+import io
+import os
+import sqlite3
+import time
+
+from app.bulk_scoring import OUTPUT_COLUMNS, result_values
+from app.features import CATEGORICAL_LEVELS, NUMERIC_COLUMNS
+
+# Campos que usa el modelo: cambiar cualquier otra columna (p. ej. el target) no obliga a repuntuar
+INPUT_FIELDS = NUMERIC_COLUMNS + list(CATEGORICAL_LEVELS)
+
+# Parámetros por consulta IN (...), por debajo del límite de SQLite
+_LOOKUP_CHUNK = 500
+
+
+def record_hash(patient):
+    """
+    Hash de 16 bytes del contenido de un paciente (solo los campos de entrada del modelo)
+
+    Los valores no se normalizan: el codificador compara las categorías tal
+    cual, así que " ATA" y "ATA" se puntúan distinto y deben tener hash distinto.
+    """
+    return _digest([str(patient[field]) if field in patient else "\x00" for field in INPUT_FIELDS])
+
+
+def _digest(values):
+    return hashlib.blake2b("\x1f".join(values).encode("utf-8"), digest_size=16).digest()
+
+
+def row_hasher(header):
+    """record_hash para filas CSV ya separadas, sin construir un dict por fila"""
+    positions = [header.index(field) if field in header else None for field in INPUT_FIELDS]
+
+    def hash_row(row):
+        return _digest([row[i] if i is not None and i < len(row) else "\x00" for i in positions])
+    return hash_row
+
+
+def format_result(result):
+    """Texto CSV de OUTPUT_COLUMNS para un resultado (lo que se añade a la línea de entrada)"""
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="").writerow(result_values(result))
+    return buffer.getvalue()
+
+
+class ScoreStore:
+    """
+    Resultados ya calculados: (hash del paciente, versión del modelo) -> resultado
+
+    Un archivo SQLite local. Se guarda el texto CSV de OUTPUT_COLUMNS tal cual
+    se escribe en la salida, así un resultado reutilizado sale idéntico a uno
+    recién calculado sin volver a formatearlo. Los errores de validación también
+    se guardan: con la misma entrada y el mismo modelo el resultado no cambia.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS scores (
+                model TEXT NOT NULL,
+                record_hash BLOB NOT NULL,
+                result TEXT NOT NULL,
+                PRIMARY KEY (model, record_hash)
+            ) WITHOUT ROWID
+        """)
+        self.conn.commit()
+
+    def lookup(self, model, hashes):
+        """{hash: resultado} de los hashes que ya tienen resultado para este modelo"""
+        hashes = list(hashes)
+        found = {}
+        for i in range(0, len(hashes), _LOOKUP_CHUNK):
+            chunk = hashes[i:i + _LOOKUP_CHUNK]
+            found.update(self.conn.execute(
+                "SELECT record_hash, result FROM scores "
+                f"WHERE model = ? AND record_hash IN ({','.join('?' * len(chunk))})",
+                [model, *chunk]
+            ))
+        return found
+
+    def save(self, model, items):
+        """Guarda [(hash, resultado)] en una sola transacción"""
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO scores VALUES (?, ?, ?)",
+                                  [(model, record, result) for record, result in items])
+
+    def prune(self, model, keep_hashes):
+        """Borra los resultados de otras versiones del modelo y de pacientes que ya no están"""
+        with self.conn:
+            removed = self.conn.execute("DELETE FROM scores WHERE model != ?", [model]).rowcount
+            self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS keep (record_hash BLOB PRIMARY KEY)")
+            self.conn.execute("DELETE FROM keep")
+            self.conn.executemany("INSERT OR IGNORE INTO keep VALUES (?)", ((h,) for h in keep_hashes))
+            removed += self.conn.execute(
+                "DELETE FROM scores WHERE model = ? AND record_hash NOT IN (SELECT record_hash FROM keep)",
+                [model]
+            ).rowcount
+            self.conn.execute("DELETE FROM keep")
+        return removed
+
+    def count(self, model=None):
+        if model is None:
+            return self.conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+        return self.conn.execute("SELECT COUNT(*) FROM scores WHERE model = ?", [model]).fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def default_store_path(input_path):
+    """Almacén junto al CSV de entrada"""
+    return os.path.join(os.path.dirname(os.path.abspath(input_path)), ".score_store.sqlite")
+
+
+def incremental_score(predictor, input_path, output_path, store, chunk_size=5000, prune=False):
+    """
+    Puntúa el CSV reutilizando los resultados guardados para la versión actual del modelo
+
+    Solo pasan por el modelo los pacientes nuevos o modificados (o todos si
+    cambió predictor.model_fingerprint); los pacientes repetidos dentro del
+    mismo CSV se puntúan una vez. La salida tiene el mismo formato que la
+    puntuación masiva (línea de entrada + OUTPUT_COLUMNS) y se escribe en un
+    .tmp que se renombra al terminar. Con prune=True se borran del almacén las
+    versiones anteriores del modelo y los pacientes que ya no aparecen.
+    """
+    model = predictor.model_fingerprint
+    start = time.perf_counter()
+    stats = {"rows": 0, "reused": 0, "scored": 0, "pruned": 0}
+    seen = set() if prune else None
+
+    def flush(out, header, hash_row, lines):
+        rows = list(csv.reader(lines))
+        hashes = [hash_row(row) for row in rows]
+        known = store.lookup(model, set(hashes))
+
+        # Pacientes sin resultado guardado, sin repetir dentro del chunk
+        missing = {}
+        for record, row in zip(hashes, rows):
+            if record not in known and record not in missing:
+                missing[record] = dict(zip(header, row))
+        if missing:
+            results = predictor.batch_predict(list(missing.values()))
+            fresh = {record: format_result(result) for record, result in zip(missing, results)}
+            store.save(model, fresh.items())
+            known.update(fresh)
+
+        out.write("".join(f"{line},{known[record]}\n" for line, record in zip(lines, hashes)))
+
+        stats["rows"] += len(lines)
+        stats["scored"] += len(missing)
+        stats["reused"] += len(lines) - len(missing)
+        if seen is not None:
+            seen.update(hashes)
+
+    tmp_path = output_path + ".tmp"
+    try:
+        with open(input_path, encoding="utf-8", newline="") as f, \
+                open(tmp_path, "w", encoding="utf-8", newline="") as out:
+            header_line = f.readline().rstrip("\r\n")
+            header = next(csv.reader([header_line]))
+            hash_row = row_hasher(header)
+            out.write(header_line + "," + ",".join(OUTPUT_COLUMNS) + "\n")
+            lines = []
+            for line in f:
+                if line.strip():
+                    lines.append(line.rstrip("\r\n"))
+                if len(lines) >= chunk_size:
+                    flush(out, header, hash_row, lines)
+                    lines = []
+            if lines:
+                flush(out, header, hash_row, lines)
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    if prune:
+        stats["pruned"] = store.prune(model, seen)
+    elapsed = time.perf_counter() - start
+    return {**stats, "model": model, "seconds": round(elapsed, 3),
+            "rows_per_second": round(stats["rows"] / elapsed, 1) if elapsed else None}
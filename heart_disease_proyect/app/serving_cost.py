@@ -0,0 +1,91 @@
+# app/serving_cost.py
+import pickle
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+
+
+def measure_serving_cost(model, X, batch_size=256, repeats=200, warmup=10):
+    """
+    Mide lo que cuesta servir un modelo entrenado
+
+    - Latencia de una predicción individual (p50/p99, ms), como en /predict.
+    - Latencia de un lote de batch_size filas y coste por fila (µs), como en /predict-batch.
+    - Tamaño serializado (KB) y pico de memoria durante la predicción del lote (KB).
+    Se usan matrices NumPy, igual que recibe el modelo en la API.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    batch = np.resize(X, (batch_size, X.shape[1]))
+
+    with warnings.catch_warnings():
+        # Los modelos se entrenaron con DataFrames
+        warnings.filterwarnings("ignore", message="X does not have valid feature names")
+
+        for i in range(warmup):
+            model.predict_proba(X[i % len(X):i % len(X) + 1])
+
+        single_ms = []
+        for i in range(repeats):
+            row = X[i % len(X):i % len(X) + 1]
+            start = time.perf_counter()
+            model.predict_proba(row)
+            single_ms.append((time.perf_counter() - start) * 1000)
+
+        batch_ms = []
+        for _ in range(max(repeats // 20, 3)):
+            start = time.perf_counter()
+            model.predict_proba(batch)
+            batch_ms.append((time.perf_counter() - start) * 1000)
+
+        tracemalloc.start()
+        try:
+            model.predict_proba(batch)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    batch_p50 = float(np.percentile(batch_ms, 50))
+    return {
+        "Single_ms_p50": float(np.percentile(single_ms, 50)),
+        "Single_ms_p99": float(np.percentile(single_ms, 99)),
+        "Batch_ms": batch_p50,
+        "Per_row_us": batch_p50 * 1000 / batch_size,
+        "Size_KB": len(pickle.dumps(model)) / 1024,
+        "Peak_Mem_KB": peak / 1024
+    }
+
+
+def pareto_front(rows, maximize, minimize):
+    """
+    Modelos no dominados: ningún otro es igual o mejor en todo y estrictamente mejor en algo
+
+    rows es una lista de dicts (p. ej. df.to_dict("records")) con la clave "Model".
+    """
+    def dominates(a, b):
+        no_worse = a[maximize] >= b[maximize] and all(a[m] <= b[m] for m in minimize)
+        better = a[maximize] > b[maximize] or any(a[m] < b[m] for m in minimize)
+        return no_worse and better
+
+    return [row["Model"] for row in rows if not any(dominates(other, row) for other in rows)]
+
+
+def select_under_budget(rows, metric, latency_budget=None, memory_budget=None,
+                        latency_key="Single_ms_p99", memory_key="Size_KB"):
+    """
+    Mejor modelo según metric entre los que cumplen el presupuesto de latencia y memoria
+
+    Cada presupuesto va en las unidades de su clave: con las claves por defecto,
+    latency_budget en ms (Single_ms_p99) y memory_budget en KB (Size_KB); con
+    latency_key="Per_row_us", en µs por fila. A igual métrica gana el más
+    rápido. Devuelve None si ninguno cumple.
+    """
+    candidates = [
+        row for row in rows
+        if (latency_budget is None or row[latency_key] <= latency_budget)
+        and (memory_budget is None or row[memory_key] <= memory_budget)
+    ]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda row: (row[metric], -row[latency_key]))
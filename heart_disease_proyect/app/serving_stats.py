@@ -0,0 +1,86 @@
+# app/serving_stats.py
+import threading
+
+import numpy as np
+
+# Límites superiores (ms) de los buckets del histograma de latencia; el último recoge el resto
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+# Mismos cortes que build_prediction_result: < 0.3 Bajo, < 0.7 Moderado, resto Alto
+RISK_LEVELS = ["Bajo", "Moderado", "Alto"]
+RISK_CUTS = [0.3, 0.7]
+
+
+class ServingStats:
+    """
+    Contadores acumulados del tráfico de predicción
+
+    Peticiones, errores, histograma de latencia y mezcla de niveles de riesgo
+    son contadores que solo crecen: quien los consulta (el dashboard) calcula
+    tasas y percentiles con la diferencia entre dos lecturas. La deriva compara
+    la media de las últimas `window` filas codificadas con la media y la
+    desviación del entrenamiento (las del StandardScaler del modelo).
+    """
+
+    def __init__(self, feature_names, reference_mean, reference_scale, window=1000):
+        self.feature_names = list(feature_names)
+        self.reference_mean = np.asarray(reference_mean, dtype=np.float64)
+        self.reference_scale = np.asarray(reference_scale, dtype=np.float64)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._errors = 0
+        self._client_errors = 0
+        self._latency_counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self._predictions = 0
+        self._risk_counts = [0] * len(RISK_LEVELS)
+        # Ventana circular de las últimas filas vistas
+        self._window = np.zeros((window, len(self.feature_names)), dtype=np.float64)
+        self._window_next = 0
+        self._window_filled = 0
+
+    def record_request(self, status, latency_ms):
+        bucket = int(np.searchsorted(LATENCY_BUCKETS_MS, latency_ms))
+        with self._lock:
+            self._requests += 1
+            self._latency_counts[bucket] += 1
+            if status >= 500:
+                self._errors += 1
+            elif status >= 400:
+                self._client_errors += 1
+
+    def record_predictions(self, X, probabilities):
+        levels = np.bincount(np.searchsorted(RISK_CUTS, probabilities, side="right"), minlength=len(RISK_LEVELS))
+        X = np.asarray(X, dtype=np.float64)[-len(self._window):]
+        with self._lock:
+            self._predictions += len(probabilities)
+            for i, count in enumerate(levels):
+                self._risk_counts[i] += int(count)
+
+            rows = (self._window_next + np.arange(len(X))) % len(self._window)
+            self._window[rows] = X
+            self._window_next = (self._window_next + len(X)) % len(self._window)
+            self._window_filled = min(self._window_filled + len(X), len(self._window))
+
+    def drift_scores(self):
+        """Desplazamiento de la media reciente de cada feature, en desviaciones del entrenamiento"""
+        with self._lock:
+            if not self._window_filled:
+                return {}
+            recent_mean = self._window[:self._window_filled].mean(axis=0)
+        scores = np.abs(recent_mean - self.reference_mean) / self.reference_scale
+        return {name: round(float(score), 4) for name, score in zip(self.feature_names, scores)}
+
+    def snapshot(self):
+        drift = self.drift_scores()
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "errors": self._errors,
+                "client_errors": self._client_errors,
+                "latency_buckets_ms": LATENCY_BUCKETS_MS,
+                "latency_counts": list(self._latency_counts),
+                "predictions": self._predictions,
+                "risk_levels": dict(zip(RISK_LEVELS, self._risk_counts)),
+                "drift_window": self._window_filled,
+                "drift": drift
+            }
@@ -0,0 +1,99 @@
+# app/what_if.py
+import numpy as np
+
+from app.features import FEATURE_COLUMNS
+
+# Variables que se pueden variar a la vez (curva con 1, superficie con 2)
+MAX_FEATURES = 2
+
+# Puntos por defecto de un rango {"min", "max"} sin "steps"
+DEFAULT_STEPS = 20
+
+
+class WhatIfError(ValueError):
+    """Petición what-if mal formada o fuera de los rangos válidos"""
+
+
+def parse_axis(feature, spec, ranges, max_points):
+    """
+    Valores de una variable: lista explícita o {"min", "max", "steps"}
+
+    ranges es {campo: (tipo, mínimo, máximo)} (los de validate_patient_data);
+    en campos enteros los rangos se redondean y se quitan los repetidos.
+    """
+    if feature not in ranges:
+        raise WhatIfError(f"No se puede variar {feature}; variables permitidas: {list(ranges)}")
+    cast, low, high = ranges[feature]
+
+    try:
+        if isinstance(spec, dict):
+            start = float(spec.get("min", low))
+            stop = float(spec.get("max", high))
+            steps = int(spec.get("steps", DEFAULT_STEPS))
+            if not 1 <= steps <= max_points:
+                raise WhatIfError(f"{feature}: steps debe estar entre 1 y {max_points}")
+            values = np.linspace(start, stop, steps)
+            if cast is int:
+                values = np.unique(np.rint(values))
+        elif isinstance(spec, list) and spec:
+            values = np.asarray(spec, dtype=np.float64)
+        else:
+            raise WhatIfError(f"{feature}: se esperaba una lista de valores o {{min, max, steps}}")
+    except WhatIfError:
+        raise
+    except (TypeError, ValueError) as e:
+        raise WhatIfError(f"{feature}: valores no numéricos ({e})")
+
+    if values.ndim != 1 or not np.all(np.isfinite(values)):
+        raise WhatIfError(f"{feature}: se esperaba una lista plana de números")
+    if len(values) > max_points:
+        raise WhatIfError(f"{feature}: como máximo {max_points} valores")
+    if values.min() < low or values.max() > high:
+        raise WhatIfError(f"{feature} debe estar entre {low} y {high}")
+    return values
+
+
+def variant_matrix(base_row, features, axes):
+    """
+    Todas las combinaciones de los valores de `axes` sobre la fila codificada base_row
+
+    Se construye por broadcasting: una matriz (n1 * n2, n_features) en orden
+    de filas (la primera variable cambia más despacio), lista para una sola
+    llamada a predict_proba.
+    """
+    shape = tuple(len(values) for values in axes)
+    X = np.empty(shape + (base_row.shape[-1],), dtype=base_row.dtype)
+    X[...] = base_row.reshape(-1)
+    for axis, (feature, values) in enumerate(zip(features, axes)):
+        index = [None] * len(axes)
+        index[axis] = slice(None)
+        X[..., FEATURE_COLUMNS.index(feature)] = values[tuple(index)]
+    return X.reshape(-1, base_row.shape[-1]), shape
+
+
+def collapse_axis(model, feature, values):
+    """
+    Valores de un eje que el modelo distingue, y a cuál corresponde cada valor original
+
+    Con un modelo de árboles (NumpyPipeline.feature_bins) los valores entre los
+    mismos dos umbrales dan la misma predicción, así que basta puntuar uno por
+    intervalo. Con otros modelos se puntúan todos.
+    """
+    bins = model.feature_bins(FEATURE_COLUMNS.index(feature), values) if hasattr(model, "feature_bins") else None
+    if bins is None:
+        return values, np.arange(len(values))
+    _, first, inverse = np.unique(bins, return_index=True, return_inverse=True)
+    return values[first], inverse
+
+
+def score_grid(model, base_row, features, axes):
+    """
+    Probabilidad del paciente base y de todas las variantes, en una sola llamada al modelo
+
+    Devuelve (probabilidad base, matriz de probabilidades con forma (n1[, n2])).
+    """
+    collapsed = [collapse_axis(model, feature, values) for feature, values in zip(features, axes)]
+    X, shape = variant_matrix(base_row, features, [values for values, _ in collapsed])
+    probabilities = model.predict_proba(np.vstack([base_row, X]))[:, 1]
+    surface = probabilities[1:].reshape(shape)[np.ix_(*[inverse for _, inverse in collapsed])]
+    return probabilities[0], surface
@@ -1,330 +1,381 @@
-# dashboard/app.py
-from flask import Flask, render_template, jsonify
-import pandas as pd
-import joblib
-import os
-import json
-import subprocess
-import nbformat
-import glob
-from pathlib import Path
-
-app = Flask(__name__)
-
-def read_notebook_cells(notebook_path):
-    """Lee las celdas de un notebook Jupyter"""
-    try:
-        with open(notebook_path, 'r', encoding='utf-8') as f:
-            nb = nbformat.read(f, as_version=4)
-        
-        cells_content = []
-        for i, cell in enumerate(nb.cells[:10]):  # Primeras 10 celdas
-            if cell.cell_type == 'code':
-                cells_content.append(f"🔧 CELDA {i+1} (Código):\n{cell.source[:200]}...")
-            elif cell.cell_type == 'markdown':
-                cells_content.append(f"📝 CELDA {i+1} (Texto):\n{cell.source[:200]}...")
-        
-        return cells_content
-    except Exception as e:
-        return [f"❌ Error leyendo notebook: {e}"]
-
-def get_real_model_results():
-    """Obtiene resultados REALES de los modelos entrenados"""
-    try:
-        # Leer del notebook de la ETAPA 1
-        notebook_path = "../notebooks/1_model_leakage_demo.ipynb"
-        if os.path.exists(notebook_path):
-            with open(notebook_path, 'r', encoding='utf-8') as f:
-                nb = nbformat.read(f, as_version=4)
-            
-            # Buscar celdas con resultados
-            for cell in nb.cells:
-                if cell.cell_type == 'code' and 'AUC' in cell.source and 'Accuracy' in cell.source:
-                    # Extraer resultados (simplificado - en un caso real parsearías la salida)
-                    return [
-                        {"name": "GradientBoosting", "auc": 0.9372, "accuracy": 0.8913, "rank": 1},
-                        {"name": "KNeighbors", "auc": 0.9333, "accuracy": 0.8804, "rank": 2},
-                        {"name": "LogisticRegression", "auc": 0.9320, "accuracy": 0.8859, "rank": 3},
-                        {"name": "RandomForest", "auc": 0.9320, "accuracy": 0.8587, "rank": 4},
-                        {"name": "SVC", "auc": 0.9311, "accuracy": 0.8641, "rank": 5}
-                    ]
-    except:
-        pass
-    
-    # Fallback a resultados conocidos
-    return [
-        {"name": "GradientBoosting", "auc": 0.9372, "accuracy": 0.8913, "rank": 1},
-        {"name": "KNeighbors", "auc": 0.9333, "accuracy": 0.8804, "rank": 2},
-        {"name": "LogisticRegression", "auc": 0.9320, "accuracy": 0.8859, "rank": 3},
-        {"name": "RandomForest", "auc": 0.9320, "accuracy": 0.8587, "rank": 4},
-        {"name": "SVC", "auc": 0.9311, "accuracy": 0.8641, "rank": 5}
-    ]
-
-def get_data_leakage_results():
-    """Obtiene resultados del data leakage demostrado"""
-    try:
-        notebook_path = "../notebooks/1_model_leakage_demo.ipynb"
-        if os.path.exists(notebook_path):
-            with open(notebook_path, 'r', encoding='utf-8') as f:
-                nb = nbformat.read(f, as_version=4)
-            
-            # Buscar comparación data leakage
-            for cell in nb.cells:
-                if 'data leakage' in cell.source.lower() or 'leakage' in cell.source.lower():
-                    return {
-                        "with_leakage_auc": 1.0000,
-                        "without_leakage_auc": 0.9311,
-                        "difference": 0.0689,
-                        "impact": "El data leakage infla el AUC en 6.89%"
-                    }
-    except:
-        pass
-    
-    return {
-        "with_leakage_auc": 1.0000,
-        "without_leakage_auc": 0.9311, 
-        "difference": 0.0689,
-        "impact": "El data leakage infla el AUC en 6.89%"
-    }
-
-def get_notebook_summaries():
-    """Obtiene resúmenes de todos los notebooks"""
-    notebooks = {}
-    
-    notebook_files = {
-        "etapa1": "../notebooks/1_model_leakage_demo.ipynb",
-        "etapa2": "../notebooks/2_model_pipeline_cv.ipynb", 
-        "etapa6": "../notebooks/3_data_drift_monitoring.ipynb"
-    }
-    
-    for key, path in notebook_files.items():
-        if os.path.exists(path):
-            cells = read_notebook_cells(path)
-            notebooks[key] = {
-                "name": os.path.basename(path),
-                "cells_preview": cells[:3],  # Primeras 3 celdas
-                "cell_count": len(cells),
-                "file_size": f"{os.path.getsize(path) / 1024:.1f} KB"
-            }
-        else:
-            notebooks[key] = {"error": f"Archivo no encontrado: {path}"}
-    
-    return notebooks
-
-def get_project_files():
-    """Obtiene lista REAL de archivos del proyecto"""
-    project_structure = {}
-    
-    folders = {
-        "notebooks": "../notebooks",
-        "app": "../app", 
-        "docker": "../docker",
-        "k8s": "../k8s",
-        "scripts": "../scripts",
-        "dashboard": ".",
-        "github_actions": "../.github/workflows"
-    }
-    
-    for category, folder in folders.items():
-        if os.path.exists(folder):
-            files = []
-            for item in os.listdir(folder):
-                if not item.startswith('.'):
-                    item_path = os.path.join(folder, item)
-                    if os.path.isfile(item_path):
-                        files.append({
-                            "name": item,
-                            "size": f"{os.path.getsize(item_path) / 1024:.1f} KB",
-                            "type": "file"
-                        })
-                    else:
-                        files.append({
-                            "name": item + "/",
-                            "size": "-",
-                            "type": "folder" 
-                        })
-            project_structure[category] = files
-        else:
-            project_structure[category] = [{"error": f"Carpeta no encontrada: {folder}"}]
-    
-    return project_structure
-
-def check_system_status():
-    """Verifica el estado del sistema"""
-    status = {}
-    
-    # Verificar Docker
-    try:
-        result = subprocess.run(["docker", "version"], capture_output=True, text=True)
-        status["docker"] = result.returncode == 0
-    except:
-        status["docker"] = False
-    
-    # Verificar Kubernetes
-    try:
-        result = subprocess.run(["kubectl", "version", "--client"], capture_output=True, text=True)
-        status["kubernetes"] = result.returncode == 0
-    except:
-        status["kubernetes"] = False
-    
-    # Verificar modelos
-    status["model_simple"] = os.path.exists("../app/model.joblib") and os.path.getsize("../app/model.joblib") > 0
-    status["model_cv"] = os.path.exists("../app/model_cv.joblib") and os.path.getsize("../app/model_cv.joblib") > 0
-    status["dataset"] = os.path.exists("../heart.csv")
-    
-    return status
-
-def load_project_data():
-    """Carga datos COMPLETOS y REALES del proyecto"""
-    try:
-        # Datos del dataset
-        df = pd.read_csv("../heart.csv")
-        dataset_info = {
-            "rows": len(df),
-            "columns": len(df.columns),
-            "target_distribution": df['HeartDisease'].value_counts().to_dict(),
-            "numeric_features": df.select_dtypes(include=['number']).columns.tolist(),  # ¡CORREGIDO! Ahora es lista
-            "categorical_features": df.select_dtypes(include=['object']).columns.tolist(),  # ¡CORREGIDO! Ahora es lista
-            "memory_usage": f"{df.memory_usage(deep=True).sum() / 1024 / 1024:.2f} MB",
-            "description": "Heart Disease Prediction Dataset"
-        }
-        
-        # Resultados REALES
-        model_results = get_real_model_results()
-        data_leakage = get_data_leakage_results()
-        notebooks = get_notebook_summaries()
-        project_files = get_project_files()
-        system_status = check_system_status()
-        
-        # Cargar modelo para verificar
-        try:
-            model = joblib.load("../app/model.joblib")
-            model_info = {
-                "type": type(model).__name__,
-                "has_predict": hasattr(model, 'predict'),
-                "has_predict_proba": hasattr(model, 'predict_proba'),
-                "is_pipeline": hasattr(model, 'named_steps')
-            }
-        except:
-            model_info = {"error": "No se pudo cargar el modelo"}
-        
-        # Logros del proyecto
-        achievements = [
-            {"title": "Etapas Completadas", "value": "6/6", "description": "100% del proyecto terminado"},
-            {"title": "Modelos Entrenados", "value": "5", "description": "Algoritmos comparados"},
-            {"title": "Mejor AUC", "value": "0.9372", "description": "GradientBoosting"},
-            {"title": "Data Leakage", "value": "Demostrado", "description": f"AUC +{data_leakage['difference']:.3f}"},
-            {"title": "API Endpoints", "value": "3", "description": "Health, Model Info, Predict"},
-            {"title": "Notebooks", "value": "3", "description": "Análisis completo"}
-        ]
-
-        # Información detallada de etapas
-        project_stages = [
-            {
-                "name": "ETAPA 1", 
-                "status": "✅ COMPLETADA", 
-                "description": "Data Leakage y Múltiples Modelos",
-                "file": "notebooks/1_model_leakage_demo.ipynb",
-                "details": "5 modelos comparados, data leakage demostrado, AUC inflado en 0.0689",
-                "results": "GradientBoosting mejor modelo (AUC: 0.9372)"
-            },
-            {
-                "name": "ETAPA 2", 
-                "status": "✅ COMPLETADA", 
-                "description": "Pipeline con Validación Cruzada",
-                "file": "notebooks/2_model_pipeline_cv.ipynb", 
-                "details": "GridSearchCV, validación 5-fold, métricas múltiples",
-                "results": "Modelo optimizado listo para producción"
-            },
-            {
-                "name": "ETAPA 3", 
-                "status": "✅ COMPLETADA", 
-                "description": "API Flask y Docker",
-                "file": "app/api_flask.py",
-                "details": "API REST con 3 endpoints, contenerización completa",
-                "results": "API funcionando en http://localhost:5000"
-            },
-            {
-                "name": "ETAPA 4", 
-                "status": "✅ COMPLETADA", 
-                "description": "Kubernetes Local", 
-                "file": "k8s/deployment.yaml",
-                "details": "Deployment con 2 réplicas, Service LoadBalancer",
-                "results": "Aplicación desplegada en cluster local"
-            },
-            {
-                "name": "ETAPA 5", 
-                "status": "✅ COMPLETADA", 
-                "description": "GitHub Actions CI/CD",
-                "file": ".github/workflows/ci.yml",
-                "details": "Pipeline automatizado, tests, build Docker",
-                "results": "Integración continua funcionando"
-            },
-            {
-                "name": "ETAPA 6", 
-                "status": "✅ COMPLETADA", 
-                "description": "Monitoreo de Deriva",
-                "file": "notebooks/3_data_drift_monitoring.ipynb", 
-                "details": "Análisis de cambios en datos, detección automática",
-                "results": "Sistema de monitoreo implementado"
-            }
-        ]
-        
-        return {
-            "dataset_info": dataset_info,
-            "model_results": model_results,
-            "data_leakage": data_leakage,
-            "notebooks": notebooks,
-            "project_files": project_files, 
-            "system_status": system_status,
-            "model_info": model_info,
-            "achievements": achievements,
-            "project_stages": project_stages,
-            "project_complete": True
-        }
-        
-    except Exception as e:
-        return {"error": f"Error cargando datos: {e}"}
-
-@app.route('/')
-def index():
-    """Página principal del dashboard"""
-    project_data = load_project_data()
-    return render_template('index.html', **project_data)
-
-@app.route('/api/project-status')
-def api_project_status():
-    """Endpoint para estado del proyecto"""
-    return jsonify(check_system_status())
-
-@app.route('/api/notebooks')
-def api_notebooks():
-    """Endpoint para información de notebooks"""
-    return jsonify(get_notebook_summaries())
-
-@app.route('/api/test-prediction')
-def api_test_prediction():
-    """Endpoint para probar una predicción"""
-    try:
-        model = joblib.load("../app/model.joblib")
-        
-        # Datos de prueba (features después del one-hot encoding)
-        import numpy as np
-        # Ejemplo: [Age, RestingBP, Cholesterol, FastingBS, MaxHR, Oldpeak, Sex_M, ChestPainType_ATA, ...]
-        test_data = np.array([[45, 130, 240, 0, 150, 1.0, 1, 0, 0, 0, 1, 0, 0, 0, 1]])
-        
-        prediction = model.predict(test_data)
-        probability = model.predict_proba(test_data)
-        
-        return jsonify({
-            "prediction": int(prediction[0]),
-            "probability": float(probability[0][1]),
-            "status": "Modelo funcionando correctamente"
-        })
-    except Exception as e:
-        return jsonify({"error": str(e)})
-
-if __name__ == '__main__':
-    os.makedirs('templates', exist_ok=True)
-    print("Dashboard MLOps ejecutándose en: http://localhost:5001")
-    app.run(host='0.0.0.0', port=5001, debug=True)
\ No newline at end of file
+# dashboard/app.py
+from flask import Flask, Response, render_template, jsonify, request, stream_with_context
+import queue
+import os
+import sys
+import json
+import subprocess
+import glob
+from pathlib import Path
+# Al frente del path: este archivo también se llama app.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.dataset import load_dataset
+from app.live_metrics import LiveMetrics, sse_message
+
+# joblib y nbformat se importan dentro de las funciones que los usan
+# para que el dashboard arranque sin pagar su tiempo de import
+
+app = Flask(__name__)
+
+# Métricas en vivo de la API de predicción: un solo sondeo compartido por todos los navegadores
+live_metrics = LiveMetrics(
+    os.environ.get("PREDICTION_API_URL", "http://localhost:5000"),
+    interval=float(os.environ.get("DASHBOARD_POLL_SECONDS", 2))
+)
+
+def read_notebook_cells(notebook_path):
+    """Lee las celdas de un notebook Jupyter"""
+    try:
+        import nbformat
+        with open(notebook_path, 'r', encoding='utf-8') as f:
+            nb = nbformat.read(f, as_version=4)
+        
+        cells_content = []
+        for i, cell in enumerate(nb.cells[:10]):  # Primeras 10 celdas
+            if cell.cell_type == 'code':
+                cells_content.append(f"🔧 CELDA {i+1} (Código):\n{cell.source[:200]}...")
+            elif cell.cell_type == 'markdown':
+                cells_content.append(f"📝 CELDA {i+1} (Texto):\n{cell.source[:200]}...")
+        
+        return cells_content
+    except Exception as e:
+        return [f"❌ Error leyendo notebook: {e}"]
+
+def get_real_model_results():
+    """Obtiene resultados REALES de los modelos entrenados"""
+    try:
+        import nbformat
+        # Leer del notebook de la ETAPA 1
+        notebook_path = "../notebooks/1_model_leakage_demo.ipynb"
+        if os.path.exists(notebook_path):
+            with open(notebook_path, 'r', encoding='utf-8') as f:
+                nb = nbformat.read(f, as_version=4)
+            
+            # Buscar celdas con resultados
+            for cell in nb.cells:
+                if cell.cell_type == 'code' and 'AUC' in cell.source and 'Accuracy' in cell.source:
+                    # Extraer resultados (simplificado - en un caso real parsearías la salida)
+                    return [
+                        {"name": "GradientBoosting", "auc": 0.9372, "accuracy": 0.8913, "rank": 1},
+                        {"name": "KNeighbors", "auc": 0.9333, "accuracy": 0.8804, "rank": 2},
+                        {"name": "LogisticRegression", "auc": 0.9320, "accuracy": 0.8859, "rank": 3},
+                        {"name": "RandomForest", "auc": 0.9320, "accuracy": 0.8587, "rank": 4},
+                        {"name": "SVC", "auc": 0.9311, "accuracy": 0.8641, "rank": 5}
+                    ]
+    except:
+        pass
+    
+    # Fallback a resultados conocidos
+    return [
+        {"name": "GradientBoosting", "auc": 0.9372, "accuracy": 0.8913, "rank": 1},
+        {"name": "KNeighbors", "auc": 0.9333, "accuracy": 0.8804, "rank": 2},
+        {"name": "LogisticRegression", "auc": 0.9320, "accuracy": 0.8859, "rank": 3},
+        {"name": "RandomForest", "auc": 0.9320, "accuracy": 0.8587, "rank": 4},
+        {"name": "SVC", "auc": 0.9311, "accuracy": 0.8641, "rank": 5}
+    ]
+
+def get_data_leakage_results():
+    """Obtiene resultados del data leakage demostrado"""
+    try:
+        import nbformat
+        notebook_path = "../notebooks/1_model_leakage_demo.ipynb"
+        if os.path.exists(notebook_path):
+            with open(notebook_path, 'r', encoding='utf-8') as f:
+                nb = nbformat.read(f, as_version=4)
+            
+            # Buscar comparación data leakage
+            for cell in nb.cells:
+                if 'data leakage' in cell.source.lower() or 'leakage' in cell.source.lower():
+                    return {
+                        "with_leakage_auc": 1.0000,
+                        "without_leakage_auc": 0.9311,
+                        "difference": 0.0689,
+                        "impact": "El data leakage infla el AUC en 6.89%"
+                    }
+    except:
+        pass
+    
+    return {
+        "with_leakage_auc": 1.0000,
+        "without_leakage_auc": 0.9311, 
+        "difference": 0.0689,
+        "impact": "El data leakage infla el AUC en 6.89%"
+    }
+
+def get_notebook_summaries():
+    """Obtiene resúmenes de todos los notebooks"""
+    notebooks = {}
+    
+    notebook_files = {
+        "etapa1": "../notebooks/1_model_leakage_demo.ipynb",
+        "etapa2": "../notebooks/2_model_pipeline_cv.ipynb", 
+        "etapa6": "../notebooks/3_data_drift_monitoring.ipynb"
+    }
+    
+    for key, path in notebook_files.items():
+        if os.path.exists(path):
+            cells = read_notebook_cells(path)
+            notebooks[key] = {
+                "name": os.path.basename(path),
+                "cells_preview": cells[:3],  # Primeras 3 celdas
+                "cell_count": len(cells),
+                "file_size": f"{os.path.getsize(path) / 1024:.1f} KB"
+            }
+        else:
+            notebooks[key] = {"error": f"Archivo no encontrado: {path}"}
+    
+    return notebooks
+
+def get_project_files():
+    """Obtiene lista REAL de archivos del proyecto"""
+    project_structure = {}
+    
+    folders = {
+        "notebooks": "../notebooks",
+        "app": "../app", 
+        "docker": "../docker",
+        "k8s": "../k8s",
+        "scripts": "../scripts",
+        "dashboard": ".",
+        "github_actions": "../.github/workflows"
+    }
+    
+    for category, folder in folders.items():
+        if os.path.exists(folder):
+            files = []
+            for item in os.listdir(folder):
+                if not item.startswith('.'):
+                    item_path = os.path.join(folder, item)
+                    if os.path.isfile(item_path):
+                        files.append({
+                            "name": item,
+                            "size": f"{os.path.getsize(item_path) / 1024:.1f} KB",
+                            "type": "file"
+                        })
+                    else:
+                        files.append({
+                            "name": item + "/",
+                            "size": "-",
+                            "type": "folder" 
+                        })
+            project_structure[category] = files
+        else:
+            project_structure[category] = [{"error": f"Carpeta no encontrada: {folder}"}]
+    
+    return project_structure
+
+def check_system_status():
+    """Verifica el estado del sistema"""
+    status = {}
+    
+    # Verificar Docker
+    try:
+        result = subprocess.run(["docker", "version"], capture_output=True, text=True)
+        status["docker"] = result.returncode == 0
+    except:
+        status["docker"] = False
+    
+    # Verificar Kubernetes
+    try:
+        result = subprocess.run(["kubectl", "version", "--client"], capture_output=True, text=True)
+        status["kubernetes"] = result.returncode == 0
+    except:
+        status["kubernetes"] = False
+    
+    # Verificar modelos
+    status["model_simple"] = os.path.exists("../app/model.joblib") and os.path.getsize("../app/model.joblib") > 0
+    status["model_cv"] = os.path.exists("../app/model_cv.joblib") and os.path.getsize("../app/model_cv.joblib") > 0
+    status["dataset"] = os.path.exists("../heart.csv")
+    
+    return status
+
+def load_project_data():
+    """Carga datos COMPLETOS y REALES del proyecto"""
+    try:
+        # Datos del dataset (artefacto en caché compartido con los notebooks; sin pandas)
+        dataset = load_dataset("../heart.csv")
+        raw_columns = dataset.meta["raw_columns"]
+        dataset_info = {
+            "rows": dataset.meta["rows"],
+            "columns": len(raw_columns),
+            "target_distribution": dataset.target_distribution,
+            "numeric_features": [c["name"] for c in raw_columns if c["kind"] == "numeric"],
+            "categorical_features": [c["name"] for c in raw_columns if c["kind"] == "categorical"],
+            "memory_usage": f"{dataset.meta['raw_memory_bytes'] / 1024 / 1024:.2f} MB",
+            "description": "Heart Disease Prediction Dataset"
+        }
+        
+        # Resultados REALES
+        model_results = get_real_model_results()
+        data_leakage = get_data_leakage_results()
+        notebooks = get_notebook_summaries()
+        project_files = get_project_files()
+        system_status = check_system_status()
+        
+        # Cargar modelo para verificar
+        try:
+            import joblib
+            model = joblib.load("../app/model.joblib")
+            model_info = {
+                "type": type(model).__name__,
+                "has_predict": hasattr(model, 'predict'),
+                "has_predict_proba": hasattr(model, 'predict_proba'),
+                "is_pipeline": hasattr(model, 'named_steps')
+            }
+        except:
+            model_info = {"error": "No se pudo cargar el modelo"}
+        
+        # Logros del proyecto
+        achievements = [
+            {"title": "Etapas Completadas", "value": "6/6", "description": "100% del proyecto terminado"},
+            {"title": "Modelos Entrenados", "value": "5", "description": "Algoritmos comparados"},
+            {"title": "Mejor AUC", "value": "0.9372", "description": "GradientBoosting"},
+            {"title": "Data Leakage", "value": "Demostrado", "description": f"AUC +{data_leakage['difference']:.3f}"},
+            {"title": "API Endpoints", "value": "3", "description": "Health, Model Info, Predict"},
+            {"title": "Notebooks", "value": "3", "description": "Análisis completo"}
+        ]
+
+        # Información detallada de etapas
+        project_stages = [
+            {
+                "name": "ETAPA 1", 
+                "status": "✅ COMPLETADA", 
+                "description": "Data Leakage y Múltiples Modelos",
+                "file": "notebooks/1_model_leakage_demo.ipynb",
+                "details": "5 modelos comparados, data leakage demostrado, AUC inflado en 0.0689",
+                "results": "GradientBoosting mejor modelo (AUC: 0.9372)"
+            },
+            {
+                "name": "ETAPA 2", 
+                "status": "✅ COMPLETADA", 
+                "description": "Pipeline con Validación Cruzada",
+                "file": "notebooks/2_model_pipeline_cv.ipynb", 
+                "details": "GridSearchCV, validación 5-fold, métricas múltiples",
+                "results": "Modelo optimizado listo para producción"
+            },
+            {
+                "name": "ETAPA 3", 
+                "status": "✅ COMPLETADA", 
+                "description": "API Flask y Docker",
+                "file": "app/api_flask.py",
+                "details": "API REST con 3 endpoints, contenerización completa",
+                "results": "API funcionando en http://localhost:5000"
+            },
+            {
+                "name": "ETAPA 4", 
+                "status": "✅ COMPLETADA", 
+                "description": "Kubernetes Local", 
+                "file": "k8s/deployment.yaml",
+                "details": "Deployment con 2 réplicas, Service LoadBalancer",
+                "results": "Aplicación desplegada en cluster local"
+            },
+            {
+                "name": "ETAPA 5", 
+                "status": "✅ COMPLETADA", 
+                "description": "GitHub Actions CI/CD",
+                "file": ".github/workflows/ci.yml",
+                "details": "Pipeline automatizado, tests, build Docker",
+                "results": "Integración continua funcionando"
+            },
+            {
+                "name": "ETAPA 6", 
+                "status": "✅ COMPLETADA", 
+                "description": "Monitoreo de Deriva",
+                "file": "notebooks/3_data_drift_monitoring.ipynb", 
+                "details": "Análisis de cambios en datos, detección automática",
+                "results": "Sistema de monitoreo implementado"
+            }
+        ]
+        
+        return {
+            "dataset_info": dataset_info,
+            "model_results": model_results,
+            "data_leakage": data_leakage,
+            "notebooks": notebooks,
+            "project_files": project_files, 
+            "system_status": system_status,
+            "model_info": model_info,
+            "achievements": achievements,
+            "project_stages": project_stages,
+            "project_complete": True
+        }
+        
+    except Exception as e:
+        return {"error": f"Error cargando datos: {e}"}
+
+@app.route('/')
+def index():
+    """Página principal del dashboard"""
+    project_data = load_project_data()
+    return render_template('index.html', **project_data)
+
+@app.route('/api/project-status')
+def api_project_status():
+    """Endpoint para estado del proyecto"""
+    return jsonify(check_system_status())
+
+@app.route('/api/notebooks')
+def api_notebooks():
+    """Endpoint para información de notebooks"""
+    return jsonify(get_notebook_summaries())
+
+@app.route('/api/live/history')
+def api_live_history():
+    """Serie temporal en memoria; step=0 (cada sondeo), 10 o 60 segundos"""
+    live_metrics.start()
+    try:
+        return jsonify({**live_metrics.history(request.args.get("step", 0, type=int)),
+                        "status": live_metrics.status()})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+@app.route('/api/live/stream')
+def api_live_stream():
+    """Server-sent events: el historial al conectar y después cada punto nuevo"""
+    live_metrics.start()
+    subscriber = live_metrics.broadcaster.subscribe()
+    
+    def events():
+        try:
+            yield sse_message("history", live_metrics.history())
+            while True:
+                try:
+                    yield subscriber.get(timeout=15)
+                except queue.Empty:
+                    # Comentario SSE para mantener viva la conexión a través de proxies
+                    yield ": keepalive\n\n"
+        finally:
+            live_metrics.broadcaster.unsubscribe(subscriber)
+    
+    return Response(stream_with_context(events()), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.route('/api/test-prediction')
+def api_test_prediction():
+    """Endpoint para probar una predicción"""
+    try:
+        import joblib
+        model = joblib.load("../app/model.joblib")
+        
+        # Datos de prueba (features después del one-hot encoding)
+        import numpy as np
+        # Ejemplo: [Age, RestingBP, Cholesterol, FastingBS, MaxHR, Oldpeak, Sex_M, ChestPainType_ATA, ...]
+        test_data = np.array([[45, 130, 240, 0, 150, 1.0, 1, 0, 0, 0, 1, 0, 0, 0, 1]])
+        
+        prediction = model.predict(test_data)
+        probability = model.predict_proba(test_data)
+        
+        return jsonify({
+            "prediction": int(prediction[0]),
+            "probability": float(probability[0][1]),
+            "status": "Modelo funcionando correctamente"
+        })
+    except Exception as e:
+        return jsonify({"error": str(e)})
+
+if __name__ == '__main__':
+    os.makedirs('templates', exist_ok=True)
+    print("Dashboard MLOps ejecutándose en: http://localhost:5001")
+    # threaded: cada navegador conectado al stream SSE ocupa un hilo
+    app.run(host='0.0.0.0', port=5001, debug=True, threaded=True)
\ No newline at end of file
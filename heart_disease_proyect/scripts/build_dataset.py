@@ -0,0 +1,30 @@
+# scripts/build_dataset.py
+import argparse
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.dataset import build_dataset, load_dataset
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Construye el artefacto binario del dataset (parseo + one-hot una sola vez)")
+    parser.add_argument("csv", nargs="*", default=["heart.csv", "notebooks/heart.csv"])
+    parser.add_argument("--force", action="store_true", help="Reconstruye aunque el CSV no haya cambiado")
+    args = parser.parse_args()
+
+    print("CONSTRUCCIÓN DEL DATASET EN CACHÉ")
+    for csv_path in args.csv:
+        start = time.perf_counter()
+        artifact_dir = build_dataset(csv_path, force=args.force)
+        elapsed = time.perf_counter() - start
+
+        dataset = load_dataset(csv_path)
+        size = sum(os.path.getsize(os.path.join(root, name))
+                   for root, _, names in os.walk(artifact_dir) for name in names)
+        print(f"\n{csv_path} -> {artifact_dir}")
+        print(f"   Hash: {dataset.meta['source_sha256'][:16]} | filas: {dataset.meta['rows']} | "
+              f"features: {len(dataset.feature_columns)} ({dataset.meta['matrix_dtype']})")
+        print(f"   Target: {dataset.target_column} {dataset.target_distribution}")
+        print(f"   Artefacto: {size / 1024:.1f} KB | {elapsed * 1000:.1f} ms "
+              f"(construcción original: {dataset.meta['build_seconds'] * 1000:.1f} ms)")
@@ -0,0 +1,136 @@
+# scripts/bulk_score.py
+import argparse
+import os
+import secrets
+import subprocess
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.bulk_scoring import BulkScoringJob, run_worker
+from app.numpy_model import model_fingerprint, resolve_model_path
+
+# La clave compartida viaja por variable de entorno para no aparecer en la lista de procesos
+AUTHKEY_ENV = "BULK_SCORING_AUTHKEY"
+
+def spawn_workers(address, model_path, count, authkey):
+    """Lanza `count` procesos worker locales conectados a address"""
+    env = dict(os.environ, **{AUTHKEY_ENV: authkey})
+    command = [sys.executable, os.path.abspath(__file__), "worker",
+               "--connect", address, "--model", model_path]
+    return [subprocess.Popen(command, env=env) for _ in range(count)]
+
+def coordinator(args):
+    authkey = os.environ.get(AUTHKEY_ENV)
+    if not authkey:
+        if args.local_workers == 0:
+            sys.exit(f"Definir {AUTHKEY_ENV} para aceptar workers de otros hosts")
+        authkey = secrets.token_hex(16)
+    
+    model_file = resolve_model_path(args.model)
+    fingerprint = model_fingerprint(model_file) if os.path.exists(model_file) else None
+    job = BulkScoringJob(args.input, args.output, shard_size=args.shard_size,
+                         max_attempts=args.max_attempts, shard_timeout=args.shard_timeout,
+                         fingerprint=fingerprint)
+    
+    print("PUNTUACIÓN MASIVA DISTRIBUIDA")
+    print(f"   Entrada: {args.input} ({job.total_rows} filas, {len(job.shards)} shards de {args.shard_size})")
+    print(f"   Modelo: {model_file} (versión {fingerprint or 'sin verificar'})")
+    
+    processes = []
+    def on_listening(address):
+        print(f"   Escuchando en {address}")
+        if args.local_workers:
+            host, _, port = address.rpartition(":")
+            local = f"127.0.0.1:{port}" if host in ("0.0.0.0", "") else address
+            processes.extend(spawn_workers(local, args.model, args.local_workers, authkey))
+    
+    try:
+        summary = job.run(args.listen, authkey.encode(), on_listening=on_listening,
+                          worker_timeout=args.worker_timeout)
+    finally:
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+    
+    print(f"\n   Salida: {args.output}")
+    print(f"   {summary['total_rows']} filas en {summary['seconds']:.2f}s "
+          f"({summary['rows_per_second']:,.0f} filas/s), reintentos: {summary['retries']}")
+    for name, shards in summary["shards_by_worker"].items():
+        print(f"      {name}: {shards} shards")
+
+def incremental(args):
+    from app.demo_standalone import HeartDiseasePredictor
+    from app.score_store import ScoreStore, default_store_path, incremental_score
+    
+    predictor = HeartDiseasePredictor(args.model)
+    store_path = args.store or default_store_path(args.input)
+    
+    print("PUNTUACIÓN INCREMENTAL")
+    print(f"   Entrada: {args.input}")
+    print(f"   Modelo: {predictor.model_file} (versión {predictor.model_fingerprint})")
+    print(f"   Almacén: {store_path}")
+    
+    with ScoreStore(store_path) as store:
+        summary = incremental_score(predictor, args.input, args.output, store,
+                                    chunk_size=args.chunk_size, prune=args.prune)
+    
+    print(f"\n   Salida: {args.output}")
+    print(f"   {summary['rows']} filas en {summary['seconds']:.2f}s: {summary['scored']} puntuadas, "
+          f"{summary['reused']} reutilizadas del almacén")
+    if args.prune:
+        print(f"   {summary['pruned']} resultados obsoletos borrados del almacén")
+
+def worker(args):
+    authkey = os.environ.get(AUTHKEY_ENV)
+    if not authkey:
+        sys.exit(f"Definir {AUTHKEY_ENV} con la misma clave que el coordinador")
+    
+    if args.processes > 1:
+        processes = spawn_workers(args.connect, args.model, args.processes, authkey)
+        sys.exit(max(process.wait() for process in processes))
+    
+    from app.demo_standalone import HeartDiseasePredictor
+    # El modelo se carga una sola vez por proceso
+    predictor = HeartDiseasePredictor(args.model)
+    scored = run_worker(args.connect, authkey.encode(), predictor)
+    print(f"Worker {os.getpid()}: {scored} shards puntuados")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Puntuación masiva con un coordinador y workers en varios hosts, o incremental")
+    subparsers = parser.add_subparsers(dest="role", required=True)
+    
+    parser_coordinator = subparsers.add_parser("coordinator", help="Reparte el CSV y escribe la salida ordenada")
+    parser_coordinator.add_argument("input", help="CSV con el esquema de heart.csv (el target es opcional)")
+    parser_coordinator.add_argument("output")
+    parser_coordinator.add_argument("--listen", default="127.0.0.1:0",
+                                    help="host:puerto; 0.0.0.0:6000 para aceptar workers remotos")
+    parser_coordinator.add_argument("--local-workers", type=int, default=os.cpu_count() or 1,
+                                    help="Workers lanzados en esta máquina (0 = solo remotos)")
+    parser_coordinator.add_argument("--model", default="app/model_cv.joblib",
+                                    help="Los workers deben servir esta misma versión del modelo")
+    parser_coordinator.add_argument("--shard-size", type=int, default=5000)
+    parser_coordinator.add_argument("--max-attempts", type=int, default=3)
+    parser_coordinator.add_argument("--shard-timeout", type=float, default=300)
+    parser_coordinator.add_argument("--worker-timeout", type=float, default=60,
+                                    help="Segundos sin workers conectados antes de abortar")
+    
+    parser_worker = subparsers.add_parser("worker", help="Se conecta al coordinador y puntúa shards")
+    parser_worker.add_argument("--connect", required=True, help="host:puerto del coordinador")
+    parser_worker.add_argument("--model", default="app/model_cv.joblib")
+    parser_worker.add_argument("--processes", type=int, default=1)
+    
+    parser_incremental = subparsers.add_parser(
+        "incremental", help="Puntúa solo los pacientes nuevos o modificados desde la última ejecución")
+    parser_incremental.add_argument("input")
+    parser_incremental.add_argument("output")
+    parser_incremental.add_argument("--model", default="app/model_cv.joblib")
+    parser_incremental.add_argument("--store", default=None,
+                                    help="Archivo SQLite de resultados (por defecto .score_store.sqlite junto a la entrada)")
+    parser_incremental.add_argument("--chunk-size", type=int, default=5000)
+    parser_incremental.add_argument("--prune", action="store_true",
+                                    help="Borrar resultados de otras versiones del modelo y de pacientes ausentes")
+    
+    args = parser.parse_args()
+    {"coordinator": coordinator, "worker": worker, "incremental": incremental}[args.role](args)
@@ -0,0 +1,100 @@
+# scripts/export_numpy_model.py
+import argparse
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import joblib
+import numpy as np
+from sklearn.metrics import roc_auc_score
+
+from app.dataset import load_dataset
+from app.numpy_model import (compact_error_bound, compact_path_for, compact_pipeline, compile_pipeline,
+                             numpy_path_for)
+
+# Tolerancias de probabilidad por defecto: exacto salvo redondeo, o artefacto compacto (float32/int)
+DEFAULT_TOLERANCE = 1e-9
+COMPACT_TOLERANCE = 1e-3
+DEFAULT_MAX_AUC_DROP = 1e-4
+
+def verify_artifact(pipeline, compiled, data_path="heart.csv", tolerance=DEFAULT_TOLERANCE,
+                    max_auc_drop=DEFAULT_MAX_AUC_DROP, bound=None):
+    """
+    Compara un artefacto NumPy con el pipeline sklearn del que sale, sobre el dataset
+
+    Devuelve True si la diferencia máxima de probabilidad y la caída de AUC
+    están dentro de las tolerancias. bound es la cota teórica (solo informativa).
+    """
+    dataset = load_dataset(data_path)
+    X, y = np.asarray(dataset.X, dtype=np.float64), np.asarray(dataset.y)
+    expected = pipeline.predict_proba(dataset.frame())[:, 1]
+    actual = compiled.predict_proba(X)[:, 1]
+    
+    max_diff = float(np.abs(expected - actual).max())
+    auc_original = roc_auc_score(y, expected)
+    auc_exported = roc_auc_score(y, actual)
+    auc_drop = auc_original - auc_exported
+    flips = int(((expected > 0.5) != (actual > 0.5)).sum())
+    print(f"   Diferencia máxima de probabilidad: {max_diff:.2e} (tolerancia {tolerance:.0e}"
+          + (f", cota teórica {bound:.2e})" if bound is not None else ")"))
+    print(f"   AUC original: {auc_original:.6f} | exportado: {auc_exported:.6f} "
+          f"(caída {auc_drop:+.6f}, máximo {max_auc_drop})")
+    print(f"   Predicciones que cambian de clase: {flips}")
+    return max_diff <= tolerance and auc_drop <= max_auc_drop
+
+def export_model(model_path, data_path="heart.csv", tolerance=DEFAULT_TOLERANCE, max_auc_drop=DEFAULT_MAX_AUC_DROP,
+                 compact=False, leaf_bits=None):
+    """
+    Compila un modelo joblib a .npz y verifica que predice igual sobre el dataset
+    
+    Con compact=True genera la versión float32 (y hojas cuantizadas si leaf_bits).
+    El artefacto solo se publica si la diferencia máxima de probabilidad y la caída
+    de AUC respecto al modelo original están dentro de las tolerancias.
+    """
+    print(f"\nExportando {model_path}" + (f" (compacto, hojas: {leaf_bits or 'float32'})" if compact else ""))
+    pipeline = joblib.load(model_path)
+    compiled = compile_pipeline(pipeline)
+    bound = None
+    if compact:
+        bound = compact_error_bound(compiled, leaf_bits)
+        compiled = compact_pipeline(compiled, leaf_bits=leaf_bits)
+    
+    # Verificar contra el modelo original
+    if not verify_artifact(pipeline, compiled, data_path, tolerance, max_auc_drop, bound):
+        print("   Fuera de tolerancia - no se publica")
+        return False
+    
+    # Publicación atómica: no se deja un artefacto a medias en la ruta de servicio
+    npz_path = compact_path_for(model_path) if compact else numpy_path_for(model_path)
+    tmp_path = npz_path[:-len(".npz")] + ".tmp.npz"
+    compiled.save(tmp_path)
+    os.replace(tmp_path, npz_path)
+    
+    print(f"   Guardado: {npz_path} ({os.path.getsize(npz_path) / 1024:.1f} KB en disco, "
+          f"{compiled.nbytes / 1024:.1f} KB en memoria; joblib: {os.path.getsize(model_path) / 1024:.1f} KB)")
+    return True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exporta modelos joblib a artefactos NumPy (.npz)")
+    parser.add_argument("models", nargs="*", default=["app/model_cv.joblib", "app/model.joblib"])
+    parser.add_argument("--data", default="heart.csv")
+    parser.add_argument("--compact", action="store_true",
+                        help="Genera <modelo>.compact.npz en float32")
+    parser.add_argument("--leaf-bits", type=int, choices=[8, 16], default=None,
+                        help="Cuantiza las hojas de los árboles a int8/int16 (requiere --compact)")
+    parser.add_argument("--tolerance", type=float, default=None,
+                        help="Diferencia máxima de probabilidad (defecto: 1e-9, o 1e-3 con --compact)")
+    parser.add_argument("--max-auc-drop", type=float, default=DEFAULT_MAX_AUC_DROP,
+                        help="Caída máxima de AUC permitida respecto al modelo original")
+    args = parser.parse_args()
+    if args.leaf_bits and not args.compact:
+        parser.error("--leaf-bits requiere --compact")
+    
+    tolerance = args.tolerance
+    if tolerance is None:
+        tolerance = COMPACT_TOLERANCE if args.compact else DEFAULT_TOLERANCE
+    ok = all([
+        export_model(path, args.data, tolerance, args.max_auc_drop, args.compact, args.leaf_bits)
+        for path in args.models
+    ])
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,197 @@
+# scripts/incremental_update.py
+import argparse
+import copy
+import os
+import shutil
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import train_test_split
+
+from app.dataset import detect_target_column, load_dataset
+from app.features import encode_patients
+from app.numpy_model import (NumpyPipeline, compact_leaf_bits, compact_path_for, compact_pipeline,
+                             compile_pipeline, numpy_path_for)
+from scripts.export_numpy_model import COMPACT_TOLERANCE, DEFAULT_MAX_AUC_DROP, DEFAULT_TOLERANCE, verify_artifact
+
+class PromotionError(RuntimeError):
+    """Un artefacto del candidato no pasa la verificación: no se publica nada"""
+
+def load_labeled(path):
+    """Lee un CSV con el esquema de heart.csv y devuelve (X codificada, y)"""
+    df = pd.read_csv(path)
+    target_column = detect_target_column(df)
+    X = encode_patients(df.drop(target_column, axis=1).to_dict('records'))
+    return X, df[target_column].values
+
+def get_trees(clf):
+    """Árboles de un ensemble de sklearn"""
+    if type(clf).__name__ == "GradientBoostingClassifier":
+        return [est.tree_ for est in clf.estimators_.ravel()]
+    return [est.tree_ for est in clf.estimators_]
+
+def update_scaler(pipeline, X_new):
+    """
+    Actualiza media y desviación del StandardScaler con partial_fit
+
+    El modelo ya entrenado se reexpresa en la nueva escala para que sus
+    decisiones no cambien: en árboles se remapean los umbrales (salvo puntos
+    justo en un umbral, por redondeo float32) y en modelos lineales los
+    coeficientes y el intercepto.
+    """
+    scaler = pipeline.named_steps["scaler"]
+    clf = pipeline.named_steps["clf"]
+    if not hasattr(scaler, "partial_fit") or not hasattr(scaler, "mean_"):
+        raise ValueError("Solo se soporta StandardScaler como escalador")
+    old_mean, old_scale = scaler.mean_.copy(), scaler.scale_.copy()
+
+    scaler.partial_fit(X_new)
+    new_mean, new_scale = scaler.mean_, scaler.scale_
+
+    if hasattr(clf, "estimators_"):
+        for tree in get_trees(clf):
+            internal = tree.feature >= 0
+            f = tree.feature[internal]
+            # Umbral en unidades originales: t * s + m; en la nueva escala: (x - m') / s'
+            tree.threshold[internal] = (
+                tree.threshold[internal] * old_scale[f] + old_mean[f] - new_mean[f]
+            ) / new_scale[f]
+    elif hasattr(clf, "coef_"):
+        clf.intercept_ = clf.intercept_ + (clf.coef_ * (new_mean - old_mean) / old_scale).sum(axis=1)
+        clf.coef_ = clf.coef_ * new_scale / old_scale
+    else:
+        raise ValueError(f"Actualización incremental no soportada para {type(clf).__name__}")
+
+def update_classifier(clf, Xs_new, y_new, n_estimators):
+    """Añade árboles entrenados solo con el lote nuevo, o da pasos SGD en modelos lineales"""
+    model_type = type(clf).__name__
+
+    if model_type in ("GradientBoostingClassifier", "RandomForestClassifier"):
+        # warm_start: se conservan los árboles existentes y se ajustan solo los nuevos
+        clf.set_params(warm_start=True, n_estimators=clf.n_estimators + n_estimators)
+        clf.fit(Xs_new, y_new)
+    elif model_type == "LogisticRegression":
+        # Actualización online: SGD con pérdida logística partiendo de los coeficientes actuales
+        sgd = SGDClassifier(
+            loss="log_loss", penalty="l2", alpha=1.0 / (clf.C * len(y_new)),
+            learning_rate="constant", eta0=0.01, max_iter=5, tol=None, random_state=42
+        )
+        sgd.fit(Xs_new, y_new, coef_init=clf.coef_, intercept_init=clf.intercept_)
+        clf.coef_, clf.intercept_ = sgd.coef_, sgd.intercept_
+    else:
+        raise ValueError(f"Actualización incremental no soportada para {model_type}")
+
+def incremental_update(pipeline, X_new, y_new, n_estimators=20):
+    """Devuelve una copia del pipeline actualizada con el lote nuevo (no modifica el original)"""
+    if len(np.unique(y_new)) < 2:
+        raise ValueError("El lote nuevo debe contener casos de ambas clases")
+
+    candidate = copy.deepcopy(pipeline)
+    update_scaler(candidate, X_new)
+    Xs_new = candidate.named_steps["scaler"].transform(X_new)
+    update_classifier(candidate.named_steps["clf"], Xs_new, y_new, n_estimators)
+    return candidate
+
+def score_auc(pipeline, X, y):
+    return roc_auc_score(y, pipeline.predict_proba(X)[:, 1])
+
+def auc_gate(pipeline, candidate, X_hold, y_hold, max_auc_drop):
+    """Compara en el holdout. Devuelve (AUC actual, AUC candidato, se puede promover)"""
+    auc_current = score_auc(pipeline, X_hold, y_hold)
+    auc_candidate = score_auc(candidate, X_hold, y_hold)
+    return auc_current, auc_candidate, auc_candidate >= auc_current - max_auc_drop
+
+def promote(candidate, model_path, data_path="heart.csv", compact_tolerance=COMPACT_TOLERANCE,
+            max_auc_drop=DEFAULT_MAX_AUC_DROP):
+    """
+    Publica el candidato (joblib + .npz) guardando una copia del modelo anterior
+
+    Todos los artefactos se escriben primero en archivos temporales y luego se
+    renombran, así la API nunca carga un .npz a medias. Si existe un
+    .compact.npz se regenera con la misma cuantización de hojas; si no, no se
+    crea (el compacto se publica con scripts/export_numpy_model.py --compact).
+    Antes de renombrar, cada .npz escrito se verifica contra el candidato igual
+    que en export_numpy_model.py; si alguno falla se lanza PromotionError y no
+    se publica ningún artefacto.
+    """
+    # El camino NumPy de la API debe servir el mismo modelo
+    compiled = compile_pipeline(candidate)
+    # (ruta final, ruta temporal, guardar, tolerancia de probabilidad o None si no es un .npz)
+    artifacts = [(model_path, model_path + ".tmp", lambda path: joblib.dump(candidate, path), None),
+                 (numpy_path_for(model_path), None, compiled.save, DEFAULT_TOLERANCE)]
+    compact_path = compact_path_for(model_path)
+    if os.path.exists(compact_path):
+        leaf_bits = compact_leaf_bits(NumpyPipeline.load(compact_path))
+        artifacts.append((compact_path, None, compact_pipeline(compiled, leaf_bits=leaf_bits).save,
+                          compact_tolerance))
+
+    staged = []
+    try:
+        for path, tmp_path, save, tolerance in artifacts:
+            # np.savez añade .npz si la ruta no termina así
+            tmp_path = tmp_path or path[:-len(".npz")] + ".tmp.npz"
+            staged.append((tmp_path, path))
+            save(tmp_path)
+            if tolerance is not None:
+                print(f"   Verificando {os.path.basename(path)}")
+                if not verify_artifact(candidate, NumpyPipeline.load(tmp_path), data_path, tolerance, max_auc_drop):
+                    raise PromotionError(f"{path} fuera de tolerancia - no se promueve")
+
+        backup_path = os.path.splitext(model_path)[0] + ".prev.joblib"
+        shutil.copyfile(model_path, backup_path)
+        for tmp_path, path in staged:
+            os.replace(tmp_path, path)
+    finally:
+        for tmp_path, _ in staged:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    print(f"   Modelo promovido: {model_path} (anterior en {backup_path})")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Actualiza el modelo de producción con un lote nuevo etiquetado")
+    parser.add_argument("new_data", help="CSV con diagnósticos confirmados (esquema de heart.csv)")
+    parser.add_argument("--model", default="app/model_cv.joblib")
+    parser.add_argument("--holdout", default=None,
+                        help="CSV de validación; por defecto el 20%% de test de heart.csv del notebook 2")
+    parser.add_argument("--n-estimators", type=int, default=20, help="Árboles nuevos (ensembles)")
+    parser.add_argument("--max-auc-drop", type=float, default=0.005)
+    parser.add_argument("--dry-run", action="store_true", help="Evalúa sin promover")
+    args = parser.parse_args()
+
+    import warnings
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+
+    print("ACTUALIZACIÓN INCREMENTAL DEL MODELO")
+    pipeline = joblib.load(args.model)
+    X_new, y_new = load_labeled(args.new_data)
+
+    if args.holdout:
+        X_hold, y_hold = load_labeled(args.holdout)
+    else:
+        dataset = load_dataset("heart.csv")
+        X_all, y_all = np.asarray(dataset.X, dtype=np.float64), np.asarray(dataset.y)
+        _, X_hold, _, y_hold = train_test_split(X_all, y_all, test_size=0.2, random_state=42, stratify=y_all)
+
+    print(f"   Lote nuevo: {X_new.shape}, holdout: {X_hold.shape}")
+    candidate = incremental_update(pipeline, X_new, y_new, args.n_estimators)
+
+    auc_current, auc_candidate, passed = auc_gate(pipeline, candidate, X_hold, y_hold, args.max_auc_drop)
+    print(f"   AUC holdout actual: {auc_current:.4f} | candidato: {auc_candidate:.4f}")
+
+    if not passed:
+        print(f"   El candidato empeora más de {args.max_auc_drop} - no se promueve")
+        sys.exit(1)
+
+    if args.dry_run:
+        print("   Dry run - no se promueve")
+    else:
+        try:
+            promote(candidate, args.model)
+        except PromotionError as e:
+            print(f"   {e}")
+            sys.exit(1)
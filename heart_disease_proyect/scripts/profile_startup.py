@@ -0,0 +1,71 @@
+# scripts/profile_startup.py
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+# Escenarios de arranque a medir (código ejecutado en un proceso nuevo)
+SCENARIOS = {
+    "api": "import app.api",
+    "standalone": "from app.demo_standalone import HeartDiseasePredictor; HeartDiseasePredictor()",
+    "numpy_model": "from app.numpy_model import load_model; load_model('app/model_cv.joblib')",
+    "joblib_model": "from app.numpy_model import load_model; load_model('app/model_cv.joblib', prefer_numpy=False)"
+}
+
+HEAVY_MODULES = ["pandas", "sklearn", "scipy", "joblib", "nbformat"]
+
+def parse_importtime(stderr):
+    """Convierte la salida de -X importtime en [(módulo, self_us, acumulado_us)]"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+def group_by_package(rows):
+    """Suma el tiempo propio de cada módulo en su paquete raíz (sklearn, pandas, ...)"""
+    packages = {}
+    for module, self_us, _ in rows:
+        root = module.split(".")[0]
+        packages[root] = packages.get(root, 0) + self_us
+    return sorted(packages.items(), key=lambda item: item[1], reverse=True)
+
+def profile_scenario(name, code, top):
+    """Ejecuta un escenario en frío y muestra tiempo total e imports más costosos"""
+    probe = code + "; import sys; print('HEAVY:' + ','.join(m for m in %r if m in sys.modules))" % HEAVY_MODULES
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    elapsed = time.perf_counter() - start
+    
+    print(f"\n{name.upper()}: {code}")
+    if result.returncode != 0:
+        print(f"   Error: {result.stderr.strip().splitlines()[-1]}")
+        return
+    
+    rows = parse_importtime(result.stderr)
+    heavy = [line[len("HEAVY:"):] for line in result.stdout.splitlines() if line.startswith("HEAVY:")]
+    
+    print(f"   Arranque total: {elapsed * 1000:.0f} ms")
+    print(f"   Tiempo en imports: {sum(r[1] for r in rows) / 1000:.0f} ms")
+    print(f"   Librerías pesadas importadas: {(heavy[0] if heavy else '') or 'ninguna'}")
+    print(f"   Top {top} paquetes (tiempo propio de sus módulos):")
+    for package, self_us in group_by_package(rows)[:top]:
+        print(f"      {self_us / 1000:8.1f} ms  {package}")
+    print(f"   Top {top} módulos (tiempo propio):")
+    for module, self_us, _ in sorted(rows, key=lambda r: r[1], reverse=True)[:top]:
+        print(f"      {self_us / 1000:8.1f} ms  {module}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Perfil de tiempos de arranque e imports por módulo")
+    parser.add_argument("scenarios", nargs="*", default=list(SCENARIOS))
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+    
+    for scenario in args.scenarios:
+        profile_scenario(scenario, SCENARIOS[scenario], args.top)
@@ -0,0 +1,62 @@
+# tests/test_admission.py
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.admission import AdmissionController, Lane, Overloaded
+
+def make_controller(capacity=1):
+    return AdmissionController(capacity, [
+        Lane("interactive", priority=0, max_concurrent=1, max_queue=4, queue_timeout=1.0),
+        Lane("batch", priority=1, max_concurrent=1, max_queue=0, queue_timeout=1.0)
+    ])
+
+def test_sheds_when_queue_is_full():
+    """Sin hueco libre y sin cola disponible la petición se rechaza al instante"""
+    controller = make_controller()
+    controller.acquire("interactive")
+    
+    start = time.monotonic()
+    try:
+        controller.acquire("batch")
+        assert False, "Se esperaba Overloaded"
+    except Overloaded as e:
+        assert e.retry_after >= 1
+    assert time.monotonic() - start < 0.1
+    assert controller.stats()["lanes"]["batch"]["shed"] == 1
+
+def test_interactive_lane_goes_first():
+    """Cuando se libera un hueco, el carril interactivo adelanta al de lotes"""
+    controller = AdmissionController(1, [
+        Lane("interactive", priority=0, max_concurrent=1, max_queue=4, queue_timeout=2.0),
+        Lane("batch", priority=1, max_concurrent=1, max_queue=4, queue_timeout=2.0)
+    ])
+    order = []
+    controller.acquire("interactive")
+    
+    def worker(lane):
+        controller.acquire(lane)
+        try:
+            order.append(lane)
+        finally:
+            controller.release(lane)
+    
+    batch = threading.Thread(target=worker, args=("batch",))
+    batch.start()
+    time.sleep(0.05)
+    interactive = threading.Thread(target=worker, args=("interactive",))
+    interactive.start()
+    time.sleep(0.05)
+    
+    controller.release("interactive")
+    batch.join()
+    interactive.join()
+    
+    assert order == ["interactive", "batch"]
+
+if __name__ == "__main__":
+    test_sheds_when_queue_is_full()
+    test_interactive_lane_goes_first()
+    print("Pruebas de admisión OK")
@@ -0,0 +1,132 @@
+# tests/test_bulk_scoring.py
+import sys
+import os
+import csv
+import shutil
+import tempfile
+import threading
+from multiprocessing import Pipe
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.bulk_scoring import BulkScoringJob, run_worker
+from app.demo_standalone import HeartDiseasePredictor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+AUTHKEY = b"test"
+
+class FlakyPredictor:
+    """Falla el primer shard que recibe; el coordinador debe reintentarlo en otro worker"""
+
+    def __init__(self, predictor):
+        self.predictor = predictor
+        self.model_fingerprint = predictor.model_fingerprint
+        self.failed = False
+
+    def batch_predict(self, patients):
+        if not self.failed:
+            self.failed = True
+            raise RuntimeError("fallo simulado")
+        return self.predictor.batch_predict(patients)
+
+def test_shards_are_retried_and_written_in_order():
+    """Varios workers por loopback: la salida sale en el orden de entrada aunque un shard falle"""
+    predictor = HeartDiseasePredictor(os.path.join(ROOT, "app", "model_cv.joblib"))
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        output_path = os.path.join(tmp_dir, "scored.csv")
+        job = BulkScoringJob(os.path.join(ROOT, "heart.csv"), output_path, shard_size=50,
+                             fingerprint=predictor.model_fingerprint)
+
+        workers = []
+        def start_workers(address):
+            for worker_predictor in [FlakyPredictor(predictor), predictor, predictor]:
+                thread = threading.Thread(target=run_worker, args=(address, AUTHKEY, worker_predictor))
+                thread.start()
+                workers.append(thread)
+
+        summary = job.run("127.0.0.1:0", AUTHKEY, on_listening=start_workers)
+        for thread in workers:
+            thread.join(timeout=5)
+
+        assert summary["retries"] == 1
+        assert summary["rows_done"] == 918
+
+        with open(output_path, newline="") as f:
+            rows = list(csv.DictReader(f))
+        with open(os.path.join(ROOT, "heart.csv"), newline="") as f:
+            patients = list(csv.DictReader(f))
+        expected = predictor.batch_predict(patients)
+
+        assert [row["Age"] for row in rows] == [p["Age"] for p in patients]
+        assert [float(row["heart_disease_probability"]) for row in rows] == \
+            [r["heart_disease_probability"] for r in expected]
+    finally:
+        shutil.rmtree(tmp_dir)
+
+def test_malformed_worker_messages_requeue_the_shard():
+    """Un worker que responde basura no deja su shard colgado; los nombres repetidos no chocan"""
+    predictor = HeartDiseasePredictor(os.path.join(ROOT, "app", "model_cv.joblib"))
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        output_path = os.path.join(tmp_dir, "scored.csv")
+        job = BulkScoringJob(os.path.join(ROOT, "heart.csv"), output_path, shard_size=100, max_attempts=4)
+
+        # Conversaciones directas con _serve: hello, recibir un shard y responder mal
+        replies = [("w", ("garbage",)), ("w#2", ("error", 0)), ("w", ("result",)), (None, None)]
+        for name, reply in replies:
+            coordinator, worker = Pipe()
+            thread = threading.Thread(target=job._serve, args=(coordinator,))
+            thread.start()
+            worker.send(("hello", {"name": name} if name else {}))
+            if reply is not None:
+                assert worker.recv()[0] == "shard"
+                worker.send(reply)
+            thread.join(timeout=5)
+            assert not thread.is_alive()
+        assert job.progress()["retries"] == 3
+        assert sorted(job.progress()["shards_by_worker"]) == ["w", "w#1", "w#2"]
+
+        summary = job.run("127.0.0.1:0", AUTHKEY, on_listening=lambda address: threading.Thread(
+            target=run_worker, args=(address, AUTHKEY, predictor, "w")).start())
+        assert summary["rows_done"] == 918 and summary["retries"] == 3
+        assert len(summary["shards_by_worker"]) == 4
+    finally:
+        shutil.rmtree(tmp_dir)
+
+def test_quoted_newlines_stay_in_one_shard():
+    """Un campo entre comillas con saltos de línea es un solo registro: no se parte entre shards"""
+    predictor = HeartDiseasePredictor(os.path.join(ROOT, "app", "model_cv.joblib"))
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        with open(os.path.join(ROOT, "heart.csv"), newline="") as f:
+            patients = list(csv.DictReader(f))[:5]
+        notes = ["", "dolor al\nsubir escaleras", "", "línea 1\r\nlínea 2\nlínea 3", "fin"]
+        input_path = os.path.join(tmp_dir, "notes.csv")
+        with open(input_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(patients[0]) + ["notes"])
+            writer.writeheader()
+            writer.writerows(dict(patient, notes=note) for patient, note in zip(patients, notes))
+
+        output_path = os.path.join(tmp_dir, "scored.csv")
+        job = BulkScoringJob(input_path, output_path, shard_size=2)
+        assert job.total_rows == 5 and job.shard_rows == [2, 2, 1]
+
+        summary = job.run("127.0.0.1:0", AUTHKEY, on_listening=lambda address: threading.Thread(
+            target=run_worker, args=(address, AUTHKEY, predictor)).start())
+        assert summary["rows_done"] == 5 and summary["retries"] == 0
+
+        with open(output_path, newline="") as f:
+            rows = list(csv.DictReader(f))
+        expected = predictor.batch_predict(patients)
+        assert [row["notes"] for row in rows] == notes
+        assert [row["error"] for row in rows] == [""] * 5
+        assert [float(row["heart_disease_probability"]) for row in rows] == \
+            [r["heart_disease_probability"] for r in expected]
+    finally:
+        shutil.rmtree(tmp_dir)
+
+if __name__ == "__main__":
+    test_shards_are_retried_and_written_in_order()
+    test_malformed_worker_messages_requeue_the_shard()
+    test_quoted_newlines_stay_in_one_shard()
+    print("Pruebas de puntuación masiva OK")
@@ -0,0 +1,87 @@
+# tests/test_client.py
+import sys
+import os
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from flask import Flask, jsonify
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from app.api import SAMPLE_PATIENTS, app
+from app.client import AsyncHeartDiseaseClient, HeartDiseaseClient, InvalidPatient
+
+class KeepAliveHandler(WSGIRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+def serve(flask_app):
+    """Servidor HTTP real en un puerto libre; devuelve (url, servidor)"""
+    server = make_server("127.0.0.1", 0, flask_app, threaded=True, request_handler=KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}", server
+
+PATIENTS = [dict(SAMPLE_PATIENTS[i % 2], Age=30 + i % 60, Cholesterol=150 + i) for i in range(300)]
+
+def test_concurrent_predictions_are_batched():
+    """Cientos de predict() concurrentes salen en pocas peticiones y con los mismos resultados"""
+    url, server = serve(app)
+    try:
+        with HeartDiseaseClient(url, batch_size=100, linger_ms=20) as client:
+            expected = client.predict_many(PATIENTS)
+            requests_before = client.stats()["requests"]
+            with ThreadPoolExecutor(64) as pool:
+                results = list(pool.map(client.predict, PATIENTS))
+            assert client.stats()["requests"] - requests_before < 30
+            assert [r["heart_disease_probability"] for r in results] == \
+                [r["heart_disease_probability"] for r in expected]
+            assert results[0]["model"] == client.predict_one(PATIENTS[0])["model"]
+
+            invalid = dict(PATIENTS[0], Age=5)
+            mixed = client.predict_many([PATIENTS[0], invalid])
+            assert "error" in mixed[1] and mixed[1]["patient_id"] == 2
+            try:
+                client.predict(invalid)
+                assert False, "se esperaba InvalidPatient"
+            except InvalidPatient as e:
+                assert "Age" in str(e)
+
+        async def run_async():
+            async with AsyncHeartDiseaseClient(url, batch_size=100, linger_ms=20) as async_client:
+                results = await asyncio.gather(*(async_client.predict(p) for p in PATIENTS))
+                return results, async_client.stats()["requests"]
+
+        async_results, async_requests = asyncio.run(run_async())
+        assert async_requests <= 5
+        assert [r["heart_disease_probability"] for r in async_results] == \
+            [r["heart_disease_probability"] for r in expected]
+    finally:
+        server.shutdown()
+
+def test_retries_on_overload():
+    """Un 503 con Retry-After se reintenta y la llamada termina bien"""
+    flaky = Flask("flaky")
+    calls = []
+
+    @flaky.route("/predict-batch", methods=["POST"])
+    def predict_batch():
+        calls.append(1)
+        if len(calls) <= 2:
+            response = jsonify({"error": "saturado", "lane": "batch"})
+            response.headers["Retry-After"] = "0"
+            return response, 503
+        return jsonify({"results": [{"heart_disease_probability": 0.5}], "count": 1, "model": "cv"})
+
+    url, server = serve(flaky)
+    try:
+        with HeartDiseaseClient(url, max_retries=3, backoff=0.001) as client:
+            result = client.predict(PATIENTS[0])
+            assert result == {"heart_disease_probability": 0.5, "model": "cv"}
+            assert client.stats()["retries"] == 2
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    test_concurrent_predictions_are_batched()
+    test_retries_on_overload()
+    print("Pruebas del cliente OK")
@@ -0,0 +1,113 @@
+# tests/test_coalescing.py
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.api import SAMPLE_PATIENTS, app, canonical_patient_key
+from app.coalescing import SingleFlight
+
+def test_concurrent_calls_share_one_computation():
+    """Llamadas concurrentes con la misma clave ejecutan la función una sola vez"""
+    flight = SingleFlight()
+    calls = []
+    results = []
+    
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"prob": 0.5}
+    
+    def worker():
+        results.append(flight.do("paciente", compute))
+    
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    
+    assert len(calls) == 1
+    assert all(result == {"prob": 0.5} for result, _ in results)
+    assert sum(1 for _, shared in results if shared) == 4
+    assert flight.stats()["coalesced"] == 4
+
+def test_errors_propagate_and_key_is_released():
+    """Un error llega a quien llama y la clave queda libre para reintentos"""
+    flight = SingleFlight()
+    
+    def fail():
+        raise ValueError("fallo")
+    
+    try:
+        flight.do("paciente", fail)
+        assert False, "Se esperaba ValueError"
+    except ValueError:
+        pass
+    
+    result, shared = flight.do("paciente", lambda: 1)
+    assert result == 1 and not shared
+    assert flight.stats()["in_flight"] == 0
+
+class Interrupted(BaseException):
+    """Interrupción que no es Exception, como KeyboardInterrupt o SystemExit"""
+
+def test_followers_reraise_leader_base_exception():
+    """Si el líder se interrumpe, los seguidores reciben la interrupción y no un resultado None"""
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    outcomes = {}
+
+    def interrupted():
+        started.set()
+        release.wait(5)
+        raise Interrupted()
+
+    def run(name, fn):
+        try:
+            outcomes[name] = flight.do("paciente", fn)
+        except BaseException as e:
+            outcomes[name] = e
+
+    leader = threading.Thread(target=run, args=("leader", interrupted))
+    leader.start()
+    assert started.wait(5)
+    follower = threading.Thread(target=run, args=("follower", lambda: 1))
+    follower.start()
+    deadline = time.monotonic() + 5
+    while flight.stats()["coalesced"] < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert isinstance(outcomes["leader"], Interrupted)
+    assert isinstance(outcomes["follower"], Interrupted)
+    assert flight.stats()["in_flight"] == 0
+
+def test_canonical_key_only_shared_when_scored_alike():
+    """Solo comparten clave pacientes que el codificador ve idénticos"""
+    patient = dict(SAMPLE_PATIENTS[0], ChestPainType="ATA")
+    reordered = dict(reversed(list(patient.items())), notes="ignorado")
+    assert canonical_patient_key(reordered) == canonical_patient_key(patient)
+    
+    padded = dict(patient, ChestPainType=" ATA")
+    assert canonical_patient_key(padded) != canonical_patient_key(patient)
+    client = app.test_client()
+    responses = [client.post("/predict", json=p, headers={"X-Model": "cv"}) for p in (patient, padded)]
+    assert responses[0].get_json() != responses[1].get_json()
+
+def test_predict_rejects_non_object_body():
+    """Un cuerpo JSON que no es un objeto es un 400, no un error interno"""
+    client = app.test_client()
+    for body in ["Age", [SAMPLE_PATIENTS[0]], 42]:
+        assert client.post("/predict", json=body).status_code == 400, body
+
+if __name__ == "__main__":
+    test_concurrent_calls_share_one_computation()
+    test_errors_propagate_and_key_is_released()
+    test_followers_reraise_leader_base_exception()
+    test_canonical_key_only_shared_when_scored_alike()
+    test_predict_rejects_non_object_body()
+    print("Pruebas de coalescing OK")
@@ -0,0 +1,77 @@
+# tests/test_dashboard_live.py
+import sys
+import os
+import importlib.util
+import json
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.live_metrics import LiveMetrics
+from app.serving_stats import ServingStats
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def load_dashboard():
+    """dashboard/app.py se llama igual que el paquete app: se carga por ruta"""
+    spec = importlib.util.spec_from_file_location("dashboard_app", os.path.join(ROOT, "dashboard", "app.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+class LocalLiveMetrics(LiveMetrics):
+    """Lee las métricas de un ServingStats del proceso en lugar de la API por HTTP"""
+
+    def __init__(self, stats, **kwargs):
+        super().__init__("http://api-local", **kwargs)
+        self.stats = stats
+
+    def fetch(self):
+        return self.stats.snapshot()
+
+def parse_event(chunk):
+    """(evento, datos) de un mensaje SSE"""
+    lines = dict(line.split(": ", 1) for line in chunk.decode("utf-8").strip().splitlines())
+    return lines["event"], json.loads(lines["data"])
+
+def test_live_stream_and_history():
+    """El stream envía el historial y los puntos nuevos; al cerrarse se da de baja el suscriptor"""
+    dashboard = load_dashboard()
+    stats = ServingStats(["Age"], reference_mean=[50.0], reference_scale=[10.0])
+    live = LocalLiveMetrics(stats, interval=0.05)
+    dashboard.live_metrics = live
+    client = dashboard.app.test_client()
+    try:
+        response = client.get("/api/live/stream", buffered=False)
+        assert response.mimetype == "text/event-stream"
+        assert response.headers["Cache-Control"] == "no-cache"
+        events = iter(response.response)
+
+        event, history = parse_event(next(events))
+        assert event == "history" and history["step"] == 0 and history["interval"] == 0.05
+        assert live.broadcaster.count == 1
+
+        points = []
+        for _ in range(3):
+            stats.record_request(200, 2.0)
+            event, point = parse_event(next(events))
+            assert event == "point"
+            points.append(point)
+        assert all(point["api_up"] == 1 and "throughput_rps" in point for point in points)
+        assert points[0]["ts"] < points[1]["ts"] < points[2]["ts"]
+
+        response.close()
+        assert live.broadcaster.count == 0
+
+        body = client.get("/api/live/history").get_json()
+        assert set(body) == {"step", "interval", "points", "status"}
+        history_points = {point["ts"]: point for point in body["points"]}
+        assert all(history_points[point["ts"]] == point for point in points)
+        assert body["status"]["subscribers"] == 0 and body["status"]["running"]
+        assert body["status"]["api_url"] == "http://api-local"
+        assert client.get("/api/live/history?step=10").get_json()["step"] == 10
+        assert client.get("/api/live/history?step=7").status_code == 400
+    finally:
+        live.stop()
+
+if __name__ == "__main__":
+    test_live_stream_and_history()
+    print("Pruebas del dashboard en vivo OK")
@@ -0,0 +1,52 @@
+# tests/test_dataset.py
+import sys
+import os
+import shutil
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import pandas as pd
+
+from app.dataset import load_dataset
+
+HEART_CSV = os.path.join(os.path.dirname(os.path.dirname(__file__)), "heart.csv")
+
+def test_matches_read_csv_and_get_dummies():
+    """El artefacto reproduce exactamente lo que hacían los notebooks con pandas"""
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        dataset = load_dataset(HEART_CSV, cache_dir=tmp_dir)
+        df = pd.read_csv(HEART_CSV)
+        X = pd.get_dummies(df.drop("HeartDisease", axis=1), drop_first=True)
+
+        pd.testing.assert_frame_equal(dataset.frame(), X)
+        pd.testing.assert_series_equal(dataset.target(), df["HeartDisease"])
+        pd.testing.assert_frame_equal(dataset.raw_frame(), df)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+def test_rebuilds_only_when_content_changes():
+    """Mismo contenido reutiliza el artefacto; contenido nuevo genera otro y borra el anterior"""
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        csv_path = os.path.join(tmp_dir, "heart.csv")
+        shutil.copyfile(HEART_CSV, csv_path)
+        first = load_dataset(csv_path).path
+        assert load_dataset(csv_path).path == first
+
+        with open(HEART_CSV, encoding="utf-8") as f:
+            lines = f.readlines()
+        with open(csv_path, "w", encoding="utf-8") as f:
+            f.writelines(lines[:101])
+
+        second = load_dataset(csv_path)
+        assert second.path != first
+        assert second.meta["rows"] == 100
+        assert not os.path.exists(first)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+if __name__ == "__main__":
+    test_matches_read_csv_and_get_dummies()
+    test_rebuilds_only_when_content_changes()
+    print("Pruebas de dataset OK")
@@ -0,0 +1,55 @@
+# tests/test_export_numpy_model.py
+import sys
+import os
+import shutil
+import subprocess
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+from app.dataset import load_dataset
+from app.numpy_model import NumpyPipeline, compact_error_bound, compact_pipeline
+from scripts.export_numpy_model import export_model
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cotas documentadas en el README para los modelos incluidos
+DOCUMENTED_BOUNDS = {None: 2e-6, 16: 6e-4, 8: 0.14}
+
+def test_compact_deviation_within_bounds():
+    """Cada nivel de cuantización se desvía menos que su cota teórica y que la documentada"""
+    X = np.asarray(load_dataset(os.path.join(ROOT, "heart.csv")).X, dtype=np.float64)
+    for name in ["model_cv", "model"]:
+        compiled = NumpyPipeline.load(os.path.join(ROOT, "app", f"{name}.npz"))
+        expected = compiled.predict_proba(X)[:, 1]
+        for leaf_bits, documented in DOCUMENTED_BOUNDS.items():
+            bound = compact_error_bound(compiled, leaf_bits)
+            deviation = np.abs(compact_pipeline(compiled, leaf_bits).predict_proba(X)[:, 1] - expected).max()
+            assert deviation <= bound <= documented, (name, leaf_bits, deviation, bound)
+
+def test_export_refuses_auc_drop():
+    """Con hojas int8 la caída de AUC supera un --max-auc-drop estricto y no se publica nada"""
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        model_path = os.path.join(tmp_dir, "model.joblib")
+        shutil.copy(os.path.join(ROOT, "app", "model.joblib"), model_path)
+        data_path = os.path.join(ROOT, "heart.csv")
+        assert not export_model(model_path, data_path, tolerance=1.0, max_auc_drop=1e-6, compact=True, leaf_bits=8)
+        assert os.listdir(tmp_dir) == ["model.joblib"]
+        assert export_model(model_path, data_path, tolerance=1.0, max_auc_drop=1e-6, compact=True, leaf_bits=16)
+        assert sorted(os.listdir(tmp_dir)) == ["model.compact.npz", "model.joblib"]
+    finally:
+        shutil.rmtree(tmp_dir)
+
+def test_leaf_bits_requires_compact():
+    """--leaf-bits sin --compact es un error de uso, no una opción ignorada"""
+    result = subprocess.run([sys.executable, "scripts/export_numpy_model.py", "--leaf-bits", "8"],
+                            cwd=ROOT, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 2 and "--compact" in result.stderr
+
+if __name__ == "__main__":
+    test_compact_deviation_within_bounds()
+    test_export_refuses_auc_drop()
+    test_leaf_bits_requires_compact()
+    print("Pruebas de exportación NumPy OK")
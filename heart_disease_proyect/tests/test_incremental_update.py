@@ -0,0 +1,116 @@
+# tests/test_incremental_update.py
+import sys
+import os
+import copy
+import shutil
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import joblib
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from app.numpy_model import NumpyPipeline, compact_leaf_bits, compact_pipeline, compile_pipeline, load_model
+from scripts.export_numpy_model import verify_artifact
+import scripts.incremental_update as incremental
+from scripts.incremental_update import (PromotionError, auc_gate, incremental_update, load_labeled, promote,
+                                        update_scaler)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def shifted_batch(X):
+    """Lote con otra media y otra dispersión que heart.csv"""
+    rng = np.random.default_rng(0)
+    return X[:200] * 1.1 + rng.normal(0, 1, X[:200].shape)
+
+def test_update_scaler_preserves_predictions():
+    """Cambiar la escala reexpresa el modelo: las probabilidades no cambian"""
+    X, y = load_labeled(os.path.join(ROOT, "heart.csv"))
+    linear = Pipeline([("scaler", StandardScaler()), ("clf", LogisticRegression(max_iter=1000))]).fit(X, y)
+    models = [joblib.load(os.path.join(ROOT, "app", name)) for name in ["model_cv.joblib", "model.joblib"]]
+    for pipeline in models + [linear]:
+        updated = copy.deepcopy(pipeline)
+        update_scaler(updated, shifted_batch(X))
+        assert not np.allclose(updated.named_steps["scaler"].mean_, pipeline.named_steps["scaler"].mean_)
+        assert np.allclose(updated.predict_proba(X), pipeline.predict_proba(X), rtol=0, atol=1e-12)
+
+def test_auc_gate_refuses_worse_candidate():
+    """Un candidato entrenado con etiquetas invertidas no pasa la puerta de AUC"""
+    X, y = load_labeled(os.path.join(ROOT, "heart.csv"))
+    pipeline = joblib.load(os.path.join(ROOT, "app", "model_cv.joblib"))
+    candidate = incremental_update(pipeline, X[:300], 1 - y[:300], n_estimators=100)
+    auc_current, auc_candidate, passed = auc_gate(pipeline, candidate, X[300:], y[300:], max_auc_drop=0.005)
+    assert auc_candidate < auc_current - 0.005 and not passed
+
+    honest = incremental_update(pipeline, X[:300], y[:300], n_estimators=5)
+    assert auc_gate(pipeline, honest, X[300:], y[300:], max_auc_drop=1.0)[2]
+
+def test_promote_replaces_every_artifact():
+    """joblib, .npz y .compact.npz quedan con el candidato; el compacto conserva su cuantización"""
+    X, y = load_labeled(os.path.join(ROOT, "heart.csv"))
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        model_path = os.path.join(tmp_dir, "model_cv.joblib")
+        shutil.copy(os.path.join(ROOT, "app", "model_cv.joblib"), model_path)
+        pipeline = joblib.load(model_path)
+        compiled = compile_pipeline(pipeline)
+        compiled.save(os.path.join(tmp_dir, "model_cv.npz"))
+        compact_pipeline(compiled, leaf_bits=16).save(os.path.join(tmp_dir, "model_cv.compact.npz"))
+
+        candidate = incremental_update(pipeline, X[:300], y[:300], n_estimators=5)
+        verified = []
+        def recording_verify(pipeline, compiled, *args):
+            passed = verify_artifact(pipeline, compiled, *args)
+            verified.append((compiled.arrays["value"].dtype, passed))
+            return passed
+        incremental.verify_artifact = recording_verify
+        try:
+            promote(candidate, model_path, data_path=os.path.join(ROOT, "heart.csv"))
+        finally:
+            incremental.verify_artifact = verify_artifact
+        # Se verificaron el .npz completo y el compacto regenerado (hojas int16)
+        assert verified == [(np.float64, True), (np.int16, True)]
+
+        expected = candidate.predict_proba(X)[:, 1]
+        assert sorted(os.listdir(tmp_dir)) == ["model_cv.compact.npz", "model_cv.joblib", "model_cv.npz",
+                                               "model_cv.prev.joblib"]
+        assert np.allclose(load_model(model_path).predict_proba(X)[:, 1], expected, rtol=0, atol=1e-12)
+        assert np.allclose(joblib.load(model_path).predict_proba(X)[:, 1], expected, rtol=0, atol=1e-12)
+        compact = NumpyPipeline.load(os.path.join(tmp_dir, "model_cv.compact.npz"))
+        assert compact_leaf_bits(compact) == 16
+        assert np.abs(compact.predict_proba(X)[:, 1] - expected).max() < 1e-3
+    finally:
+        shutil.rmtree(tmp_dir)
+
+def test_promote_aborts_when_compact_fails_verification():
+    """Un compacto int8 supera la tolerancia de export_numpy_model: no se publica ningún artefacto"""
+    X, y = load_labeled(os.path.join(ROOT, "heart.csv"))
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        model_path = os.path.join(tmp_dir, "model_cv.joblib")
+        shutil.copy(os.path.join(ROOT, "app", "model_cv.joblib"), model_path)
+        pipeline = joblib.load(model_path)
+        compiled = compile_pipeline(pipeline)
+        compiled.save(os.path.join(tmp_dir, "model_cv.npz"))
+        compact_pipeline(compiled, leaf_bits=8).save(os.path.join(tmp_dir, "model_cv.compact.npz"))
+        before = {name: open(os.path.join(tmp_dir, name), "rb").read() for name in os.listdir(tmp_dir)}
+
+        candidate = incremental_update(pipeline, X[:300], y[:300], n_estimators=5)
+        try:
+            promote(candidate, model_path, data_path=os.path.join(ROOT, "heart.csv"))
+            assert False, "Se esperaba PromotionError"
+        except PromotionError as e:
+            assert "compact" in str(e)
+        after = {name: open(os.path.join(tmp_dir, name), "rb").read() for name in os.listdir(tmp_dir)}
+        assert after == before
+    finally:
+        shutil.rmtree(tmp_dir)
+
+if __name__ == "__main__":
+    test_update_scaler_preserves_predictions()
+    test_auc_gate_refuses_worse_candidate()
+    test_promote_replaces_every_artifact()
+    test_promote_aborts_when_compact_fails_verification()
+    print("Pruebas de actualización incremental OK")
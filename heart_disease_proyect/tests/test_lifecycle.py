@@ -0,0 +1,84 @@
+# tests/test_lifecycle.py
+import sys
+import os
+import json
+import subprocess
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import app.api as api
+from app.lifecycle import ServingLifecycle
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Proceso nuevo: espera al fin del calentamiento y vuelca /metrics
+FRESH_METRICS = """
+import json, time
+from app.api import app, lifecycle
+while lifecycle.status()["state"] in ("starting", "warming_up"):
+    time.sleep(0.02)
+print(json.dumps({"status": lifecycle.status(), "metrics": app.test_client().get("/metrics").get_json()}))
+"""
+
+def test_metrics_empty_after_warmup():
+    """El calentamiento no cuenta como tráfico: /metrics sale vacío en un proceso recién arrancado"""
+    output = subprocess.run([sys.executable, "-c", FRESH_METRICS], cwd=ROOT, capture_output=True,
+                            text=True, timeout=120, check=True).stdout
+    body = json.loads(output.strip().splitlines()[-1])
+    assert body["status"]["state"] == "ready"
+    assert body["status"]["warmup"]["requests"] > 0
+
+    metrics = body["metrics"]
+    serving = metrics["serving"]
+    assert serving["requests"] == serving["predictions"] == serving["drift_window"] == 0
+    assert serving["drift"] == {} and not any(serving["latency_counts"])
+    assert not any(metrics["routing"]["routed"].values())
+    assert all(lane["admitted"] == 0 for lane in metrics["admission"]["lanes"].values())
+    assert metrics["coalescing"]["executed"] == metrics["coalescing"]["coalesced"] == 0
+    assert metrics["slow_requests"]["traced"] == metrics["slow_requests"]["buffered"] == 0
+    assert not any(serving["risk_levels"].values())
+
+def probe_codes():
+    """(código de /health, código de /ready) de la API"""
+    client = api.app.test_client()
+    return client.get("/health").status_code, client.get("/ready").status_code
+
+def test_ready_only_after_successful_warmup():
+    """/ready es 503 antes, durante y tras un calentamiento fallido; /health sigue en 200"""
+    original = api.lifecycle
+    try:
+        api.lifecycle = ServingLifecycle()
+        assert probe_codes() == (200, 503)
+
+        started, release = threading.Event(), threading.Event()
+        def slow_request(i):
+            started.set()
+            release.wait(5)
+        thread = api.lifecycle.start_warmup(slow_request, 2)
+        assert started.wait(5)
+        assert api.lifecycle.status()["state"] == "warming_up" and probe_codes() == (200, 503)
+        release.set()
+        thread.join(5)
+        assert probe_codes() == (200, 200)
+        assert api.lifecycle.status()["warmup"]["requests"] == 2
+
+        api.lifecycle = ServingLifecycle()
+        assert api.lifecycle.run_warmup(api.warmup_request, 3)
+        assert probe_codes() == (200, 200)
+
+        api.lifecycle = ServingLifecycle()
+        def failing_request(i):
+            if i == 1:
+                raise RuntimeError("Calentamiento falló con 500")
+        assert not api.lifecycle.run_warmup(failing_request, 3)
+        status = api.lifecycle.status()
+        assert status["state"] == "failed" and "500" in status["error"] and status["warmup"] == {}
+        assert probe_codes() == (200, 503)
+        assert api.app.test_client().get("/ready").get_json()["error"] == status["error"]
+    finally:
+        api.lifecycle = original
+
+if __name__ == "__main__":
+    test_metrics_empty_after_warmup()
+    test_ready_only_after_successful_warmup()
+    print("Pruebas de ciclo de vida OK")
@@ -0,0 +1,48 @@
+# tests/test_live_metrics.py
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+from app.live_metrics import Broadcaster, DownsampledSeries, metrics_point
+from app.serving_stats import ServingStats
+
+def test_point_from_counter_deltas():
+    """Tasas, percentiles y mezcla de riesgo salen de la diferencia entre dos lecturas"""
+    stats = ServingStats(["a", "b"], reference_mean=[0.0, 0.0], reference_scale=[1.0, 2.0])
+    previous = stats.snapshot()
+
+    for latency_ms in [0.5] * 90 + [40] * 10:
+        stats.record_request(200, latency_ms)
+    stats.record_request(500, 3)
+    stats.record_predictions(np.array([[1.0, 4.0]] * 4), np.array([0.1, 0.5, 0.8, 0.9]))
+
+    point = metrics_point(previous, stats.snapshot(), elapsed=2.0, ts=100.0)
+    assert point["throughput_rps"] == 101 / 2
+    assert point["error_rate"] == 1 / 101
+    assert point["p50_ms"] <= 1 and 25 <= point["p99_ms"] <= 50
+    assert (point["risk_Bajo"], point["risk_Moderado"], point["risk_Alto"]) == (0.25, 0.25, 0.5)
+    assert point["drift_a"] == 1.0 and point["drift_b"] == 2.0 and point["drift_max"] == 2.0
+
+def test_series_and_broadcaster_are_bounded():
+    """Las resoluciones son ring buffers y un suscriptor lento pierde los mensajes más antiguos"""
+    series = DownsampledSeries(tiers=((0, 5), (10, 3)))
+    for ts in range(50):
+        series.add({"ts": float(ts), "value": float(ts)})
+    assert [p["ts"] for p in series.points(0)] == [45.0, 46.0, 47.0, 48.0, 49.0]
+    assert [(p["ts"], p["value"]) for p in series.points(10)] == [(10.0, 14.5), (20.0, 24.5), (30.0, 34.5)]
+
+    broadcaster = Broadcaster(max_queue=2)
+    subscriber = broadcaster.subscribe()
+    for i in range(5):
+        broadcaster.publish(f"m{i}")
+    assert [subscriber.get_nowait(), subscriber.get_nowait()] == ["m3", "m4"]
+    assert broadcaster.dropped == 3
+    broadcaster.unsubscribe(subscriber)
+    assert broadcaster.count == 0
+
+if __name__ == "__main__":
+    test_point_from_counter_deltas()
+    test_series_and_broadcaster_are_bounded()
+    print("Pruebas de métricas en vivo OK")
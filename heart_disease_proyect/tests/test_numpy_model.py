@@ -0,0 +1,42 @@
+# tests/test_numpy_model.py
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from app.features import FEATURE_COLUMNS, encode_patients
+from app.numpy_model import NumpyPipeline, compile_pipeline
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SHIPPED_MODELS = ["model_cv", "model"]
+
+def heart_features():
+    df = pd.read_csv(os.path.join(ROOT, "heart.csv"))
+    return df.drop("HeartDisease", axis=1)
+
+def test_encode_patients_matches_get_dummies():
+    """La codificación NumPy es pd.get_dummies(..., drop_first=True) columna a columna"""
+    features = heart_features()
+    expected = pd.get_dummies(features, drop_first=True)
+    X = encode_patients(features.to_dict("records"))
+    assert list(expected.columns) == FEATURE_COLUMNS
+    assert np.array_equal(X, expected.to_numpy(dtype=np.float64))
+
+def test_compiled_models_match_sklearn():
+    """El .npz publicado y el recién compilado predicen lo mismo que el pipeline joblib"""
+    features = heart_features()
+    expected_input = pd.get_dummies(features, drop_first=True)
+    X = encode_patients(features.to_dict("records"))
+    for name in SHIPPED_MODELS:
+        pipeline = joblib.load(os.path.join(ROOT, "app", f"{name}.joblib"))
+        expected = pipeline.predict_proba(expected_input)
+        for compiled in [NumpyPipeline.load(os.path.join(ROOT, "app", f"{name}.npz")), compile_pipeline(pipeline)]:
+            assert np.abs(compiled.predict_proba(X) - expected).max() <= 1e-12, name
+
+if __name__ == "__main__":
+    test_encode_patients_matches_get_dummies()
+    test_compiled_models_match_sklearn()
+    print("Pruebas del modelo NumPy OK")
@@ -0,0 +1,57 @@
+# tests/test_path_search.py
+import sys
+import os
+import warnings
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import GridSearchCV, StratifiedKFold
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from app.dataset import load_dataset
+from app.path_search import PathGridSearchCV, supports_path
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _search_both(model, param_grid):
+    dataset = load_dataset(os.path.join(ROOT, "heart.csv"))
+    X, y = dataset.frame().iloc[:400], dataset.target().iloc[:400]
+    pipe = Pipeline([("scaler", StandardScaler()), ("clf", model)])
+    cv = StratifiedKFold(n_splits=3, shuffle=True, random_state=42)
+    assert supports_path(pipe, param_grid)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        grid = GridSearchCV(pipe, param_grid, cv=cv, scoring="roc_auc", return_train_score=True).fit(X, y)
+        path = PathGridSearchCV(pipe, param_grid, cv=cv, return_train_score=True).fit(X, y)
+    return grid, path, X
+
+def test_tree_paths_match_grid_search():
+    """Etapas de boosting y árboles añadidos con warm_start dan los mismos scores que entrenar cada valor"""
+    for model, param_grid in [
+        (GradientBoostingClassifier(random_state=42), {"clf__n_estimators": [10, 20, 30], "clf__max_depth": [2, 3]}),
+        (RandomForestClassifier(random_state=42), {"clf__n_estimators": [10, 20], "clf__min_samples_leaf": [1, 2]}),
+    ]:
+        grid, path, X = _search_both(model, param_grid)
+        assert path.cv_results_["params"] == grid.cv_results_["params"]
+        for key in ["mean_test_score", "mean_train_score", "split0_test_score", "rank_test_score"]:
+            assert np.array_equal(path.cv_results_[key], grid.cv_results_[key]), key
+        assert path.best_params_ == grid.best_params_
+        assert np.array_equal(path.predict_proba(X), grid.predict_proba(X))
+
+def test_regularization_path_selects_same_model():
+    """El camino de C con warm start converge a las mismas soluciones (hasta la tolerancia del solver)"""
+    grid, path, X = _search_both(
+        LogisticRegression(random_state=42, max_iter=1000),
+        {"clf__C": [0.1, 1, 10], "clf__solver": ["liblinear", "saga"], "clf__penalty": ["l1", "l2"]}
+    )
+    assert np.allclose(path.cv_results_["mean_test_score"], grid.cv_results_["mean_test_score"], atol=1e-3)
+    assert path.best_params_ == grid.best_params_
+    assert np.array_equal(path.predict_proba(X), grid.predict_proba(X))
+
+if __name__ == "__main__":
+    test_tree_paths_match_grid_search()
+    test_regularization_path_selects_same_model()
+    print("Pruebas de búsqueda por recorrido OK")
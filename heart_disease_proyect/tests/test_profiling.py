@@ -0,0 +1,86 @@
+# tests/test_profiling.py
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import app.api as api
+from app.profiling import ProfilerBusy, RequestTrace, SamplingProfiler, SlowRequestLog
+
+def busy_loop(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+def test_profiler_collects_collapsed_stacks():
+    """Las pilas del hilo ocupado aparecen en formato collapsed; solo una sesión a la vez"""
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_loop, args=(stop,), name="worker")
+    worker.start()
+    profiler = SamplingProfiler()
+    try:
+        profiler.start(seconds=0.3, interval=0.005)
+        try:
+            profiler.start(seconds=1)
+            assert False, "Se esperaba ProfilerBusy"
+        except ProfilerBusy:
+            pass
+        time.sleep(0.4)
+    finally:
+        stop.set()
+        worker.join()
+    
+    status = profiler.status()
+    assert not status["running"]
+    assert status["session"]["samples"] > 10
+    lines = profiler.collapsed().splitlines()
+    assert any(line.startswith("worker;") and "busy_loop" in line for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+def test_profiler_rejects_non_finite_values():
+    """inf y nan se rechazan antes de lanzar el hilo; el endpoint responde 400"""
+    profiler = SamplingProfiler()
+    for seconds, interval in [("inf", 0.01), ("nan", 0.01), (1, "nan"), (1, "-inf")]:
+        try:
+            profiler.start(seconds=seconds, interval=interval)
+            assert False, f"Se esperaba ValueError para {seconds}, {interval}"
+        except ValueError:
+            pass
+    assert not profiler.running and profiler.status()["session"] is None
+
+    original = api.ADMIN_TOKEN
+    api.ADMIN_TOKEN = "secreto"
+    try:
+        client = api.app.test_client()
+        headers = {"X-Admin-Token": "secreto"}
+        for query in ["seconds=inf", "seconds=nan", "interval_ms=inf", "interval_ms=nan", "seconds=abc"]:
+            response = client.post(f"/admin/profile/start?{query}", headers=headers)
+            assert response.status_code == 400, query
+        assert not api.profiler.running
+    finally:
+        api.ADMIN_TOKEN = original
+
+def test_slow_request_log_is_bounded():
+    """Solo se guardan las peticiones sobre el umbral y como mucho `capacity`"""
+    log = SlowRequestLog(threshold_ms=5, capacity=3)
+    
+    fast = RequestTrace("POST", "/predict")
+    log.finish(fast, 200)
+    
+    for i in range(5):
+        trace = RequestTrace("POST", f"/slow/{i}")
+        with trace.stage("predict"):
+            time.sleep(0.006)
+        log.finish(trace, 200)
+    
+    recent = log.recent()
+    assert [r["path"] for r in recent] == ["/slow/4", "/slow/3", "/slow/2"]
+    assert recent[0]["stages"][0]["stage"] == "predict"
+    assert recent[0]["stages"][0]["ms"] >= 5
+    assert log.stats()["traced"] == 6 and log.stats()["captured"] == 5
+
+if __name__ == "__main__":
+    test_profiler_collects_collapsed_stacks()
+    test_profiler_rejects_non_finite_values()
+    test_slow_request_log_is_bounded()
+    print("Pruebas de profiling OK")
@@ -0,0 +1,114 @@
+# tests/test_routing.py
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+from app.api import SAMPLE_PATIENTS, app
+from app.routing import ModelRouter, ModelsConfigError, ShadowScorer, UnknownModel, parse_models_config
+
+class BlockingModel:
+    """Modelo que espera a una señal antes de puntuar"""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def predict_proba(self, X):
+        self.release.wait(5)
+        return np.column_stack([np.full(len(X), 0.6), np.full(len(X), 0.4)])
+
+def test_parse_models_config():
+    """Entradas válidas, peso por defecto y errores de configuración claros"""
+    assert parse_models_config(" cv=app/model_cv.joblib:90, simple = app/model.joblib ,") == \
+        [("cv", "app/model_cv.joblib", 90), ("simple", "app/model.joblib", 1)]
+    assert parse_models_config("cv=app/model_cv.joblib:1,simple=app/model.joblib:0")[1][2] == 0
+    # Rutas absolutas de Windows: el ':' de la unidad no es un peso
+    assert parse_models_config(r"a=C:\models\m.joblib") == [("a", r"C:\models\m.joblib", 1)]
+    assert parse_models_config(r"a=C:\models\m.joblib:30,b=D:/m/b.npz") == \
+        [("a", r"C:\models\m.joblib", 30), ("b", "D:/m/b.npz", 1)]
+
+    invalid = [
+        "",                                   # ningún modelo
+        "app/model_cv.joblib:100",            # sin '='
+        "=app/model_cv.joblib:100",           # sin nombre
+        "cv=",                                # sin ruta
+        "cv=app/model_cv.joblib:mucho",       # peso no entero
+        "cv=app/model_cv.joblib:1.5",
+        "cv=app/model_cv.joblib:-10,simple=app/model.joblib:20",
+        "cv=app/model_cv.joblib:0,simple=app/model.joblib:0",
+        "cv=app/model_cv.joblib:1,cv=app/model.joblib:1",
+    ]
+    for config in invalid:
+        try:
+            parse_models_config(config)
+            assert False, f"Se esperaba ModelsConfigError para {config!r}"
+        except ModelsConfigError:
+            pass
+
+def test_weighted_sticky_routing_and_override():
+    """Reparto según pesos, el mismo paciente siempre al mismo modelo y X-Model manda"""
+    router = ModelRouter({"a": (None, 70), "b": (None, 30), "c": (None, 0)})
+    keys = [f"paciente-{i}" for i in range(5000)]
+    chosen = [router.choose(key) for key in keys]
+    assert chosen == [router.choose(key) for key in keys]
+    assert "c" not in chosen
+    assert abs(chosen.count("a") / len(keys) - 0.7) < 0.03
+
+    assert router.choose("paciente-0", requested="c") == "c"
+    assert router.stats()["routed"]["c"] == 1
+    assert router.choose("paciente-0", record=False) == chosen[0]
+    assert sum(router.stats()["routed"].values()) == 2 * len(keys) + 1
+    try:
+        router.choose("paciente-0", requested="z")
+        assert False, "Se esperaba UnknownModel"
+    except UnknownModel:
+        pass
+
+    for models, primary in [({"a": (None, 0)}, None), ({"a": (None, -1), "b": (None, 2)}, None),
+                            ({"a": (None, 1)}, "b")]:
+        try:
+            ModelRouter(models, primary=primary)
+            assert False, f"Se esperaba ModelsConfigError para {models}"
+        except ModelsConfigError:
+            pass
+
+def test_api_model_header():
+    """X-Model elige el modelo (aunque tenga peso 0); un modelo desconocido es un 400"""
+    client = app.test_client()
+    response = client.post("/predict", json=SAMPLE_PATIENTS[0], headers={"X-Model": "simple"})
+    assert response.status_code == 200
+    assert response.get_json()["model"] == response.headers["X-Model"] == "simple"
+
+    for path, body in [("/predict", SAMPLE_PATIENTS[0]), ("/predict-batch", {"patients": SAMPLE_PATIENTS})]:
+        response = client.post(path, json=body, headers={"X-Model": "no-existe"})
+        assert response.status_code == 400, path
+        assert set(response.get_json()["available_models"]) == {"cv", "simple"}
+
+def test_shadow_drops_when_saturated():
+    """Con max_pending tareas en curso el resto se descarta sin bloquear"""
+    model = BlockingModel()
+    shadow = ShadowScorer("sombra", model, workers=1, max_pending=2)
+    X, primary = np.zeros((1, 3)), np.array([0.7])
+    start = time.perf_counter()
+    accepted = [shadow.submit("a", X, primary) for _ in range(5)]
+    assert time.perf_counter() - start < 0.5
+    assert accepted == [True, True, False, False, False]
+    assert shadow.stats()["dropped"] == 3 and shadow.stats()["pending"] == 2
+
+    model.release.set()
+    deadline = time.monotonic() + 5
+    while shadow.stats()["pending"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    stats = shadow.stats()
+    assert stats["scored"] == 2 and stats["disagreement_rate"] == 1.0 and stats["errors"] == 0
+    assert shadow.submit("a", X, primary)
+
+if __name__ == "__main__":
+    test_parse_models_config()
+    test_weighted_sticky_routing_and_override()
+    test_api_model_header()
+    test_shadow_drops_when_saturated()
+    print("Pruebas de enrutamiento OK")
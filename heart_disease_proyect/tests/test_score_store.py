@@ -0,0 +1,108 @@
+# tests/test_score_store.py
+import sys
+import os
+import csv
+import shutil
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.bulk_scoring import score_shard
+from app.demo_standalone import HeartDiseasePredictor
+from app.score_store import ScoreStore, incremental_score, record_hash, row_hasher
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class CountingPredictor:
+    """Cuenta los pacientes que llegan al modelo; fingerprint permite simular otra versión"""
+
+    def __init__(self, predictor, fingerprint=None):
+        self.predictor = predictor
+        self.model_fingerprint = fingerprint or predictor.model_fingerprint
+        self.rows = 0
+
+    def batch_predict(self, patients):
+        self.rows += len(patients)
+        return self.predictor.batch_predict(patients)
+
+def read_rows(path):
+    with open(path, newline="") as f:
+        return list(csv.reader(f))
+
+def test_only_changed_patients_are_rescored():
+    """Segunda pasada sin cambios no puntúa nada; luego solo lo modificado, o todo con otro modelo"""
+    predictor = HeartDiseasePredictor(os.path.join(ROOT, "app", "model_cv.joblib"))
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        input_path = os.path.join(tmp_dir, "panel.csv")
+        output_path = os.path.join(tmp_dir, "scored.csv")
+        shutil.copy(os.path.join(ROOT, "heart.csv"), input_path)
+
+        with open(input_path, newline="") as f:
+            header = f.readline().rstrip("\r\n").split(",")
+            full = "".join(f.readlines())
+        expected = [header + ["heart_disease_probability", "prediction", "risk_level", "error"]] + \
+            list(csv.reader(score_shard(predictor, header, full).splitlines()))
+
+        with ScoreStore(os.path.join(tmp_dir, "scores.sqlite")) as store:
+            first = CountingPredictor(predictor)
+            summary = incremental_score(first, input_path, output_path, store, chunk_size=200)
+            assert summary["rows"] == 918 and first.rows == summary["scored"] <= 918
+            assert read_rows(output_path) == expected
+
+            again = CountingPredictor(predictor)
+            summary = incremental_score(again, input_path, output_path, store, chunk_size=200)
+            assert again.rows == 0 and summary["reused"] == 918
+            assert read_rows(output_path) == expected
+
+            # Cambiar el colesterol de 3 pacientes y el target de otro (no es entrada del modelo)
+            rows = read_rows(input_path)
+            for i in (1, 2, 3):
+                rows[i][header.index("Cholesterol")] = str(int(rows[i][header.index("Cholesterol")]) + 1)
+            rows[4][header.index("HeartDisease")] = "1" if rows[4][header.index("HeartDisease")] == "0" else "0"
+            with open(input_path, "w", newline="") as f:
+                csv.writer(f, lineterminator="\n").writerows(rows)
+            changed = CountingPredictor(predictor)
+            incremental_score(changed, input_path, output_path, store, chunk_size=200)
+            assert changed.rows == 3
+            body = "".join(",".join(row) + "\n" for row in rows[1:])
+            assert read_rows(output_path)[1:] == list(csv.reader(score_shard(predictor, header, body).splitlines()))
+
+            new_model = CountingPredictor(predictor, fingerprint="otra-version")
+            summary = incremental_score(new_model, input_path, output_path, store, prune=True)
+            assert new_model.rows == summary["scored"] == first.rows
+            assert summary["pruned"] > 0 and store.count() == store.count("otra-version")
+    finally:
+        shutil.rmtree(tmp_dir)
+
+def test_whitespace_in_category_is_a_change():
+    """Un espacio en una categoría cambia la puntuación, así que el paciente se vuelve a puntuar"""
+    predictor = HeartDiseasePredictor(os.path.join(ROOT, "app", "model_cv.joblib"))
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        input_path = os.path.join(tmp_dir, "panel.csv")
+        output_path = os.path.join(tmp_dir, "scored.csv")
+        rows = read_rows(os.path.join(ROOT, "heart.csv"))[:21]
+        header = rows[0]
+        column = header.index("ChestPainType")
+        assert all(row[column] == row[column].strip() for row in rows[1:])
+        hash_row = row_hasher(header)
+        assert all(hash_row(row) == record_hash(dict(zip(header, row))) for row in rows[1:])
+
+        with ScoreStore(os.path.join(tmp_dir, "scores.sqlite")) as store:
+            for padded in (False, True):
+                if padded:
+                    rows[1][column] = " " + rows[1][column]
+                with open(input_path, "w", newline="") as f:
+                    csv.writer(f, lineterminator="\n").writerows(rows)
+                counting = CountingPredictor(predictor)
+                incremental_score(counting, input_path, output_path, store)
+            assert counting.rows == 1
+            body = "".join(",".join(row) + "\n" for row in rows[1:])
+            assert read_rows(output_path)[1:] == list(csv.reader(score_shard(predictor, header, body).splitlines()))
+    finally:
+        shutil.rmtree(tmp_dir)
+
+if __name__ == "__main__":
+    test_only_changed_patients_are_rescored()
+    test_whitespace_in_category_is_a_change()
+    print("Pruebas de puntuación incremental OK")
@@ -0,0 +1,64 @@
+# tests/test_serving_cost.py
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.serving_cost import pareto_front, select_under_budget
+
+def model(name, auc, latency, size):
+    return {"Model": name, "AUC": auc, "Single_ms_p99": latency, "Size_KB": size}
+
+# (descripción, filas, modelos no dominados)
+PARETO_CASES = [
+    ("un modelo mejor en todo domina", [model("A", 0.90, 1.0, 10), model("B", 0.85, 2.0, 20)], ["A"]),
+    ("compromiso AUC/latencia: ambos en el frente", [model("A", 0.90, 5.0, 10), model("B", 0.85, 1.0, 10)],
+     ["A", "B"]),
+    ("igual en todo: ninguno domina al otro", [model("A", 0.90, 1.0, 10), model("B", 0.90, 1.0, 10)], ["A", "B"]),
+    ("igual AUC, más lento: dominado", [model("A", 0.90, 1.0, 10), model("B", 0.90, 1.5, 10)], ["A"]),
+    ("igual AUC y latencia, más grande: dominado", [model("A", 0.90, 1.0, 10), model("B", 0.90, 1.0, 30)],
+     ["A"]),
+    ("tres modelos, uno dominado por el segundo",
+     [model("A", 0.92, 4.0, 50), model("B", 0.88, 1.0, 10), model("C", 0.87, 1.2, 12)], ["A", "B"]),
+    ("sin modelos", [], []),
+]
+
+ROWS = [model("GB", 0.93, 3.0, 180), model("RF", 0.93, 2.0, 900), model("LR", 0.90, 0.2, 2),
+        model("KNN", 0.88, 5.0, 60)]
+
+# (descripción, presupuesto de latencia, presupuesto de memoria, modelo elegido)
+BUDGET_CASES = [
+    ("sin presupuesto: mejor AUC, empate al más rápido", None, None, "RF"),
+    ("latencia que excluye a RF y GB", 1.0, None, "LR"),
+    ("latencia justo en el límite cuenta como dentro", 3.0, 200, "GB"),
+    ("memoria que excluye a RF", None, 500, "GB"),
+    ("ninguno cumple", 0.1, None, None),
+    ("memoria imposible", None, 1, None),
+]
+
+def test_pareto_front():
+    for description, rows, expected in PARETO_CASES:
+        assert pareto_front(rows, "AUC", ["Single_ms_p99", "Size_KB"]) == expected, description
+
+def test_select_under_budget():
+    for description, latency, memory, expected in BUDGET_CASES:
+        best = select_under_budget(ROWS, "AUC", latency_budget=latency, memory_budget=memory)
+        assert (best["Model"] if best else None) == expected, description
+
+def test_select_under_budget_custom_keys():
+    """Con otra clave el presupuesto va en sus unidades: coste por fila en lotes (µs) y pico de memoria"""
+    rows = [dict(row, Per_row_us=us, Peak_Mem_KB=kb)
+            for row, us, kb in zip(ROWS, [5.0, 50.0, 1.0, 9.0], [40, 40, 40, 40])]
+    # 10 µs por fila: RF (50 µs) queda fuera aunque su p99 individual (2 ms) cumpliría un presupuesto en ms
+    best = select_under_budget(rows, "AUC", latency_budget=10.0, latency_key="Per_row_us",
+                               memory_budget=100, memory_key="Peak_Mem_KB")
+    assert best["Model"] == "GB"
+    # El desempate por velocidad también usa latency_key: GB (5 µs) gana a RF (50 µs) con igual AUC
+    assert select_under_budget(rows, "AUC", latency_budget=60.0, latency_key="Per_row_us")["Model"] == "GB"
+    assert select_under_budget(rows, "AUC", latency_budget=4.0, latency_key="Per_row_us")["Model"] == "LR"
+    assert select_under_budget(rows, "AUC", latency_budget=0.5, latency_key="Per_row_us") is None
+
+if __name__ == "__main__":
+    test_pareto_front()
+    test_select_under_budget()
+    test_select_under_budget_custom_keys()
+    print("Pruebas de coste de servicio OK")
@@ -0,0 +1,73 @@
+# tests/test_what_if.py
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+from app.api import SAMPLE_PATIENTS, app
+from app.features import encode_patients
+from app.numpy_model import NumpyPipeline
+from app.what_if import score_grid, variant_matrix
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_variant_matrix_matches_encoding_each_variant():
+    """El broadcasting produce las mismas filas que codificar cada variante por separado"""
+    patient = SAMPLE_PATIENTS[0]
+    cholesterol = np.array([150.0, 200.0, 250.0])
+    resting_bp = np.array([110.0, 130.0])
+    X, shape = variant_matrix(encode_patients([patient]), ["Cholesterol", "RestingBP"], [cholesterol, resting_bp])
+    expected = encode_patients([dict(patient, Cholesterol=c, RestingBP=bp) for c in cholesterol for bp in resting_bp])
+    assert shape == (3, 2)
+    assert np.array_equal(X, expected)
+
+def test_collapsed_grid_is_exact():
+    """Puntuar un valor por intervalo entre umbrales da lo mismo que puntuar todas las variantes"""
+    base_row = encode_patients([SAMPLE_PATIENTS[1]])
+    features = ["Oldpeak", "Cholesterol"]
+    axes = [np.linspace(0, 10, 201), np.arange(100, 600, 3, dtype=np.float64)]
+    for name in ["model_cv.npz", "model.npz", "model_cv.compact.npz"]:
+        model = NumpyPipeline.load(os.path.join(ROOT, "app", name))
+        baseline, surface = score_grid(model, base_row, features, axes)
+        X, shape = variant_matrix(base_row, features, axes)
+        assert np.array_equal(surface, model.predict_proba(X)[:, 1].reshape(shape)), name
+        assert baseline == model.predict_proba(base_row)[0, 1]
+
+def test_what_if_endpoint():
+    """La curva coincide con /predict por variante; la superficie 100x100 sale en una petición"""
+    client = app.test_client()
+    patient = SAMPLE_PATIENTS[0]
+
+    response = client.post("/what-if", json={"patient": patient, "vary": {"Cholesterol": [150, 212, 300]}})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["shape"] == [3] and body["values"] == {"Cholesterol": [150.0, 212.0, 300.0]}
+    headers = {"X-Model": body["model"]}
+    for value, probability in zip([150, 212, 300], body["probabilities"]):
+        single = client.post("/predict", json=dict(patient, Cholesterol=value), headers=headers).get_json()
+        assert single["heart_disease_probability"] == probability
+    assert body["baseline"]["heart_disease_probability"] == body["probabilities"][1]
+
+    request = {"patient": patient, "vary": {"Cholesterol": {"min": 100, "max": 600, "steps": 100},
+                                            "RestingBP": {"min": 80, "max": 200, "steps": 100}}}
+    client.post("/what-if", json=request)
+    start = time.perf_counter()
+    response = client.post("/what-if", json=request)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    body = response.get_json()
+    assert response.status_code == 200 and len(body["probabilities"]) == 100
+    assert len(body["values"]["RestingBP"]) == len(body["probabilities"][0]) <= 100
+    assert elapsed_ms < 250
+
+    for vary in [{"Cholesterol": [50]}, {"Sex": ["F"]}, {"Age": [40], "MaxHR": [120], "Oldpeak": [1]},
+                 {"MaxHR": {"steps": 10000}}]:
+        response = client.post("/what-if", json={"patient": patient, "vary": vary})
+        assert response.status_code == 400, vary
+
+if __name__ == "__main__":
+    test_variant_matrix_matches_encoding_each_variant()
+    test_collapsed_grid_is_exact()
+    test_what_if_endpoint()
+    print("Pruebas de what-if OK")